@@ -1,5 +1,5 @@
 // Helper utilities
-// This file has 156 lines total
+// String, array and object helpers
 
 export function formatDate(date: Date): string {
   return date.toISOString().split('T')[0];
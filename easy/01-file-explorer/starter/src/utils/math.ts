@@ -35,7 +35,7 @@ export function average(numbers: number[]): number {
   return sum(numbers) / numbers.length;
 }
 
-// Line 42 - This is where calculateTotal is defined
+// Cart totals
 export function calculateTotal(items: { price: number; quantity: number }[]): number {
   return items.reduce((total, item) => total + item.price * item.quantity, 0);
 }
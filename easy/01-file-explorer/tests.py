@@ -9,27 +9,52 @@ import os
 import sys
 from pathlib import Path
 
-EXPECTED = {
-    "typescript_files": [
-        "src/index.ts",
-        "src/utils/helpers.ts",
-        "src/utils/math.ts",
-        "src/components/Button.ts",
-        "src/components/Modal.ts",
-    ],
-    "calculateTotal_location": "src/utils/math.ts:42",
-    "database_config": {
-        "host": "localhost",
-        "port": 5432,
-        "database": "challenge_db",
-        "ssl": False
-    },
-    "helpers_line_count": 156
-}
-
-def load_results():
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+
+from grading import cli
+from grading.checks import check
+from grading.treeindex import find_starter, index_tree
+
+STARTER = "starter"
+FUNCTION = "calculateTotal"
+DATABASE_CONFIG = "config/database.json"
+HELPERS = "src/utils/helpers.ts"
+
+INPUTS = ["results.json"]
+
+# TypeScript declarations (functions, classes, types, variables); group 1 is the name
+DEFINITION = (r"(?m)^[ \t]*(?:export[ \t]+)?(?:default[ \t]+)?(?:async[ \t]+)?"
+              r"(?:function\*?|class|interface|type|enum|const|let|var)[ \t]+([A-Za-z_$][\w$]*)")
+
+def expected_results(root="."):
+    """Answers for the starter the submission explored, or None without one.
+
+    Derived from an index of the starter tree (cached by content), so
+    per-participant starter variants are graded against their own answers.
+    """
+    starter = find_starter(__file__, STARTER)
+    if starter is None:
+        print(f"FAIL: No {STARTER}/ for the participant's variant to grade against")
+        return None
+    index = index_tree(starter, extensions=(".ts",), symbols=DEFINITION)
+
+    definitions = index.definitions(FUNCTION)
+    try:
+        with open(starter / DATABASE_CONFIG) as f:
+            database_config = json.load(f)
+    except (OSError, ValueError):
+        database_config = None
+
+    return {
+        "typescript_files": sorted(index.files),
+        "calculateTotal_location": "%s:%d" % definitions[0] if definitions else None,
+        "database_config": database_config,
+        "helpers_line_count": index.files[HELPERS]["lines"] if HELPERS in index.files else None,
+    }
+
+def load_results(root="."):
     """Load the participant's results.json file."""
-    results_path = Path("results.json")
+    results_path = Path(root) / "results.json"
     if not results_path.exists():
         print("FAIL: results.json not found")
         print("  Create results.json with your findings")
@@ -42,11 +67,12 @@ def load_results():
         print(f"FAIL: Invalid JSON in results.json: {e}")
         return None
 
-def test_typescript_files(results):
+@check(25)
+def test_typescript_files(results, expected):
     """Test if all TypeScript files were found."""
     score = 0
     found = set(results.get("typescript_files", []))
-    expected = set(EXPECTED["typescript_files"])
+    expected = set(expected["typescript_files"])
 
     if found == expected:
         print("PASS: All TypeScript files found correctly")
@@ -62,11 +88,12 @@ def test_typescript_files(results):
 
     return score
 
-def test_calculate_total_location(results):
+@check(25)
+def test_calculate_total_location(results, expected):
     """Test if calculateTotal location is correct."""
     score = 0
     location = results.get("calculateTotal_location", "")
-    expected = EXPECTED["calculateTotal_location"]
+    expected = expected["calculateTotal_location"]
 
     if location == expected:
         print("PASS: calculateTotal location correct")
@@ -78,11 +105,12 @@ def test_calculate_total_location(results):
 
     return score
 
-def test_database_config(results):
+@check(25)
+def test_database_config(results, expected):
     """Test if database config was extracted correctly."""
     score = 0
     config = results.get("database_config", {})
-    expected = EXPECTED["database_config"]
+    expected = expected["database_config"]
 
     if config == expected:
         print("PASS: Database config extracted correctly")
@@ -94,16 +122,17 @@ def test_database_config(results):
 
     return score
 
-def test_line_count(results):
+@check(25)
+def test_line_count(results, expected):
     """Test if line count is accurate."""
     score = 0
     count = results.get("helpers_line_count", 0)
-    expected = EXPECTED["helpers_line_count"]
+    expected = expected["helpers_line_count"]
 
     if count == expected:
         print("PASS: Line count accurate")
         score = 25
-    elif abs(count - expected) <= 5:
+    elif expected is not None and abs(count - expected) <= 5:
         print(f"PARTIAL: Line count close (within 5)")
         print(f"  Expected: {expected}, Got: {count}")
         score = 15
@@ -113,21 +142,25 @@ def test_line_count(results):
 
     return score
 
-def main():
+def main(root="."):
     print("=" * 50)
     print("File Explorer Challenge - Test Results")
     print("=" * 50)
     print()
 
-    results = load_results()
+    results = load_results(root)
     if results is None:
-        sys.exit(1)
+        return 1
+
+    expected = expected_results(root)
+    if expected is None:
+        return 1
 
     total_score = 0
-    total_score += test_typescript_files(results)
-    total_score += test_calculate_total_location(results)
-    total_score += test_database_config(results)
-    total_score += test_line_count(results)
+    total_score += test_typescript_files(results, expected)
+    total_score += test_calculate_total_location(results, expected)
+    total_score += test_database_config(results, expected)
+    total_score += test_line_count(results, expected)
 
     print()
     print("=" * 50)
@@ -146,4 +179,4 @@ def main():
     return 0 if total_score >= 75 else 1
 
 if __name__ == "__main__":
-    sys.exit(main())
+    sys.exit(cli.run(sys.modules[__name__]))
@@ -5,35 +5,54 @@ Verifies that the participant created a proper conventional commit.
 """
 
 import re
-import subprocess
 import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+
+from grading import cli
+from grading.checks import check
+from grading.gitrepo import GitRepo
+
+INPUTS = ["git:starter"]
 
 VALID_TYPES = ['feat', 'fix', 'docs', 'style', 'refactor', 'test', 'chore', 'perf', 'ci', 'build']
 
-def get_last_commit():
+# Subject patterns, compiled once at import
+# type(scope): description OR type: description
+CONVENTIONAL = re.compile(r'^(' + '|'.join(VALID_TYPES) + r')(\([^)]+\))?:\s+.+')
+COMMIT_TYPE = re.compile(r'^(\w+)')
+LOWERCASE_SUBJECT = re.compile(r'^[a-z]+(\([^)]+\))?:\s+[a-z]')
+DESCRIPTION = re.compile(r'^[^:]+:\s+(.+)$')
+
+def open_repo(root="."):
+    """Open the git repository containing the submission's starter/ directory."""
+    starter = Path(root) / 'starter'
+    if not starter.is_dir():
+        return None
+    return GitRepo.discover(starter)
+
+def get_last_commit(root="."):
     """Get the last commit message."""
     try:
-        result = subprocess.run(
-            ['git', 'log', '-1', '--pretty=format:%B'],
-            capture_output=True,
-            text=True,
-            cwd='starter'
-        )
-        return result.stdout.strip()
+        repo = open_repo(root)
+        head = repo.head() if repo else None
+        if head is None:
+            return None
+        return repo.commit(head).message.strip()
     except Exception as e:
         print(f"Error getting commit: {e}")
         return None
 
-def test_commit_exists():
+@check()
+def test_commit_exists(root="."):
     """Test if a commit was made."""
     try:
-        result = subprocess.run(
-            ['git', 'log', '-1', '--oneline'],
-            capture_output=True,
-            text=True,
-            cwd='starter'
-        )
-        if result.returncode != 0:
+        repo = open_repo(root)
+        if repo is None:
+            print("FAIL: Could not check git history")
+            return False
+        if repo.head() is None:
             print("FAIL: No commits found")
             return False
         print("PASS: Commit exists")
@@ -42,15 +61,13 @@ def test_commit_exists():
         print("FAIL: Could not check git history")
         return False
 
+@check(25)
 def test_commit_type(message):
     """Test if commit has valid type."""
     first_line = message.split('\n')[0]
 
-    # Pattern: type(scope): description OR type: description
-    pattern = r'^(' + '|'.join(VALID_TYPES) + r')(\([^)]+\))?:\s+.+'
-
-    if re.match(pattern, first_line):
-        match = re.match(r'^(\w+)', first_line)
+    if CONVENTIONAL.match(first_line):
+        match = COMMIT_TYPE.match(first_line)
         commit_type = match.group(1) if match else 'unknown'
         print(f"PASS: Valid commit type '{commit_type}'")
         return 25
@@ -60,6 +77,7 @@ def test_commit_type(message):
         print(f"  Expected: <type>[(scope)]: <description>")
         return 0
 
+@check(25)
 def test_commit_format(message):
     """Test if commit follows proper format."""
     score = 0
@@ -79,8 +97,7 @@ def test_commit_format(message):
         print("FAIL: Subject line should not be all caps")
 
     # Check starts with lowercase after type
-    pattern = r'^[a-z]+(\([^)]+\))?:\s+[a-z]'
-    if re.match(pattern, first_line):
+    if LOWERCASE_SUBJECT.match(first_line):
         print("PASS: Proper case formatting")
         score += 10
     else:
@@ -89,12 +106,13 @@ def test_commit_format(message):
 
     return score
 
+@check(25)
 def test_description_quality(message):
     """Test if description is meaningful."""
     first_line = message.split('\n')[0]
 
     # Extract description part
-    match = re.match(r'^[^:]+:\s+(.+)$', first_line)
+    match = DESCRIPTION.match(first_line)
     if not match:
         print("FAIL: Could not extract description")
         return 0
@@ -115,6 +133,7 @@ def test_description_quality(message):
     print(f"PASS: Descriptive commit message")
     return 25
 
+@check(25)
 def test_co_authored_by(message):
     """Test if co-authored-by footer is present."""
     if 'Co-Authored-By:' in message or 'Co-authored-by:' in message:
@@ -128,20 +147,20 @@ def test_co_authored_by(message):
         print("FAIL: Missing Co-Authored-By footer")
         return 0
 
-def main():
+def main(root="."):
     print("=" * 50)
     print("Quick Commit Challenge - Test Results")
     print("=" * 50)
     print()
 
-    if not test_commit_exists():
+    if not test_commit_exists(root):
         print("\nNo commit found. Please create a commit first.")
-        sys.exit(1)
+        return 1
 
-    message = get_last_commit()
+    message = get_last_commit(root)
     if not message:
         print("Could not read commit message")
-        sys.exit(1)
+        return 1
 
     print(f"\nCommit message:\n{'-' * 40}")
     print(message)
@@ -168,4 +187,4 @@ def main():
     return 0 if total_score >= 75 else 1
 
 if __name__ == "__main__":
-    sys.exit(main())
+    sys.exit(cli.run(sys.modules[__name__]))
@@ -5,26 +5,57 @@ Verifies that the participant understands token management.
 """
 
 import os
-import re
 import sys
 from pathlib import Path
 
-def load_report():
-    """Load the participant's usage report."""
-    report_path = Path("usage_report.md")
-    if not report_path.exists():
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+
+from grading import cli
+from grading.checks import check
+from grading.rubric import Rubric, keywords, regex
+
+REPORT = "usage_report.md"
+
+INPUTS = [REPORT]
+
+INPUT_TOKENS = r'[Ii]nput tokens[^:]*:\s*(\d+)'
+OUTPUT_TOKENS = r'[Oo]utput tokens[^:]*:\s*(\d+)'
+TOTAL_TOKENS = r'[Tt]otal tokens[^:]*:\s*(\d+)'
+CONTEXT_PERCENTAGE = r'[Cc]ontext[^:]*:\s*(\d+(?:\.\d+)?)\s*%'
+SHOULD_COMPACT = r'[Ss]hould compact[^:]*:\s*(Yes|No|yes|no)'
+REASON = r'[Rr]eason:\s*(.+)'
+WHEN_TO_COMPACT = r'[Ww]hen to [Cc]ompact'
+
+# Concepts a good /compact explanation should touch on
+COMPACT_KEYWORDS = ('context', 'token', 'summarize', 'conversation', 'space', 'memory')
+
+RUBRIC = Rubric({
+    REPORT: [
+        regex(INPUT_TOKENS, OUTPUT_TOKENS, TOTAL_TOKENS, CONTEXT_PERCENTAGE,
+              SHOULD_COMPACT, REASON, WHEN_TO_COMPACT),
+        keywords(*COMPACT_KEYWORDS, ignore_case=True),
+    ],
+})
+
+def load_report(root="."):
+    """Scan the participant's usage report."""
+    report = RUBRIC.file(root, REPORT)
+    if not report.exists:
         print("FAIL: usage_report.md not found")
         return None
 
-    with open(report_path) as f:
-        return f.read()
+    if report.truncated:
+        print(f"INFO: usage_report.md is {report.size} bytes; "
+              f"only the first {RUBRIC.max_bytes} were graded")
+    return report
 
+@check(30)
 def test_token_counts(report):
     """Test if token counts are present and reasonable."""
     score = 0
 
     # Check for input tokens
-    input_match = re.search(r'[Ii]nput tokens[^:]*:\s*(\d+)', report)
+    input_match = report.search(INPUT_TOKENS)
     if input_match:
         input_tokens = int(input_match.group(1))
         if input_tokens > 0:
@@ -36,7 +67,7 @@ def test_token_counts(report):
         print("FAIL: Input tokens not found")
 
     # Check for output tokens
-    output_match = re.search(r'[Oo]utput tokens[^:]*:\s*(\d+)', report)
+    output_match = report.search(OUTPUT_TOKENS)
     if output_match:
         output_tokens = int(output_match.group(1))
         if output_tokens > 0:
@@ -48,7 +79,7 @@ def test_token_counts(report):
         print("FAIL: Output tokens not found")
 
     # Check for total tokens
-    total_match = re.search(r'[Tt]otal tokens[^:]*:\s*(\d+)', report)
+    total_match = report.search(TOTAL_TOKENS)
     if total_match:
         print(f"PASS: Total tokens reported")
         score += 10
@@ -58,10 +89,10 @@ def test_token_counts(report):
 
     return score
 
+@check(20)
 def test_context_percentage(report):
     """Test if context usage percentage is reported."""
-    pattern = r'[Cc]ontext[^:]*:\s*(\d+(?:\.\d+)?)\s*%'
-    match = re.search(pattern, report)
+    match = report.search(CONTEXT_PERCENTAGE)
 
     if match:
         percentage = float(match.group(1))
@@ -75,18 +106,19 @@ def test_context_percentage(report):
         print("FAIL: Context percentage not found")
         return 0
 
+@check(25)
 def test_compaction_recommendation(report):
     """Test if compaction recommendation is reasonable."""
     score = 0
 
     # Check for Yes/No recommendation
-    compact_match = re.search(r'[Ss]hould compact[^:]*:\s*(Yes|No|yes|no)', report)
+    compact_match = report.search(SHOULD_COMPACT)
     if compact_match:
         print("PASS: Compaction recommendation provided")
         score += 10
 
         # Check for reason
-        reason_match = re.search(r'[Rr]eason:\s*(.+)', report)
+        reason_match = report.search(REASON)
         if reason_match and len(reason_match.group(1)) > 10:
             print("PASS: Reason provided")
             score += 15
@@ -98,16 +130,15 @@ def test_compaction_recommendation(report):
 
     return score
 
+@check(25)
 def test_compact_explanation(report):
     """Test if explanation of /compact is clear."""
     score = 0
 
     # Check for section about when to compact
-    has_section = bool(re.search(r'[Ww]hen to [Cc]ompact', report))
+    has_section = bool(report.search(WHEN_TO_COMPACT))
 
-    # Keywords that should appear in a good explanation
-    keywords = ['context', 'token', 'summarize', 'conversation', 'space', 'memory']
-    keyword_count = sum(1 for kw in keywords if kw.lower() in report.lower())
+    keyword_count = report.count_present(COMPACT_KEYWORDS, ignore_case=True)
 
     if has_section:
         score += 10
@@ -124,20 +155,20 @@ def test_compact_explanation(report):
 
     return score
 
-def main():
+def main(root="."):
     print("=" * 50)
     print("Token Check Challenge - Test Results")
     print("=" * 50)
     print()
 
-    report = load_report()
+    report = load_report(root)
     if report is None:
         print("\nCreate usage_report.md with your findings.")
-        sys.exit(1)
+        return 1
 
     print("Report content preview:")
     print("-" * 40)
-    print(report[:500] + "..." if len(report) > 500 else report)
+    print(report.head[:500] + "..." if len(report.head) > 500 else report.head)
     print("-" * 40)
     print()
 
@@ -162,4 +193,4 @@ def main():
     return 0 if total_score >= 75 else 1
 
 if __name__ == "__main__":
-    sys.exit(main())
+    sys.exit(cli.run(sys.modules[__name__]))
@@ -7,9 +7,16 @@ Verifies that all edits were made correctly.
 import sys
 from pathlib import Path
 
-def load_file():
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+
+from grading import cli
+from grading.checks import check
+
+INPUTS = ["starter/app.ts"]
+
+def load_file(root="."):
     """Load the edited app.ts file."""
-    file_path = Path("starter/app.ts")
+    file_path = Path(root) / "starter/app.ts"
     if not file_path.exists():
         print("FAIL: starter/app.ts not found")
         return None
@@ -17,6 +24,7 @@ def load_file():
     with open(file_path) as f:
         return f.read()
 
+@check(25)
 def test_variable_name(content):
     """Test if variable name was fixed."""
     if 'const userName' in content and 'usrName' not in content:
@@ -30,6 +38,7 @@ def test_variable_name(content):
         print("  Expected: const userName")
         return 0
 
+@check(25)
 def test_return_type(content):
     """Test if return type was updated."""
     if 'function getData(): Promise<Data>' in content:
@@ -45,6 +54,7 @@ def test_return_type(content):
         print("FAIL: Return type not correctly updated")
         return 0
 
+@check(25)
 def test_parameter_type(content):
     """Test if parameter type was added."""
     if 'function processItem(item: Item)' in content:
@@ -60,6 +70,7 @@ def test_parameter_type(content):
         print("FAIL: processItem function not found or malformed")
         return 0
 
+@check(25)
 def test_import_statement(content):
     """Test if import was updated."""
     if "import { helper, utils }" in content:
@@ -77,6 +88,7 @@ def test_import_statement(content):
     print("FAIL: Import statement issue")
     return 0
 
+@check()
 def test_no_major_changes(content):
     """Verify the file wasn't completely rewritten."""
     expected_elements = [
@@ -97,15 +109,15 @@ def test_no_major_changes(content):
         print("  The Edit tool should make minimal changes")
         return False
 
-def main():
+def main(root="."):
     print("=" * 50)
     print("Simple Edit Challenge - Test Results")
     print("=" * 50)
     print()
 
-    content = load_file()
+    content = load_file(root)
     if content is None:
-        sys.exit(1)
+        return 1
 
     total_score = 0
     total_score += test_variable_name(content)
@@ -131,4 +143,4 @@ def main():
     return 0 if total_score >= 75 else 1
 
 if __name__ == "__main__":
-    sys.exit(main())
+    sys.exit(cli.run(sys.modules[__name__]))
@@ -8,6 +8,26 @@ import json
 import sys
 from pathlib import Path
 
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+
+from grading import cli
+from grading.checks import check
+from grading.treeindex import find_starter, index_tree
+
+STARTER = "starter"
+
+INPUTS = ["search_results.json"]
+
+# What each objective searches for, as the challenge's Grep examples do
+SEARCH_TERMS = {
+    "todo": r"TODO",
+    "async_function": r"async\s+function\b",
+    "util_import": r"""from\s+['"]@/utils""",
+    "console_log": r"console\.log",
+}
+SOURCE_EXTENSIONS = (".ts", ".tsx", ".js", ".jsx")
+
+# Answers for the published starter, used when no starter tree is at hand
 EXPECTED = {
     "todo_files": [
         "starter/src/api.ts",
@@ -19,9 +39,27 @@ EXPECTED = {
     "console_log_count": 12
 }
 
-def load_results():
+def expected_results(root="."):
+    """Ground truth for the starter the submission searched.
+
+    The index is cached by content, so identical starters are only ever
+    scanned once.
+    """
+    starter = find_starter(__file__, STARTER)
+    if starter is None:
+        return EXPECTED
+
+    index = index_tree(starter, SEARCH_TERMS, SOURCE_EXTENSIONS)
+    return {
+        "todo_files": [f"{STARTER}/{path}" for path in index.files_with("todo")],
+        "async_function_count": index.count("async_function"),
+        "util_import_count": index.count("util_import"),
+        "console_log_count": index.count("console_log"),
+    }
+
+def load_results(root="."):
     """Load the participant's search results."""
-    results_path = Path("search_results.json")
+    results_path = Path(root) / "search_results.json"
     if not results_path.exists():
         print("FAIL: search_results.json not found")
         return None
@@ -45,14 +83,15 @@ def normalize_paths(paths):
         normalized.add(p)
     return normalized
 
-def test_todo_files(results):
+@check(25)
+def test_todo_files(results, expected=EXPECTED):
     """Test if TODO files were found correctly."""
     found = results.get("todo_files", [])
     found_normalized = normalize_paths(found)
-    expected_normalized = normalize_paths(EXPECTED["todo_files"])
+    expected_normalized = normalize_paths(expected["todo_files"])
 
     matches = found_normalized & expected_normalized
-    score = len(matches) / len(expected_normalized) * 25
+    score = len(matches) / len(expected_normalized) * 25 if expected_normalized else 0
 
     if found_normalized == expected_normalized:
         print("PASS: All TODO files found correctly")
@@ -67,7 +106,8 @@ def test_todo_files(results):
             print(f"  Extra (may be valid): {extra}")
         return int(score)
 
-def test_async_functions(results):
+@check(25)
+def test_async_functions(results, expected=EXPECTED):
     """Test if async functions were found."""
     async_funcs = results.get("async_functions", [])
 
@@ -80,11 +120,11 @@ def test_async_functions(results):
     has_line = all('line' in f for f in async_funcs)
 
     score = 0
-    if len(async_funcs) >= EXPECTED["async_function_count"]:
+    if len(async_funcs) >= expected["async_function_count"]:
         print(f"PASS: Found {len(async_funcs)} async functions")
         score += 15
     else:
-        print(f"PARTIAL: Found {len(async_funcs)}, expected at least {EXPECTED['async_function_count']}")
+        print(f"PARTIAL: Found {len(async_funcs)}, expected at least {expected['async_function_count']}")
         score += 8
 
     if has_file and has_line:
@@ -95,7 +135,8 @@ def test_async_functions(results):
 
     return score
 
-def test_util_imports(results):
+@check(25)
+def test_util_imports(results, expected=EXPECTED):
     """Test if @/utils imports were found."""
     imports = results.get("util_imports", [])
 
@@ -103,17 +144,18 @@ def test_util_imports(results):
         print("FAIL: No @/utils imports found")
         return 0
 
-    if len(imports) >= EXPECTED["util_import_count"]:
+    if len(imports) >= expected["util_import_count"]:
         print(f"PASS: Found {len(imports)} @/utils imports")
         return 25
     else:
-        print(f"PARTIAL: Found {len(imports)}, expected at least {EXPECTED['util_import_count']}")
+        print(f"PARTIAL: Found {len(imports)}, expected at least {expected['util_import_count']}")
         return 15
 
-def test_console_count(results):
+@check(25)
+def test_console_count(results, expected=EXPECTED):
     """Test if console.log count is accurate."""
     count = results.get("console_log_count", 0)
-    expected = EXPECTED["console_log_count"]
+    expected = expected["console_log_count"]
 
     if count == expected:
         print(f"PASS: Console.log count correct ({count})")
@@ -125,22 +167,24 @@ def test_console_count(results):
         print(f"FAIL: Count incorrect ({count}, expected {expected})")
         return 0
 
-def main():
+def main(root="."):
     print("=" * 50)
     print("Search Master Challenge - Test Results")
     print("=" * 50)
     print()
 
-    results = load_results()
+    results = load_results(root)
     if results is None:
         print("\nCreate search_results.json with your findings.")
-        sys.exit(1)
+        return 1
+
+    expected = expected_results(root)
 
     total_score = 0
-    total_score += test_todo_files(results)
-    total_score += test_async_functions(results)
-    total_score += test_util_imports(results)
-    total_score += test_console_count(results)
+    total_score += test_todo_files(results, expected)
+    total_score += test_async_functions(results, expected)
+    total_score += test_util_imports(results, expected)
+    total_score += test_console_count(results, expected)
 
     print()
     print("=" * 50)
@@ -157,4 +201,4 @@ def main():
     return 0 if total_score >= 75 else 1
 
 if __name__ == "__main__":
-    sys.exit(main())
+    sys.exit(cli.run(sys.modules[__name__]))
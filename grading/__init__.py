@@ -0,0 +1,3 @@
+"""
+Shared grading infrastructure for the challenge test suites.
+"""
@@ -0,0 +1,217 @@
+"""
+Asyncio Grading
+Grades submissions on an event loop, so one process can keep hundreds in
+flight while their git subprocesses run.
+
+Every git process, from every submission on the loop, goes through one
+semaphore (GRADING_GIT_PROCESSES, default 8), which keeps the number of
+child processes and pipes predictable however many submissions are queued.
+
+Git never waits longer than the running check's time budget (see
+grading.checks). It starts in its own session and never prompts for
+credentials, and on timeout its whole process group is killed, including
+the ssh or credential helpers it spawned.
+
+Graders keep their synchronous checks. One whose checks shell out to git
+also defines
+
+    async def amain(root="."):
+        await aio.run_git_async(["ls-remote", "--heads", "origin", branch], cwd)
+        return await asyncio.to_thread(main, root)
+
+and the synchronous aio.run_git() calls inside its checks then reuse the
+answers fetched for this submission instead of spawning git again. Graders
+without amain() have no subprocesses; their main() runs on a worker thread.
+
+    python -m grading.batch cohort/ --async --workers 256
+"""
+
+import asyncio
+import contextlib
+import contextvars
+import locale
+import os
+import signal
+import subprocess
+import weakref
+
+from grading import archive, capture, checks, dedup, variants
+from grading.checks import CheckTimeout
+from grading.batch import (discover_graders, discover_submissions, failed_result, load_grader,
+                           store_result)
+from grading.cache import DEFAULT_CACHE_DIR, ResultCache, cache_key
+
+# Concurrent git processes per event loop
+GIT_PROCESSES = int(os.environ.get("GRADING_GIT_PROCESSES", 8))
+
+# Submissions graded at once by grade_cohort()
+DEFAULT_IN_FLIGHT = 256
+
+# (args, cwd) -> (stdout, returncode) fetched by run_git_async() for this submission
+_fetched = contextvars.ContextVar("grading_git_fetched", default=None)
+_semaphores = weakref.WeakKeyDictionary()
+
+# Stands in for the answer of a git command that ran out of time
+_TIMED_OUT = object()
+
+
+def git_env():
+    """Environment for git children: fail instead of waiting for a password."""
+    env = dict(os.environ, GIT_TERMINAL_PROMPT="0")
+    env.setdefault("GIT_SSH_COMMAND", "ssh -o BatchMode=yes")
+    return env
+
+
+def _kill_group(process):
+    try:
+        os.killpg(process.pid, signal.SIGKILL)
+    except (ProcessLookupError, PermissionError):
+        pass
+
+
+def _decode(data):
+    return data.decode(locale.getpreferredencoding(False), "replace").replace("\r\n", "\n")
+
+
+def run_git(args, cwd):
+    """Run git in cwd and return (stripped stdout, returncode).
+
+    Answers already fetched by run_git_async() for the submission being
+    graded are returned without spawning git again. Raises CheckTimeout
+    (after killing git) when the check's budget runs out.
+    """
+    fetched = _fetched.get()
+    key = (tuple(args), str(cwd))
+    if fetched is not None and key in fetched:
+        if fetched[key] is _TIMED_OUT:
+            raise CheckTimeout(f"git {args[0]} timed out")
+        return fetched[key]
+    try:
+        process = subprocess.Popen(
+            ["git", *args], cwd=cwd, env=git_env(), start_new_session=True,
+            stdin=subprocess.DEVNULL, stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True)
+    except Exception as e:
+        return str(e), 1
+    with process:
+        try:
+            stdout, _ = process.communicate(timeout=checks.remaining())
+        except subprocess.TimeoutExpired:
+            _kill_group(process)
+            process.wait()
+            raise CheckTimeout(f"git {args[0]} timed out") from None
+    return stdout.strip(), process.returncode
+
+
+def git_semaphore():
+    """The semaphore bounding git processes on the running loop."""
+    loop = asyncio.get_running_loop()
+    semaphore = _semaphores.get(loop)
+    if semaphore is None:
+        semaphore = _semaphores[loop] = asyncio.Semaphore(GIT_PROCESSES)
+    return semaphore
+
+
+async def run_git_async(args, cwd):
+    """run_git() without blocking the loop; the answer is kept for run_git().
+
+    Fetches happen before any check has started, so they get a check's
+    default budget; one that runs out leaves run_git() to raise CheckTimeout
+    in the check that asks for it. Returns ("", None) in that case.
+    """
+    fetched = _fetched.get()
+    if fetched is None:
+        fetched = {}
+        _fetched.set(fetched)
+    key = (tuple(args), str(cwd))
+    if key not in fetched:
+        with checks.time_budget(checks.DEFAULT_CHECK_TIMEOUT):
+            async with git_semaphore():
+                fetched[key] = await _spawn_git(args, cwd)
+    return ("", None) if fetched[key] is _TIMED_OUT else fetched[key]
+
+
+async def _spawn_git(args, cwd):
+    try:
+        process = await asyncio.create_subprocess_exec(
+            "git", *args, cwd=cwd, env=git_env(), start_new_session=True,
+            stdin=subprocess.DEVNULL, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+    except Exception as e:
+        return str(e), 1
+    try:
+        stdout, _ = await asyncio.wait_for(process.communicate(), checks.remaining())
+    except (asyncio.TimeoutError, asyncio.CancelledError) as e:
+        _kill_group(process)
+        await process.wait()
+        if isinstance(e, asyncio.CancelledError):
+            raise
+        return _TIMED_OUT
+    return _decode(stdout).strip(), process.returncode
+
+
+async def run_grader(module, root):
+    """Async counterpart of grading.batch.run_grader()."""
+    token = _fetched.set({})
+    with capture.captured() as output:
+        try:
+            if hasattr(module, "amain"):
+                exit_code = await module.amain(root)
+            else:
+                exit_code = await asyncio.to_thread(module.main, root)
+        except SystemExit as e:
+            exit_code = e.code if isinstance(e.code, int) else 1
+        except Exception as e:
+            print(f"ERROR: Grader crashed: {e!r}")
+            exit_code = 2
+        finally:
+            _fetched.reset(token)
+    return exit_code, output.getvalue()
+
+
+async def grade(module, root, cache=None, participant=None):
+    """Async counterpart of grading.batch.grade(), with the same result record.
+
+    wall_ms and cpu_ms also count what the loop did for other submissions
+    while this one was waiting. Archives are unpacked on a worker thread.
+    """
+    with contextlib.ExitStack() as stack:
+        try:
+            root = await asyncio.to_thread(
+                stack.enter_context, archive.mounted(root, module.INPUTS))
+        except archive.ArchiveError as e:
+            return failed_result(f"ERROR: Unreadable submission: {e}")
+
+        key = None
+        if cache is not None:
+            key = cache_key(module.__file__, module.INPUTS, root, participant)
+            result = cache.get(key)
+            if result is not None:
+                return dict(result, cached=True)
+
+        with checks.recording() as session, variants.grading_as(participant):
+            exit_code, text = await run_grader(module, root)
+        return store_result(cache, key, exit_code, text, session)
+
+
+async def grade_cohort(cohort, in_flight=DEFAULT_IN_FLIGHT, graders=None,
+                       cache_dir=DEFAULT_CACHE_DIR, deduplicate=True):
+    """Grade every submission in a cohort on the running loop, in discovery order.
+
+    Identical submissions are graded once (see grading.dedup) unless
+    deduplicate is false.
+    """
+    graders = graders or discover_graders()
+    modules = {key: load_grader(key, path) for key, path in graders.items()}
+    cache = ResultCache(cache_dir) if cache_dir else None
+    slots = asyncio.Semaphore(in_flight)
+
+    async def grade_one(participant, challenge, root):
+        async with slots:
+            return await grade(modules[challenge], root, cache, participant)
+
+    tasks = discover_submissions(cohort, graders)
+    if deduplicate:
+        clusters = await asyncio.to_thread(dedup.ingest, tasks, modules)
+    else:
+        clusters = [[task] for task in tasks]
+    results = await asyncio.gather(*(grade_one(*cluster[0]) for cluster in clusters))
+    return dedup.fan_out(tasks, clusters, results)
@@ -0,0 +1,292 @@
+#!/usr/bin/env python3
+"""
+Batch Grader
+Runs every challenge's tests.py across a cohort of submissions on a process pool.
+
+Workers are forked from a forkserver that has already imported and warmed
+every grader (see grading.preload), so a new worker starts grading at once
+instead of re-importing graders, recompiling their patterns and reloading
+starter indexes.
+
+Cohort layout mirrors the repository: each participant directory contains the
+challenge directories they attempted, e.g.
+
+    cohort/alice/easy/01-file-explorer/results.json
+    cohort/bob/hard/01-full-feature-flow/src/...
+    cohort/carol/easy/04-simple-edit.zip
+
+A challenge may also be submitted as an archive beside where its directory
+would be (.zip, .tar.gz, .tgz, .tar or a git bundle; see grading.archive).
+
+Usage:
+    python -m grading.batch cohort/ [--workers N] [--threads | --async] [--no-cache] [--no-dedup]
+                                   [--duplicates clusters.json] [--output results.json]
+"""
+
+import argparse
+import asyncio
+import contextlib
+import importlib.util
+import json
+import multiprocessing
+import os
+import re
+import sys
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from pathlib import Path
+
+from grading import archive, capture, checks, dedup, variants
+from grading.cache import DEFAULT_CACHE_DIR, ResultCache, cache_key, source_digest
+from grading.rubric import Rubric
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+
+TOTAL_PATTERN = re.compile(r'^TOTAL SCORE: (\d+)/(\d+)', re.MULTILINE)
+
+# Graders (and the result cache) set up once per worker process by _init_worker().
+_GRADERS = {}
+_CACHE = None
+
+
+def discover_graders(repo_root=REPO_ROOT):
+    """Find every */*/tests.py grader, keyed by challenge path (e.g. easy/01-file-explorer)."""
+    graders = {}
+    for path in sorted(repo_root.glob("*/*/tests.py")):
+        key = path.parent.relative_to(repo_root).as_posix()
+        graders[key] = path
+    return graders
+
+
+def load_grader(key, path):
+    """Import a grader's tests.py as a module without running main()."""
+    name = "grader_" + re.sub(r'\W', '_', key)
+    spec = importlib.util.spec_from_file_location(name, path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def prewarm(modules):
+    """Do the per-grader work that would otherwise fall on the first submission.
+
+    Hashes each grader's source for the result cache, compiles its rubric's
+    combined patterns and loads the index of the starter shipped beside it
+    (graders that derive their answers from a starter expose expected_results()).
+    """
+    for module in modules.values():
+        source_digest(module.__file__)
+        for value in vars(module).values():
+            if isinstance(value, Rubric):
+                value.warm()
+        if hasattr(module, "expected_results"):
+            module.expected_results(Path(module.__file__).resolve().parent)
+
+
+def discover_submissions(cohort, challenges):
+    """List (participant, challenge, root) for every challenge submitted in the cohort.
+
+    root is the challenge directory or, failing that, an archive of it.
+    """
+    tasks = []
+    for participant in sorted(p for p in Path(cohort).iterdir() if p.is_dir()):
+        for challenge in challenges:
+            root = participant / challenge
+            if not root.is_dir():
+                root = archive.find_archive(root)
+            if root is not None:
+                tasks.append((participant.name, challenge, str(root.resolve())))
+    return tasks
+
+
+def _init_worker(grader_paths, cache_dir=None):
+    """Import every grader once per worker so submissions only pay for grading.
+
+    Graders the forkserver preloaded are inherited rather than imported again.
+    """
+    global _CACHE
+    preload = sys.modules.get("grading.preload")
+    preloaded = preload.GRADERS if preload else {}
+    for key, path in grader_paths.items():
+        module = preloaded.get(key)
+        if module is None or Path(module.__file__).resolve() != Path(path).resolve():
+            module = load_grader(key, path)
+        _GRADERS[key] = module
+    _CACHE = ResultCache(cache_dir) if cache_dir else None
+
+
+def run_grader(module, root):
+    """Run a grader's main() against one submission root, returning (exit_code, output).
+
+    Safe to call from many threads or asyncio tasks at once: nothing changes
+    the working directory and output is captured per context.
+    """
+    with capture.captured() as output:
+        try:
+            exit_code = module.main(root)
+        except SystemExit as e:
+            exit_code = e.code if isinstance(e.code, int) else 1
+        except Exception as e:
+            print(f"ERROR: Grader crashed: {e!r}")
+            exit_code = 2
+    return exit_code, output.getvalue()
+
+
+def grade(module, root, cache=None, participant=None):
+    """Grade one submission, reusing a cached result when its inputs are unchanged.
+
+    Returns {"score", "max_score", "exit_code", "output", "checks", "timeouts",
+    "wall_ms", "cpu_ms", "cached"}, where checks holds one record per test_*
+    call and timeouts counts the checks that ran out of time (see
+    grading.checks). Graders that crash are never cached. root may be an
+    archive, of which only the declared INPUTS are read. participant selects
+    the variant the submission is graded against (see grading.variants).
+    """
+    with contextlib.ExitStack() as stack:
+        try:
+            root = stack.enter_context(archive.mounted(root, module.INPUTS))
+        except archive.ArchiveError as e:
+            return failed_result(f"ERROR: Unreadable submission: {e}")
+
+        key = None
+        if cache is not None:
+            key = cache_key(module.__file__, module.INPUTS, root, participant)
+            result = cache.get(key)
+            if result is not None:
+                return dict(result, cached=True)
+
+        with checks.recording() as session, variants.grading_as(participant):
+            exit_code, text = run_grader(module, root)
+        return store_result(cache, key, exit_code, text, session)
+
+
+def failed_result(message):
+    """Result record of a submission that could not be graded at all (never cached)."""
+    return {
+        "score": 0, "max_score": None, "exit_code": 2, "output": message + "\n",
+        "checks": [], "timeouts": 0, "wall_ms": None, "cpu_ms": None, "cached": False,
+    }
+
+
+def store_result(cache, key, exit_code, text, session):
+    """Build the result record of a finished grading run and cache it unless it crashed or timed out.
+
+    A timeout says more about the machine or the network at the time than
+    about the submission, so the next run grades it afresh.
+    """
+    match = TOTAL_PATTERN.search(text)
+    result = {
+        "score": int(match.group(1)) if match else 0,
+        "max_score": int(match.group(2)) if match else None,
+        "exit_code": exit_code,
+        "output": text,
+        "checks": session.checks,
+        "timeouts": session.timeouts,
+        "wall_ms": session.wall_ms,
+        "cpu_ms": session.cpu_ms,
+    }
+    if key is not None and exit_code in (0, 1) and not session.timeouts:
+        cache.put(key, result)
+    return dict(result, cached=False)
+
+
+def grade_submission(task):
+    """Run one grader against one submission and return its result record."""
+    participant, challenge, root = task
+    result = grade(_GRADERS[challenge], root, _CACHE, participant)
+    return dict(participant=participant, challenge=challenge, **result)
+
+
+def worker_context():
+    """Multiprocessing context whose workers fork from a warm image of every grader.
+
+    Falls back to the platform default where there is no forkserver.
+    """
+    if "forkserver" not in multiprocessing.get_all_start_methods():
+        return multiprocessing.get_context()
+    context = multiprocessing.get_context("forkserver")
+    context.set_forkserver_preload(["grading.preload"])
+    return context
+
+
+def grade_cohort(cohort, workers=None, graders=None, threads=False, cache_dir=DEFAULT_CACHE_DIR,
+                 deduplicate=True):
+    """Grade every submission in a cohort and return the list of result records.
+
+    Identical submissions are graded once (see grading.dedup) unless
+    deduplicate is false. Pass cache_dir=None to regrade everything.
+    """
+    graders = graders or discover_graders()
+    tasks = discover_submissions(cohort, graders)
+    if not tasks:
+        return []
+
+    grader_paths = {key: str(path) for key, path in graders.items()}
+    if threads:
+        _init_worker(grader_paths, cache_dir)
+        modules = _GRADERS
+    else:
+        modules = {key: load_grader(key, path) for key, path in graders.items()}
+    clusters = dedup.ingest(tasks, modules) if deduplicate else [[task] for task in tasks]
+    unique = [cluster[0] for cluster in clusters]
+
+    if threads:
+        with ThreadPoolExecutor(max_workers=workers or 32) as pool:
+            results = list(pool.map(grade_submission, unique))
+    else:
+        workers = workers or os.cpu_count() or 1
+        chunksize = max(1, len(unique) // (workers * 4))
+        with ProcessPoolExecutor(
+            max_workers=workers,
+            mp_context=worker_context(),
+            initializer=_init_worker,
+            initargs=(grader_paths, cache_dir),
+        ) as pool:
+            results = list(pool.map(grade_submission, unique, chunksize=chunksize))
+    return dedup.fan_out(tasks, clusters, results)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Grade a cohort of submissions.")
+    parser.add_argument("cohort", help="Directory containing one subdirectory per participant")
+    parser.add_argument("--workers", type=int, default=None, help="Worker processes (default: CPU count)")
+    parser.add_argument("--threads", action="store_true", help="Grade on a thread pool in this process")
+    parser.add_argument("--async", dest="use_async", action="store_true",
+                        help="Grade on an asyncio event loop in this process (--workers: submissions in flight)")
+    parser.add_argument("--cache-dir", default=str(DEFAULT_CACHE_DIR), help="Result cache directory")
+    parser.add_argument("--no-cache", action="store_true", help="Regrade every submission")
+    parser.add_argument("--no-dedup", action="store_true", help="Grade identical submissions separately")
+    parser.add_argument("--duplicates", help="Write a JSON report of duplicate submission clusters here")
+    parser.add_argument("--output", help="Write results JSON here instead of stdout")
+    args = parser.parse_args(argv)
+
+    cache_dir = None if args.no_cache else args.cache_dir
+    deduplicate = not args.no_dedup
+    if args.use_async:
+        from grading import aio  # imports this module
+        results = asyncio.run(aio.grade_cohort(
+            args.cohort, in_flight=args.workers or aio.DEFAULT_IN_FLIGHT, cache_dir=cache_dir,
+            deduplicate=deduplicate))
+    else:
+        results = grade_cohort(args.cohort, workers=args.workers, threads=args.threads,
+                               cache_dir=cache_dir, deduplicate=deduplicate)
+
+    passed = sum(1 for r in results if r["exit_code"] == 0)
+    cached = sum(1 for r in results if r["cached"])
+    timed_out = sum(1 for r in results if r["timeouts"])
+    duplicates = sum(1 for r in results if r["duplicate_of"])
+    print(f"Graded {len(results)} submissions ({passed} passed, {cached} from cache, "
+          f"{duplicates} duplicates, {timed_out} with timeouts)", file=sys.stderr)
+    if args.duplicates:
+        Path(args.duplicates).write_text(json.dumps(dedup.report(results), indent=2) + "\n")
+
+    text = json.dumps(results, indent=2)
+    if args.output:
+        Path(args.output).write_text(text + "\n")
+    else:
+        print(text)
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
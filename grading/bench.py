@@ -0,0 +1,186 @@
+#!/usr/bin/env python3
+"""
+Grader Benchmark
+Measures throughput, latency and memory of every grader on a synthetic corpus.
+
+Each grader is benchmarked in a fresh process so its peak RSS is its own.
+Results are written as a baseline JSON file; pass --compare to flag
+regressions against an earlier baseline.
+
+Usage:
+    python -m grading.bench [--corpus DIR] [--per-challenge N] [--output bench.json]
+    python -m grading.bench --compare old.json --output new.json
+"""
+
+import argparse
+import json
+import multiprocessing
+import os
+import platform
+import resource
+import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+from grading import corpus
+from grading.batch import discover_graders, grade, load_grader
+
+# Relative slowdown (or memory growth) tolerated before --compare reports a regression
+DEFAULT_TOLERANCE = 0.20
+# Latency changes smaller than this are timer noise, whatever the percentage
+MIN_LATENCY_DELTA_MS = 1.0
+
+
+def percentile(values, pct):
+    """Nearest-rank percentile of a non-empty list."""
+    ordered = sorted(values)
+    index = max(0, min(len(ordered) - 1, round(pct / 100 * len(ordered)) - 1))
+    return ordered[index]
+
+
+def peak_rss_mb():
+    """Peak resident set size of this process in MiB.
+
+    Prefers VmHWM on Linux: ru_maxrss survives fork+exec, so a spawned child
+    would report its parent's peak.
+    """
+    try:
+        for line in Path("/proc/self/status").read_text().splitlines():
+            if line.startswith("VmHWM:"):
+                return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+
+def bench_grader(challenge, path, roots):
+    """Grade every root once with one grader (no cache) and return the raw timings."""
+    module = load_grader(challenge, path)
+    latencies = []
+    started = time.perf_counter()
+    for root in roots:
+        t0 = time.perf_counter()
+        grade(module, root, participant=Path(root).name)
+        latencies.append((time.perf_counter() - t0) * 1000)
+    return latencies, time.perf_counter() - started, peak_rss_mb()
+
+
+def run(corpus_dir, per_challenge=20, commits=corpus.DEFAULT_COMMITS,
+        report_bytes=corpus.DEFAULT_REPORT_BYTES, repeat=3):
+    """Generate (or reuse) a corpus and benchmark every grader on it.
+
+    Each pass runs in a fresh process, so in-process memoization cannot make
+    later passes look faster. Every submission keeps its fastest latency and
+    throughput comes from the fastest pass, as timeit does.
+    """
+    manifest = Path(corpus_dir) / "manifest.json"
+    if manifest.exists():
+        submissions = json.loads(manifest.read_text())
+    else:
+        submissions = corpus.generate(corpus_dir, per_challenge, commits, report_bytes)
+        manifest.write_text(json.dumps(submissions, indent=2))
+
+    graders = discover_graders()
+    results = {}
+    spawn = multiprocessing.get_context("spawn")
+    # Graders run in spawned processes, which find the variants the corpus
+    # assigned through the environment; the repository's variants/ is left alone
+    previous = os.environ.get("GRADING_VARIANTS_DIR")
+    os.environ["GRADING_VARIANTS_DIR"] = str(Path(corpus_dir).resolve() / corpus.VARIANTS)
+    try:
+        for challenge, roots in submissions.items():
+            if challenge not in graders:
+                continue
+            best, elapsed, rss = [float("inf")] * len(roots), float("inf"), 0.0
+            for _ in range(repeat):
+                with ProcessPoolExecutor(max_workers=1, mp_context=spawn) as pool:
+                    latencies, seconds, peak = pool.submit(
+                        bench_grader, challenge, str(graders[challenge]), roots).result()
+                best = [min(a, b) for a, b in zip(best, latencies)]
+                elapsed, rss = min(elapsed, seconds), max(rss, peak)
+
+            results[challenge] = {
+                "submissions": len(roots),
+                "per_sec": round(len(roots) / elapsed, 2) if elapsed else None,
+                "p50_ms": round(percentile(best, 50), 3),
+                "p99_ms": round(percentile(best, 99), 3),
+                "peak_rss_mb": round(rss, 1),
+            }
+    finally:
+        if previous is None:
+            del os.environ["GRADING_VARIANTS_DIR"]
+        else:
+            os.environ["GRADING_VARIANTS_DIR"] = previous
+
+    return {
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "per_challenge": per_challenge,
+        "repeat": repeat,
+        "commits": list(commits),
+        "report_bytes": list(report_bytes),
+        "graders": results,
+    }
+
+
+def compare(current, baseline, tolerance=DEFAULT_TOLERANCE):
+    """List human-readable regressions of current against a baseline."""
+    regressions = []
+    for challenge, now in current["graders"].items():
+        before = baseline.get("graders", {}).get(challenge)
+        if not before:
+            continue
+        for metric, higher_is_worse in (("p50_ms", True), ("p99_ms", True),
+                                        ("peak_rss_mb", True), ("per_sec", False)):
+            old, new = before.get(metric), now.get(metric)
+            if not old or new is None:
+                continue
+            if metric.endswith("_ms") and abs(new - old) < MIN_LATENCY_DELTA_MS:
+                continue
+            change = (new - old) / old
+            if (change if higher_is_worse else -change) > tolerance:
+                regressions.append(f"{challenge}: {metric} {old} -> {new} ({change:+.0%})")
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark every grader on a synthetic corpus.")
+    parser.add_argument("--corpus", help="Corpus directory (generated if it has no manifest.json)")
+    parser.add_argument("--per-challenge", type=int, default=20, help="Submissions per challenge")
+    parser.add_argument("--max-commits", type=int, default=10000, help="Largest git history to generate")
+    parser.add_argument("--repeat", type=int, default=3, help="Passes over the corpus; the fastest counts")
+    parser.add_argument("--output", help="Write the baseline JSON here")
+    parser.add_argument("--compare", help="Baseline JSON to check for regressions")
+    parser.add_argument("--tolerance", type=float, default=DEFAULT_TOLERANCE)
+    args = parser.parse_args(argv)
+
+    commits = tuple(c for c in corpus.DEFAULT_COMMITS if c <= args.max_commits) or (args.max_commits,)
+
+    if args.corpus:
+        report = run(args.corpus, args.per_challenge, commits, repeat=args.repeat)
+    else:
+        with tempfile.TemporaryDirectory(prefix="grading-corpus-") as tmp:
+            report = run(tmp, args.per_challenge, commits, repeat=args.repeat)
+
+    print(f"{'challenge':<28} {'subs/s':>9} {'p50 ms':>9} {'p99 ms':>9} {'RSS MiB':>8}")
+    for challenge, stats in report["graders"].items():
+        print(f"{challenge:<28} {stats['per_sec']:>9} {stats['p50_ms']:>9} "
+              f"{stats['p99_ms']:>9} {stats['peak_rss_mb']:>8}")
+
+    if args.output:
+        Path(args.output).write_text(json.dumps(report, indent=2) + "\n")
+
+    if args.compare:
+        regressions = compare(report, json.loads(Path(args.compare).read_text()), args.tolerance)
+        for line in regressions:
+            print(f"REGRESSION: {line}")
+        return 1 if regressions else 0
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
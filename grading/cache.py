@@ -0,0 +1,175 @@
+"""
+Result Cache
+Content-addressed store of grading results so unchanged submissions are never
+regraded.
+
+Each grader declares the files it reads in a module-level INPUTS list, relative
+to the submission root. Directories are hashed recursively and entries written
+as "git:<path>" stand for the state of the repository containing <path> (HEAD,
+refs and config). The cache key combines those hashes with the source of the
+grader, of the starter/ shipped beside it and its per-participant variants
+(graders may derive their expected answers from them, see grading.variants)
+and of this package, so any rubric change invalidates old results. A
+participant's key also names the variant they were assigned.
+
+Entries are JSON files named by key. Reads refresh the file's mtime and writes
+evict the least recently used entries once the directory exceeds its size cap.
+"""
+
+import functools
+import hashlib
+import json
+import os
+import tempfile
+from pathlib import Path
+
+from grading.gitrepo import GitRepo, find_git_dir
+from grading.variants import assigned, variants_dir
+
+DEFAULT_CACHE_DIR = Path(os.environ.get(
+    "GRADING_CACHE_DIR",
+    Path(os.environ.get("XDG_CACHE_HOME", Path.home() / ".cache")) / "claude-code-challenges",
+))
+DEFAULT_MAX_BYTES = 256 * 1024 * 1024
+
+PACKAGE_DIR = Path(__file__).resolve().parent
+# Trees shipped beside a grader that it grades against (see grading.treeindex.find_starter)
+SHIPPED_TREES = ("starter", "fixture")
+
+
+def _hash_file(digest, path):
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            digest.update(chunk)
+
+
+def _hash_path(digest, path):
+    if path.is_file():
+        digest.update(b"file\0")
+        _hash_file(digest, path)
+    elif path.is_dir():
+        digest.update(b"dir\0")
+        for child in sorted(path.rglob("*")):
+            if child.is_file():
+                digest.update(child.relative_to(path).as_posix().encode() + b"\0")
+                _hash_file(digest, child)
+    else:
+        digest.update(b"missing\0")
+
+
+def _hash_git(digest, path):
+    git_dir, _ = find_git_dir(path) if path.exists() else (None, None)
+    if git_dir is None:
+        digest.update(b"no-repo\0")
+        return
+
+    repo = GitRepo(git_dir)
+    digest.update(f"head {repo.head()}\0".encode())
+    for directory in dict.fromkeys([repo.git_dir, repo.common_dir]):
+        for name in ("HEAD", "config", "packed-refs"):
+            _hash_path(digest, directory / name)
+        refs = directory / "refs"
+        if refs.is_dir():
+            _hash_path(digest, refs)
+
+
+def inputs_digest(root, inputs):
+    """Hash the grader-relevant inputs of one submission."""
+    digest = hashlib.sha256()
+    root = Path(root)
+    for entry in inputs:
+        digest.update(entry.encode() + b"\0")
+        if entry.startswith("git:"):
+            _hash_git(digest, root / entry[len("git:"):])
+        else:
+            _hash_path(digest, root / entry)
+    return digest.hexdigest()
+
+
+@functools.lru_cache(maxsize=None)
+def source_digest(grader_path):
+    """Hash a grader's source, shipped trees and their variants together with the shared grading package."""
+    digest = hashlib.sha256()
+    for path in [Path(grader_path), *sorted(PACKAGE_DIR.glob("*.py"))]:
+        digest.update(path.name.encode() + b"\0")
+        _hash_file(digest, path)
+    for name in SHIPPED_TREES:
+        shipped = Path(grader_path).resolve().parent / name
+        if shipped.is_dir():
+            _hash_path(digest, shipped)
+    variants = variants_dir(grader_path)
+    if variants.is_dir():
+        _hash_path(digest, variants)
+    return digest.hexdigest()
+
+
+def cache_key(grader_path, inputs, root, participant=None):
+    """Cache key for grading participant's submission at root with the given grader."""
+    key = f"{source_digest(str(grader_path))}:{inputs_digest(root, inputs)}"
+    variant = assigned(grader_path, participant)
+    if variant is not None:
+        key += f":{variant}"
+    return hashlib.sha256(key.encode()).hexdigest()
+
+
+class ResultCache:
+    """On-disk LRU cache of result records, safe to share between processes."""
+
+    def __init__(self, directory=DEFAULT_CACHE_DIR, max_bytes=DEFAULT_MAX_BYTES):
+        self.directory = Path(directory)
+        self.max_bytes = max_bytes
+        self._size = None  # running estimate; rescanned only when over the cap
+
+    def _path(self, key):
+        return self.directory / key[:2] / f"{key}.json"
+
+    def get(self, key):
+        """Return the cached result for key, or None."""
+        path = self._path(key)
+        try:
+            with open(path) as f:
+                result = json.load(f)
+            os.utime(path)
+            return result
+        except (OSError, ValueError):
+            return None
+
+    def put(self, key, result):
+        """Store a result atomically, then evict old entries if over the size cap."""
+        path = self._path(key)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+        with os.fdopen(fd, "w") as f:
+            json.dump(result, f)
+            size = f.tell()
+        os.replace(tmp, path)
+
+        if self._size is None:
+            self.evict()
+        else:
+            self._size += size
+            if self._size > self.max_bytes:
+                self.evict()
+
+    def evict(self):
+        """Delete least recently used entries until the cache fits in max_bytes."""
+        entries = []
+        total = 0
+        for path in self.directory.glob("*/*.json"):
+            try:
+                stat = path.stat()
+            except OSError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, path))
+            total += stat.st_size
+
+        entries.sort()
+        for _, size, path in entries:
+            if total <= self.max_bytes:
+                break
+            try:
+                path.unlink()
+                total -= size
+            except OSError:
+                pass
+        self._size = total
@@ -0,0 +1,53 @@
+"""
+Per-context stdout capture.
+
+Graders report results with plain print() calls. Installing a routing stdout
+lets each thread or asyncio task collect its own grader's output, so many
+submissions can be graded side by side in one process without chdir or
+redirect_stdout races.
+"""
+
+import contextlib
+import contextvars
+import io
+import sys
+
+_buffer = contextvars.ContextVar("grading_stdout", default=None)
+
+
+class _RoutingStdout:
+    """Stand-in for sys.stdout that writes to the current context's buffer, if any."""
+
+    def __init__(self, default):
+        self._default = default
+
+    def _target(self):
+        buffer = _buffer.get()
+        return self._default if buffer is None else buffer
+
+    def write(self, text):
+        return self._target().write(text)
+
+    def flush(self):
+        self._target().flush()
+
+    def __getattr__(self, name):
+        return getattr(self._target(), name)
+
+
+def install():
+    """Replace sys.stdout with the routing stream (idempotent)."""
+    if not isinstance(sys.stdout, _RoutingStdout):
+        sys.stdout = _RoutingStdout(sys.stdout)
+
+
+@contextlib.contextmanager
+def captured():
+    """Collect everything printed in the current thread/task into a StringIO."""
+    install()
+    buffer = io.StringIO()
+    token = _buffer.set(buffer)
+    try:
+        yield buffer
+    finally:
+        _buffer.reset(token)
@@ -0,0 +1,295 @@
+"""
+Check Recording
+Per-check scores and timings for the test_* functions of every grader.
+
+Decorating a check with @check(max_points) leaves it callable exactly as
+before. While a recording session is active, each call also records the
+points awarded, the message it printed and its wall and CPU time.
+
+Independent checks can run concurrently with run_checks(), which prints their
+output and records them in the order given, exactly as calling them one after
+another would. A check that needs another to have finished first declares it:
+
+    @check(25, after=("test_fix_implemented",))
+    def test_all_tests_pass(root="."): ...
+
+Every check has a time budget (GRADING_CHECK_TIMEOUT seconds, or
+@check(..., timeout=N)) within its submission's (GRADING_SUBMISSION_TIMEOUT).
+Code that blocks, such as grading.aio.run_git(), waits at most remaining()
+seconds and raises CheckTimeout when the budget runs out. The check then
+scores as a timeout: it prints a TIMEOUT line, earns nothing and is
+counted in the session's timeouts. Checks that start after the
+submission's budget is spent time out at once.
+"""
+
+import contextlib
+import contextvars
+import functools
+import io
+import os
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures import TimeoutError as FutureTimeout
+
+from grading import capture
+
+
+def _seconds(name, default):
+    """A budget from the environment; 0 or less means unlimited (None)."""
+    value = float(os.environ.get(name, default))
+    return value if value > 0 else None
+
+
+# Threads shared by every run_checks() call in the process; 1 runs checks inline
+DEFAULT_CHECK_WORKERS = int(os.environ.get("GRADING_CHECK_WORKERS", 4))
+
+DEFAULT_CHECK_TIMEOUT = _seconds("GRADING_CHECK_TIMEOUT", 30)
+DEFAULT_SUBMISSION_TIMEOUT = _seconds("GRADING_SUBMISSION_TIMEOUT", 120)
+
+_session = contextvars.ContextVar("grading_session", default=None)
+_deadline = contextvars.ContextVar("grading_deadline", default=None)
+_executors = {}
+_executors_lock = threading.Lock()
+
+
+class CheckTimeout(Exception):
+    """The running check (or its submission) is out of time."""
+
+
+class Session:
+    """Check records collected while grading one submission."""
+
+    def __init__(self):
+        self.checks = []
+        self.timeouts = 0
+        self.wall_ms = None
+        self.cpu_ms = None
+        self.worker_cpu = 0.0  # seconds spent by run_checks() threads
+
+
+def remaining():
+    """Seconds left in the current check's budget, or None when unlimited."""
+    deadline = _deadline.get()
+    return None if deadline is None else max(0.0, deadline - time.monotonic())
+
+
+@contextlib.contextmanager
+def time_budget(seconds):
+    """Limit the code run in this context to seconds (None: no limit).
+
+    Budgets nest: an inner one can only shorten the deadline.
+    """
+    deadline = _deadline.get()
+    if seconds is not None:
+        ends = time.monotonic() + seconds
+        deadline = ends if deadline is None else min(deadline, ends)
+    token = _deadline.set(deadline)
+    try:
+        yield
+    finally:
+        _deadline.reset(token)
+
+
+def _timed_out(name, max_points):
+    """Report a check that ran out of time and return what it scores."""
+    print(f"TIMEOUT: {name} did not finish in time")
+    return False if max_points is None else 0
+
+
+def check(max_points=None, after=(), timeout=None):
+    """Mark a test_* function as a scored check worth max_points.
+
+    Checks that gate grading rather than award points (they return True or
+    False) leave max_points as None. after names the checks that must finish
+    before this one starts when they run together under run_checks().
+    timeout overrides the default budget in seconds.
+    """
+    budget = DEFAULT_CHECK_TIMEOUT if timeout is None else timeout
+
+    def decorator(fn):
+        def call(*args, **kwargs):
+            """(result, timed_out) of running fn within its budget."""
+            with time_budget(budget):
+                try:
+                    if remaining() == 0:
+                        raise CheckTimeout()
+                    return fn(*args, **kwargs), False
+                except CheckTimeout:
+                    return _timed_out(fn.__name__, max_points), True
+
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            session = _session.get()
+            if session is None:
+                return call(*args, **kwargs)[0]
+
+            record = {"check": fn.__name__, "points": None, "max_points": max_points}
+            wall, cpu = time.perf_counter(), time.thread_time()
+            try:
+                with capture.captured() as output:
+                    result, timed_out = call(*args, **kwargs)
+            except Exception as e:
+                record["error"] = repr(e)
+                raise
+            else:
+                if isinstance(result, bool):
+                    record["passed"] = result
+                else:
+                    record["points"] = result
+                if timed_out:
+                    record["timed_out"] = True
+                    session.timeouts += 1
+                return result
+            finally:
+                record["wall_ms"] = round((time.perf_counter() - wall) * 1000, 3)
+                record["cpu_ms"] = round((time.thread_time() - cpu) * 1000, 3)
+                record["message"] = output.getvalue().rstrip("\n")
+                sys.stdout.write(output.getvalue())
+                session.checks.append(record)
+
+        wrapper.max_points = max_points
+        wrapper.after = tuple(after)
+        return wrapper
+    return decorator
+
+
+def _shared_executor(workers):
+    with _executors_lock:
+        executor = _executors.get(workers)
+        if executor is None:
+            executor = _executors[workers] = ThreadPoolExecutor(
+                workers, thread_name_prefix="grading-check")
+        return executor
+
+
+def _retire_executor(workers, executor):
+    """Stop handing out an executor whose threads may be stuck in abandoned checks.
+
+    Later run_checks() calls get a fresh pool; the old one's idle threads
+    exit once the calls still using it let go of it.
+    """
+    with _executors_lock:
+        if _executors.get(workers) is executor:
+            del _executors[workers]
+
+
+# Pool threads do not survive fork; children start their own
+os.register_at_fork(after_in_child=_executors.clear)
+
+
+def run_checks(checks, *args, workers=None):
+    """Call every check with args and return their results in order.
+
+    Checks run on a bounded thread pool, each as soon as the checks it names
+    in after= have finished. Their output is buffered per check and written
+    (and recorded into the active session) in the order given, so the report
+    is identical to calling them sequentially; if one raises, the output of
+    the checks before it is written and the exception propagates.
+
+    Threads cannot be killed: a check still running when the submission's
+    budget runs out is reported as a timeout and left to finish unobserved,
+    along with any check that was waiting for it. The pool is then replaced
+    for later calls, so checks that never return cannot use up its threads
+    for every submission after them.
+    """
+    workers = DEFAULT_CHECK_WORKERS if workers is None else workers
+    if workers <= 1 or len(checks) <= 1:
+        return [fn(*args) for fn in checks]
+
+    position = {fn.__name__: i for i, fn in enumerate(checks)}
+    for i, fn in enumerate(checks):
+        for name in getattr(fn, "after", ()):
+            if position.get(name, len(checks)) >= i:
+                raise ValueError(f"{fn.__name__} runs after {name}, which must be listed before it")
+
+    parent = _session.get()
+    executor = _shared_executor(workers)
+    futures = []
+
+    def task(fn, deps):
+        output = io.StringIO()
+        session = Session() if parent is not None else None
+        for dep in deps:
+            try:
+                error = dep.result(timeout=remaining())[3]
+            except FutureTimeout:
+                error = CheckTimeout()
+            if error is not None:
+                # Never started, as in sequential mode
+                return None, output, session, error
+        _session.set(session)
+        cpu = time.thread_time()
+        try:
+            with capture.captured() as output:
+                return fn(*args), output, session, None
+        except Exception as e:
+            return None, output, session, e
+        finally:
+            if session is not None:
+                session.worker_cpu = time.thread_time() - cpu
+
+    for fn in checks:
+        deps = [futures[position[name]] for name in getattr(fn, "after", ())]
+        context = contextvars.copy_context()
+        futures.append(executor.submit(context.run, task, fn, deps))
+
+    results = []
+    try:
+        for fn, future in zip(checks, futures):
+            try:
+                result, output, session, error = future.result(timeout=remaining())
+            except FutureTimeout:
+                result, output, session, error = None, None, None, CheckTimeout()
+            if isinstance(error, CheckTimeout):
+                results.append(_record_timeout(fn, parent))
+                continue
+            sys.stdout.write(output.getvalue())
+            if session is not None:
+                parent.checks.extend(session.checks)
+                parent.timeouts += session.timeouts
+                parent.worker_cpu += session.worker_cpu
+            if error is not None:
+                raise error
+            results.append(result)
+    finally:
+        for future in futures:
+            future.cancel()
+        if not all(future.done() for future in futures):
+            _retire_executor(workers, executor)
+    return results
+
+
+def _record_timeout(fn, session):
+    """Score a check that run_checks() gave up waiting for."""
+    max_points = getattr(fn, "max_points", None)
+    with capture.captured() as output:
+        result = _timed_out(fn.__name__, max_points)
+    sys.stdout.write(output.getvalue())
+    if session is not None:
+        session.checks.append({
+            "check": fn.__name__, "points": None if max_points is None else result,
+            "max_points": max_points, "timed_out": True,
+            "message": output.getvalue().rstrip("\n"),
+        })
+        session.timeouts += 1
+    return result
+
+
+@contextlib.contextmanager
+def recording(timeout=DEFAULT_SUBMISSION_TIMEOUT):
+    """Record every check called in the current thread/task into a Session.
+
+    timeout is the submission's time budget in seconds (None: unlimited).
+    """
+    session = Session()
+    token = _session.set(session)
+    wall, cpu = time.perf_counter(), time.thread_time()
+    try:
+        with time_budget(timeout):
+            yield session
+    finally:
+        session.wall_ms = round((time.perf_counter() - wall) * 1000, 3)
+        session.cpu_ms = round((time.thread_time() - cpu + session.worker_cpu) * 1000, 3)
+        _session.reset(token)
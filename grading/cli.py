@@ -0,0 +1,53 @@
+"""
+Grader Command Line
+Shared `python tests.py` entry point: grades the current directory (or a given
+submission root) and replays the cached result when nothing has changed.
+
+With --json, prints one JSON object per check followed by a summary line
+instead of the human-readable report.
+"""
+
+import argparse
+import json
+import sys
+from pathlib import Path
+
+from grading.batch import grade
+from grading.cache import DEFAULT_CACHE_DIR, ResultCache
+
+
+def print_json(challenge, result):
+    """Emit a graded result as JSON lines: one per check, then a summary."""
+    for record in result["checks"]:
+        print(json.dumps({"type": "check", "challenge": challenge, **record}))
+    print(json.dumps({
+        "type": "summary",
+        "challenge": challenge,
+        "score": result["score"],
+        "max_score": result["max_score"],
+        "exit_code": result["exit_code"],
+        "timeouts": result["timeouts"],
+        "wall_ms": result["wall_ms"],
+        "cpu_ms": result["cpu_ms"],
+        "cached": result["cached"],
+    }))
+
+
+def run(module, argv=None):
+    """Grade a submission with a grader module and return its exit code."""
+    parser = argparse.ArgumentParser(description=(module.__doc__ or "").strip().split("\n")[0])
+    parser.add_argument("root", nargs="?", default=".", help="Submission directory or archive (default: current directory)")
+    parser.add_argument("--no-cache", action="store_true", help="Regrade even if the inputs are unchanged")
+    parser.add_argument("--json", action="store_true", help="Print JSON lines instead of the text report")
+    parser.add_argument("--participant", help="Grade against this participant's assigned variant (see grading.variants)")
+    args = parser.parse_args(argv)
+
+    cache = None if args.no_cache else ResultCache(DEFAULT_CACHE_DIR)
+    result = grade(module, args.root, cache, args.participant)
+
+    if args.json:
+        grader = Path(module.__file__).resolve().parent
+        print_json(f"{grader.parent.name}/{grader.name}", result)
+    else:
+        sys.stdout.write(result["output"])
+    return result["exit_code"]
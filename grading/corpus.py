@@ -0,0 +1,576 @@
+"""
+Synthetic Submission Corpus
+Generates realistic submissions for every grader, for benchmarks and load tests.
+
+Git histories are written with a single `git fast-import` per repository, so
+even 10,000-commit submissions take about a second to build and need no
+network access.
+"""
+
+import json
+import random
+import shutil
+import subprocess
+from pathlib import Path
+
+from grading import mcpstub, settings
+from grading.variants import ASSIGNMENTS
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+
+DEFAULT_COMMITS = (1, 100, 1000, 10000)
+# Subdirectory of a corpus holding the variants its submissions were assigned
+VARIANTS = "variants"
+DEFAULT_REPORT_BYTES = (1_000, 100_000, 1_000_000, 10_000_000)
+
+FILLER_WORDS = (
+    "context tokens session compact summary conversation memory space usage "
+    "the a of to and in is for with on that this report value output input "
+    "floating point precision rounding decimal binary cart discount total"
+).split()
+
+
+def write(path, text):
+    """Write text to path, creating parent directories."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(text)
+
+
+def filler(rng, size):
+    """Roughly size bytes of prose-like padding."""
+    lines = []
+    written = 0
+    while written < size:
+        line = " ".join(rng.choice(FILLER_WORDS) for _ in range(14)).capitalize() + "."
+        lines.append(line)
+        written += len(line) + 1
+    return "\n".join(lines) + "\n"
+
+
+def variant(rng, root, challenge):
+    """(id, directory) of a new variant of challenge's trees, assigned to root's participant.
+
+    The participant is the submission's directory name and the variant is
+    kept in the corpus's own variants directory (see generate()).
+    """
+    seed = rng.randrange(1 << 32)
+    variants = root.parent.parent / VARIANTS / challenge
+    directory = variants / str(seed)
+    shutil.rmtree(directory, ignore_errors=True)
+    path = variants / ASSIGNMENTS
+    assignments = json.loads(path.read_text()) if path.exists() else {}
+    assignments[root.name] = str(seed)
+    write(path, json.dumps(assignments, indent=2) + "\n")
+    return seed, directory
+
+
+def make_repo(path, history, head="main"):
+    """Create a git repository at path from a list of (branch, message, {file: content}).
+
+    Branches other than main start from the current tip of main. HEAD is left
+    on the given branch; the work tree is not checked out.
+    """
+    path.mkdir(parents=True, exist_ok=True)
+    subprocess.run(["git", "init", "-q", "-b", "main", str(path)], check=True)
+
+    stream = []
+    started = set()
+    for number, (branch, message, files) in enumerate(history):
+        timestamp = 1_700_000_000 + number * 60
+        msg = message.encode()
+        stream.append(f"commit refs/heads/{branch}\n".encode())
+        stream.append(f"author Dev <dev@example.com> {timestamp} +0000\n".encode())
+        stream.append(f"committer Dev <dev@example.com> {timestamp} +0000\n".encode())
+        stream.append(f"data {len(msg)}\n".encode() + msg + b"\n")
+        if branch != "main" and branch not in started:
+            stream.append(b"from refs/heads/main\n")
+        started.add(branch)
+        for name, content in files.items():
+            data = content.encode()
+            stream.append(f"M 100644 inline {name}\ndata {len(data)}\n".encode() + data + b"\n")
+        stream.append(b"\n")
+
+    subprocess.run(["git", "fast-import", "--quiet"], input=b"".join(stream),
+                   cwd=path, check=True)
+    (path / ".git" / "HEAD").write_text(f"ref: refs/heads/{head}\n")
+
+
+def churn(rng, commits):
+    """History of small commits on main used to pad repositories to a given length."""
+    return [
+        ("main", f"chore: update notes ({i})", {f"notes/{i % 50}.md": filler(rng, 80)})
+        for i in range(commits)
+    ]
+
+
+def file_explorer(rng, root, commits, report_bytes):
+    variant = rng.choice(["valid", "partial", "invalid_json"])
+    if variant == "invalid_json":
+        write(root / "results.json", '{"typescript_files": [')
+        return
+    results = {
+        "typescript_files": [
+            "src/index.ts",
+            "src/utils/helpers.ts",
+            "src/utils/math.ts",
+            "src/components/Button.ts",
+            "src/components/Modal.ts",
+        ],
+        "calculateTotal_location": "src/utils/math.ts:39",
+        "database_config": {"host": "localhost", "port": 5432, "database": "challenge_db", "ssl": False},
+        "helpers_line_count": 167,
+    }
+    if variant == "partial":
+        results["typescript_files"] = results["typescript_files"][:rng.randint(1, 4)]
+        results["helpers_line_count"] += rng.randint(-8, 8)
+    write(root / "results.json", json.dumps(results, indent=2))
+
+
+def quick_commit(rng, root, commits, report_bytes):
+    message = rng.choice([
+        "feat(auth): add token refresh on expiry\n\nCo-Authored-By: Claude <noreply@anthropic.com>",
+        "fix: correct rounding in cart totals",
+        "Update stuff",
+    ])
+    history = churn(rng, commits - 1) + [("main", message, {"src/app.ts": filler(rng, 200)})]
+    make_repo(root / "starter", history)
+
+
+def token_check(rng, root, commits, report_bytes):
+    report = (
+        "# Usage Report\n\n"
+        f"- Input tokens: {rng.randint(1000, 90000)}\n"
+        f"- Output tokens: {rng.randint(100, 20000)}\n"
+        f"- Total tokens: {rng.randint(2000, 110000)}\n"
+        f"- Context used: {rng.randint(5, 95)}%\n\n"
+        f"Should compact: {rng.choice(['Yes', 'No'])}\n"
+        "Reason: context is filling up with old exploration output\n\n"
+        "## When to Compact\n"
+    )
+    write(root / "usage_report.md", report + filler(rng, report_bytes))
+
+
+def simple_edit(rng, root, commits, report_bytes):
+    content = (REPO_ROOT / "easy/04-simple-edit/starter/app.ts").read_text()
+    if rng.random() < 0.6:
+        content = (content.replace("usrName", "userName")
+                          .replace("function getData(): any", "function getData(): Promise<Data>")
+                          .replace("function processItem(item)", "function processItem(item: Item)")
+                          .replace("import { helper }", "import { helper, utils }"))
+    write(root / "starter/app.ts", content)
+
+
+def search_master(rng, root, commits, report_bytes):
+    results = {
+        "todo_files": rng.sample(
+            ["src/api.ts", "src/utils/helpers.ts", "src/components/Form.tsx", "src/index.ts"],
+            rng.randint(1, 4)),
+        "async_functions": [
+            {"file": "src/api.ts", "line": 10 + i, "content": f"async function task{i}()"}
+            for i in range(rng.randint(0, 6))
+        ],
+        "util_imports": [
+            {"file": f"src/file{i}.ts", "line": 1, "content": "import { helper } from '@/utils'"}
+            for i in range(rng.randint(0, 4))
+        ],
+        "console_log_count": rng.randint(8, 14),
+    }
+    write(root / "search_results.json", json.dumps(results, indent=2))
+
+
+def pr_creator(rng, root, commits, report_bytes):
+    validation = (
+        "export function validateEmail(email: string): boolean {\n"
+        "  if (!email) return false;\n"
+        "  return /^[^@\\s]+@[^@\\s]+\\.[^@\\s]+$/.test(email);\n"
+        "}\n"
+    )
+    history = churn(rng, max(commits - 1, 1)) + [
+        ("feat/validate-email", "feat(utils): add validateEmail helper",
+         {"src/utils/validation.ts": validation}),
+    ]
+    make_repo(root / "starter", history, head="feat/validate-email")
+    write(root / "starter/src/utils/validation.ts", validation)
+    if rng.random() < 0.5:
+        with open(root / "starter/.git/config", "a") as f:
+            f.write('[branch "feat/validate-email"]\n\tremote = origin\n\tmerge = refs/heads/feat/validate-email\n')
+    if rng.random() < 0.7:
+        write(root / "starter/PR_DESCRIPTION.md",
+              "## Summary\nAdds validateEmail.\n\n## Test Plan\n- [x] unit tests\n")
+
+
+def full_feature_flow(rng, root, commits, report_bytes):
+    test_file = (
+        "describe('RateLimiter', () => {\n"
+        + "".join(f"  it('{name}', () => {{}});\n" for name in
+                  ["checks the limit", "resets", "configures options", "slides the window", "tracks remaining"])
+        + "});\n"
+    )
+    impl = (
+        "/** Sliding window rate limiter. */\n"
+        "export class RateLimiter {\n"
+        "  private hits = new Map<string, number[]>();\n"
+        "  check(key: string): RateLimitResult { const now = Date.now(); return { allowed: true, remaining: 1 }; }\n"
+        "  reset(key: string) { this.hits.delete(key); }\n"
+        "  configure(options: RateLimitOptions) {}\n"
+        "}\n"
+    )
+    files = {"src/rateLimiter/rateLimiter.test.ts": test_file, "src/rateLimiter/index.ts": impl,
+             "src/rateLimiter/types.ts": "export interface RateLimitResult {}\nexport interface RateLimitOptions {}\n"}
+    feature = [
+        ("feat/rate-limiter", "test: add rate limiter plan and tests",
+         {"src/rateLimiter/rateLimiter.test.ts": test_file}),
+        ("feat/rate-limiter", "feat: implement rate limiter",
+         {k: v for k, v in files.items() if k != "src/rateLimiter/rateLimiter.test.ts"}),
+    ]
+    if rng.random() < 0.3:
+        feature.reverse()
+    make_repo(root, churn(rng, max(commits - 2, 1)) + feature, head="feat/rate-limiter")
+    for name, content in files.items():
+        write(root / name, content)
+    if rng.random() < 0.5:
+        write(root / "PLAN.md", "# Plan\n- [ ] tests\n- [ ] implementation\n")
+    write(root / "PR_DESCRIPTION.md", "## Summary\nRate limiter.\n\n## Test Plan\nnpm test\n")
+
+
+def autonomous_debug(rng, root, commits, report_bytes):
+    starter = REPO_ROOT / "hard/03-autonomous-debug/starter/src/cart"
+    discount = (starter / "discount.ts").read_text()
+    tests = (starter / "cart.test.ts").read_text()
+    if rng.random() < 0.6:
+        discount = discount.replace("return total - discountAmount;",
+                                    "return Math.round((total - discountAmount) * 100) / 100;")
+        tests += "\nit('keeps precision for SAVE20 on 100', () => { expect(80).toBeCloseTo(80); });\n"
+    write(root / "starter/src/cart/discount.ts", discount)
+    write(root / "starter/src/cart/cart.test.ts", tests)
+    report = (
+        "# Debug Report\n\n## Bug Summary\nTotals are off by a cent.\n\n"
+        "## Root Cause\nJavaScript uses IEEE 754 binary floating point, so 0.1 + 0.2 "
+        "has no exact decimal representation.\n\n"
+        "## Files Affected\n- discount.ts\n\n## The Fix\nRound to two decimals.\n\n"
+        "## Test Coverage\nAdded a precision test.\n\n## Prevention\nUse integer cents.\n\n"
+    )
+    write(root / "debug_report.md", report + filler(rng, report_bytes))
+
+
+def parallel_search(rng, root, commits, report_bytes):
+    snippets = {
+        "security_issues": ("el.innerHTML = html;", "const result = eval(expression);",
+                            'const API_KEY = "sk_live_0123456789abcdefXYZ";'),
+        "performance_issues": ("console.log('render', props);",),
+        "quality_issues": ("// TODO: handle errors", "// FIXME: race on unmount",
+                           "const payload = response as any;"),
+    }
+    _, tree = variant(rng, root, "medium/03-parallel-search")
+    report = {category: [] for category in snippets}
+    for i in range(rng.randint(5, 40)):
+        path = f"src/{rng.choice(['components', 'hooks', 'utils'])}/module{i}.ts"
+        lines = []
+        for _ in range(rng.randint(20, 200)):
+            if rng.random() < 0.05:
+                category = rng.choice(list(snippets))
+                lines.append(rng.choice(snippets[category]))
+                report[category].append({"file": path, "line": len(lines), "issue": lines[-1]})
+            else:
+                lines.append(f"export const value{len(lines)} = compute(items, {rng.randint(0, 99)});")
+        write(tree / "starter" / path, "\n".join(lines) + "\n")
+        write(root / "starter" / path, "\n".join(lines) + "\n")
+
+    if rng.random() < 0.4:
+        for category in report:
+            report[category] = report[category][:len(report[category]) // 2]
+    for issue in report["security_issues"]:
+        issue["severity"] = "high"
+    total = sum(len(issues) for issues in report.values())
+    high = len(report["security_issues"])
+    report["summary"] = {"total_issues": total, "high_severity": high,
+                         "medium_severity": total - high, "low_severity": 0}
+    write(root / "parallel_search_report.json", json.dumps(report, indent=2))
+
+    parallel = rng.random() < 0.7
+    transcript = [json.dumps({"type": "user", "message": {"role": "user", "content": filler(rng, report_bytes)}})]
+    for n, category in enumerate(snippets):
+        transcript.append(json.dumps({"type": "assistant", "message": {
+            "id": "msg_launch" if parallel else f"msg_launch{n}", "role": "assistant",
+            "content": [{"type": "tool_use", "id": f"toolu_{n}", "name": "Task", "input": {
+                "description": f"Scan for {category}", "prompt": "Search the starter",
+                "subagent_type": "Explore"}}]}}))
+    write(root / "transcript.jsonl", "\n".join(transcript) + "\n")
+
+
+REFACTOR_STARTER = {
+    "src/api/users.ts": (
+        "export interface UserData {\n  id: string;\n  name: string;\n  email: string;\n}\n\n"
+        "/** Loads a user's profile from the API. */\n"
+        "export async function getUserData(userId: string): Promise<UserData> {\n"
+        "  const response = await fetch(`/api/users/${userId}`);\n"
+        "  if (!response.ok) throw new Error(`getUserData failed for ${userId}`);\n"
+        "  return response.json();\n}\n\n"
+        "export type UserDataLoader = typeof getUserData;\n"
+    ),
+    "src/components/Profile.tsx": (
+        "import { getUserData } from '../api/users';\n\n"
+        "export async function Profile({ id }: { id: string }) {\n"
+        "  const user = await getUserData(id);\n"
+        "  const manager = await getUserData(user.managerId);\n"
+        "  const reports = await Promise.all(user.reports.map((r) => getUserData(r)));\n"
+        "  return { user, manager, reports };\n}\n"
+    ),
+    "src/components/Header.tsx": (
+        "import { getUserData, type UserData } from '../api/users';\n\n"
+        "export async function Header(id: string): Promise<UserData> {\n"
+        "  // getUserData is cheap enough to call on every render\n"
+        "  const user = await getUserData(id);\n"
+        "  return user.name ? user : getUserData('guest');\n}\n"
+    ),
+    "src/hooks/useUser.ts": (
+        "import { getUserData } from '../api/users';\n"
+        "import type { UserDataLoader } from '../api/users';\n\n"
+        "const load: UserDataLoader = getUserData;\n\n"
+        "export function useUser(id: string) {\n"
+        "  return { user: getUserData(id), refresh: () => getUserData(id), again: () => getUserData(id) };\n}\n"
+    ),
+    "src/services/session.ts": (
+        "export async function restoreSession(token: string) {\n"
+        "  const { getUserData } = await import('../api/users');\n"
+        "  const user = await getUserData(token);\n"
+        "  return user ?? getUserData('anonymous');\n}\n"
+    ),
+    "src/api/users.test.ts": (
+        "import { getUserData } from './users';\n\n"
+        "describe('getUserData', () => {\n"
+        "  it('loads a user', async () => { expect(await getUserData('1')).toBeDefined(); });\n"
+        "  it('rejects unknown ids', async () => { await expect(getUserData('x')).rejects.toThrow(); });\n"
+        "});\n"
+    ),
+}
+
+
+def refactor_safely(rng, root, commits, report_bytes):
+    starter = dict(REFACTOR_STARTER)
+    # Tree size follows the history length, so every size gets a large starter
+    for i in range(commits):
+        name = rng.choice(["getUserDataCache", "userData", "getUserDetails", "fetchUser"])
+        starter[f"src/modules/m{i // 100}/module{i}.ts"] = (
+            f"export const {name}{i} = (items: number[]) => items.map((x) => x * {rng.randint(1, 9)});\n")
+
+    def renamed(paths, strings=True):
+        files = {}
+        for path in paths:
+            text = starter[path].replace("getUserData", "fetchUserProfile")
+            if not strings:
+                text = text.replace("Error(`fetchUserProfile", "Error(`getUserData")
+                text = text.replace("describe('fetchUserProfile'", "describe('getUserData'")
+            files[path] = text
+        return files
+
+    paths = sorted(REFACTOR_STARTER)
+    variant = rng.choice(["atomic", "atomic", "atomic", "split", "missed", "code-only", "uncommitted"])
+    if variant == "split":
+        steps = [renamed(paths[:3]), renamed(paths[3:])]
+    elif variant == "missed":
+        steps = [renamed([p for p in paths if p != "src/services/session.ts"])]
+    elif variant == "code-only":
+        steps = [renamed(paths, strings=False)]
+    else:
+        steps = [renamed(paths)]
+
+    history = churn(rng, max(commits - 1, 1)) + [("main", "chore: import starter", starter)]
+    if variant != "uncommitted":
+        history += [("main", f"refactor: rename getUserData to fetchUserProfile ({n + 1}/{len(steps)})", step)
+                    for n, step in enumerate(steps)]
+    make_repo(root / "starter", history)
+    for step in [{path: text for path, text in starter.items()}, *steps]:
+        for path, text in step.items():
+            write(root / "starter" / path, text)
+
+    changed = {path: text.count("fetchUserProfile") for step in steps for path, text in step.items()}
+    rows = "".join(f"| {path} | {count} |\n" for path, count in sorted(changed.items()))
+    report = f"# Refactor Report\n\n## Files Changed\n\n| File | Replacements |\n|---|---|\n{rows}\n"
+    if rng.random() < 0.8:
+        report += "## Verification\n\n`grep getUserData` returns 0 results.\n\n"
+    write(root / "refactor_report.md", report + filler(rng, report_bytes))
+
+
+def context_handoff(rng, root, commits, report_bytes):
+    changes = {
+        "src/auth/login.ts": "export async function login(email: string, password: string) {\n"
+                             "  const user = await findUser(email);\n"
+                             "  if (!(await bcrypt.compare(password, user.hash))) throw new Error('invalid');\n"
+                             "  return jwt.sign({ sub: user.id }, SECRET, { expiresIn: '1h' });\n}\n",
+        "src/auth/middleware.ts": "export function requireAuth(req, res, next) {\n"
+                                  "  req.user = jwt.verify(req.headers.authorization?.slice(7), SECRET);\n"
+                                  "  next();\n}\n",
+    }
+    if rng.random() < 0.3:
+        changes["src/auth/tokens.ts"] = "export const SECRET = process.env.JWT_SECRET!;\n"
+    make_repo(root, churn(rng, max(commits - 1, 1))
+              + [("feat/auth", f"feat(auth): {path}", {path: text}) for path, text in changes.items()],
+              head="feat/auth")
+    for path, text in changes.items():
+        write(root / path, text)
+
+    listed = sorted(changes)
+    if rng.random() < 0.3:
+        listed = listed[:1]
+    sections = {
+        "Date": "2026-10-17",
+        "Session Summary": "Added user authentication with JWT sessions. Login and the auth "
+                           "middleware are done; password reset is still open.",
+        "Files Modified": "".join(f"- `{path}` - JWT and bcrypt changes\n" for path in listed),
+        "Decisions Made": "1. JWT over OAuth because the API is stateless\n"
+                          "2. bcrypt for password hashing because it is salted and slow by design\n",
+        "Outstanding Tasks": "- [ ] Implement password reset\n- [ ] Add refresh tokens\n",
+        "Key Context": "Tokens expire after one hour.",
+        "Commands Used": "- `/config` - checked settings\n- `/usage` - checked tokens\n- `/compact` - compacted\n",
+        "Notes for Next Session": "Start with the password reset email flow.",
+    }
+    for title in rng.sample(sorted(sections), rng.choice([0, 0, 0, 1, 3])):
+        del sections[title]
+    handoff = "# Session Handoff\n\n" + "".join(f"## {title}\n{body}\n\n" for title, body in sections.items())
+    write(root / "handoff.md", handoff + filler(rng, report_bytes))
+
+    transcript = [json.dumps({"type": "user", "message": {"role": "user", "content": filler(rng, report_bytes)}})]
+    if rng.random() < 0.7:
+        transcript.append(json.dumps({"type": "user", "message": {
+            "role": "user", "content": "<command-name>/compact</command-name>"}}))
+    write(root / "transcript.jsonl", "\n".join(transcript) + "\n")
+
+
+CAUSE_TEXT = {
+    "missing_token": "GITHUB_PERSONAL_ACCESS_TOKEN is empty", "disabled": "listed in disabledMcpjsonServers",
+    "not_approved": "missing from enabledMcpjsonServers", "invalid_json": ".mcp.json has a trailing comma",
+    "wrong_location": "commands are in .claude/command/", "wrong_extension": "command files end in .txt",
+    "wrong_event": "format hook runs on PreToolUse", "wrong_matcher": "format hook matcher skips Edit",
+    "missing_script": "scripts/format.sh does not exist", "hooks_disabled": "disableAllHooks is set",
+}
+
+
+def config_detective(rng, root, commits, report_bytes):
+    seed, tree = variant(rng, root, "medium/04-config-detective")
+    settings.make_fixture(tree / "fixture", seed)
+    settings.make_fixture(root / "fixture", seed)
+    config = settings.resolve(tree / "fixture")
+    effective = config["settings"]
+    model = effective["model"] if rng.random() < 0.8 else "default"
+    servers = "".join(f"| {name} | {server['status'] if rng.random() < 0.9 else 'running'} | - |\n"
+                      for name, server in sorted(config["mcp_servers"].items()))
+    hooks = "".join(f"- {event}: {', '.join(h['command'] for h in config['hooks'].get(event, [])) or 'none'}\n"
+                    for event in settings.HOOK_EVENTS)
+    local = "yes" if config["claude_md"]["project"] or config["claude_md"]["local"] else "no"
+    diagnoses = ""
+    for problem, title in (("github_mcp", "GitHub MCP Issue"), ("slash_commands", "Custom Slash Commands"),
+                           ("auto_format", "Auto-formatting")):
+        cause = CAUSE_TEXT[config["problems"][problem]] if rng.random() < 0.8 else "unclear"
+        diagnoses += f"### {title}\n- Likely cause: {cause}\n- Solution: fix it\n\n"
+    report = (f"# Configuration Report\n\n## Global Settings\n"
+              f"- Auto-compact: {'enabled' if effective['autoCompactEnabled'] else 'disabled'}\n"
+              f"- Default model: {model}\n- Theme: {effective['theme']}\n\n"
+              f"## MCP Servers\n| Server | Status | Tools Available |\n|---|---|---|\n{servers}\n"
+              f"## Project Settings\n- Has local CLAUDE.md: {local}\n\n## Hooks Configured\n{hooks}\n"
+              f"## Diagnosis\n{diagnoses}")
+    write(root / "config_report.md", report + filler(rng, report_bytes))
+
+
+def mcp_orchestra(rng, root, commits, report_bytes):
+    """A workflow run against the stand-ins in process, logged with simulated timings."""
+    root.mkdir(parents=True, exist_ok=True)
+    servers = {name: mcpstub.standin(name, root) for name in mcpstub.SERVERS}
+    log = mcpstub.CallLog(root / mcpstub.LOG)
+    for name in mcpstub.SERVERS:
+        log.write({"server": name, "method": "initialize", "start": 0.0, "end": 0.0})
+    clock = [0.0]
+
+    def batch(*calls):
+        """Issue calls together (or one after another) and return their result texts."""
+        parallel = rng.random() < 0.6
+        start = clock[0]
+        results = []
+        for server, tool, arguments in calls:
+            end = start + mcpstub.LATENCY[server] + 0.01
+            try:
+                text, ok = servers[server].call(tool, arguments), True
+            except mcpstub.ToolError as e:
+                text, ok = str(e), False
+            log.write({"server": server, "method": "tools/call", "tool": tool, "start": start, "end": end,
+                       "ok": ok, "arguments": arguments, "result": text})
+            results.append(text if ok else None)
+            clock[0] = max(clock[0], end)
+            start = start if parallel else end
+        clock[0] += rng.uniform(0.5, 3.0)  # the model reading the results
+        return results
+
+    thoughts = rng.randint(1, 5)
+    for number in range(1, thoughts + 1):
+        batch((mcpstub.THINKING, "sequentialthinking", {"thought": f"Step {number} of the plan",
+              "thoughtNumber": number, "totalThoughts": thoughts, "nextThoughtNeeded": number < thoughts}))
+    repo = {"owner": "acme", "repo": "docs-bot"}
+    _, commits_page, _ = batch(("github", "search_repositories", {"query": "docs-bot"}),
+                               ("github", "list_commits", repo),
+                               ("github", "get_file_contents", dict(repo, path="README.md")))
+    if commits_page is None and rng.random() < 0.8:
+        commits_page, = batch(("github", "list_commits", repo))
+    authors = sorted({c["commit"]["author"]["name"] for c in json.loads(commits_page or "[]")})
+    batch(("memory", "create_entities", {"entities": [
+        {"name": "acme/docs-bot", "entityType": "repository", "observations": []},
+        *({"name": name, "entityType": "contributor", "observations": []} for name in authors)]}))
+    if rng.random() < 0.8:
+        batch(("memory", "create_relations", {"relations": [
+            {"from": name, "to": "acme/docs-bot", "relationType": "contributes_to"} for name in authors]}))
+    graph, _ = batch(("memory", "read_graph", {}), ("filesystem", "create_directory", {"path": "docs"}))
+    names = [e["name"] for e in json.loads(graph)["entities"] if e["entityType"] == "contributor"]
+    batch(("filesystem", "write_file", {"path": "docs/repo-analysis.md",
+                                        "content": "# acme/docs-bot\n\nGenerates API documentation.\n"}),
+          ("filesystem", "write_file", {"path": "docs/contributors.md",
+                                        "content": "".join(f"- {name}\n" for name in names)}))
+
+    rows = "".join(f"| {name} | {', '.join(mcpstub.TOOLS[name][:2])} | 3 |\n" for name in mcpstub.SERVERS)
+    report = (f"# MCP Orchestration Report\n\n## Servers Used\n| Server | Tools Used | Operations |\n"
+              f"|---|---|---|\n{rows}\n## Workflow Execution\n1. Planned with sequential thinking\n"
+              f"2. Fetched the repository\n3. Stored contributors in memory\n4. Wrote the docs\n\n"
+              f"## Data Flow\nGitHub -> Memory -> Filesystem\n\n")
+    if rng.random() < 0.7:
+        report += "## Error Handling\n- list_commits hit a rate limit; retried after a second\n\n"
+    report += "## Generated Files\n- `docs/repo-analysis.md`\n- `docs/contributors.md`\n\n"
+    write(root / "orchestration_report.md", report + filler(rng, report_bytes))
+
+
+GENERATORS = {
+    "easy/01-file-explorer": file_explorer,
+    "easy/02-quick-commit": quick_commit,
+    "easy/03-token-check": token_check,
+    "easy/04-simple-edit": simple_edit,
+    "easy/05-search-master": search_master,
+    "medium/01-pr-creator": pr_creator,
+    "hard/01-full-feature-flow": full_feature_flow,
+    "hard/03-autonomous-debug": autonomous_debug,
+    "medium/03-parallel-search": parallel_search,
+    "medium/05-refactor-safely": refactor_safely,
+    "medium/02-context-handoff": context_handoff,
+    "medium/04-config-detective": config_detective,
+    "hard/02-mcp-orchestra": mcp_orchestra,
+}
+
+
+def generate(dest, per_challenge=20, commits=DEFAULT_COMMITS,
+             report_bytes=DEFAULT_REPORT_BYTES, challenges=None, seed=0):
+    """Build a corpus under dest and return {challenge: [submission roots]}.
+
+    Submission i of each challenge uses commits[i % len(commits)] and
+    report_bytes[i % len(report_bytes)], so every size is represented. Its
+    participant is named after its directory ("0000", ...), which is who
+    challenges with per-participant variants assign them to. Those variants
+    are written under dest/variants, to be graded with GRADING_VARIANTS_DIR
+    pointing there; the repository's own variants/ is never touched.
+    """
+    rng = random.Random(seed)
+    corpus = {}
+    for challenge in challenges or GENERATORS:
+        roots = []
+        for i in range(per_challenge):
+            root = Path(dest) / challenge.replace("/", "__") / f"{i:04d}"
+            GENERATORS[challenge](rng, root, commits[i % len(commits)],
+                                  report_bytes[i % len(report_bytes)])
+            roots.append(str(root))
+        corpus[challenge] = roots
+    return corpus
@@ -0,0 +1,255 @@
+#!/usr/bin/env python3
+"""
+Grading Daemon
+Keeps every grader imported and its starter index warm in one long-running
+process, so a "check my work" request costs only the grading itself.
+
+Clients connect to a Unix socket (or, with --port, to localhost TCP) and send
+one JSON request per line:
+
+    {"challenge": "easy/01-file-explorer", "submission_root": "/home/alice/easy/01-file-explorer"}
+
+Each request is answered with one JSON line: the result record of
+grading.batch.grade() plus "challenge" and "queue_ms", or {"error": ...}.
+submission_root may also be an archive (see grading.archive).
+Add "no_cache": true to regrade even if the inputs are unchanged, and
+"participant": "alice" to grade against the variant assigned to alice (see
+grading.variants).
+
+Requests are graded on a bounded pool of threads. At most --queue more wait
+for a thread; past that, connections are answered {"error": "busy"} at once
+instead of queueing without bound. Graders are imported once at startup, so
+restart the daemon after changing them.
+
+Usage:
+    python -m grading.daemon [--socket PATH | --port N] [--workers N] [--queue N]
+    python -m grading.daemon --request easy/01-file-explorer path/to/submission [--participant NAME]
+"""
+
+import argparse
+import json
+import os
+import socket
+import socketserver
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+from grading import archive
+from grading.batch import discover_graders, grade, load_grader, prewarm
+from grading.cache import DEFAULT_CACHE_DIR, ResultCache
+
+DEFAULT_SOCKET = Path(os.environ.get("GRADING_DAEMON_SOCKET", DEFAULT_CACHE_DIR / "daemon.sock"))
+DEFAULT_WORKERS = 8
+DEFAULT_QUEUE = 64
+# A client that sends nothing for this long is disconnected and frees its thread
+CLIENT_TIMEOUT = 10
+
+
+def handle(modules, cache, request):
+    """Grade one decoded request and return the reply record."""
+    challenge = request.get("challenge")
+    root = request.get("submission_root")
+    if challenge not in modules:
+        return {"error": f"unknown challenge: {challenge!r}"}
+    if not isinstance(root, str) or not (os.path.isdir(root) or archive.is_archive(root)):
+        return {"error": f"submission_root is not a directory or archive: {root!r}"}
+    participant = request.get("participant")
+    if participant is not None and not isinstance(participant, str):
+        return {"error": f"participant is not a string: {participant!r}"}
+    result = grade(modules[challenge], root, None if request.get("no_cache") else cache, participant)
+    return dict(challenge=challenge, **result)
+
+
+class Handler(socketserver.StreamRequestHandler):
+    """Answers every request line of one connection, in order."""
+
+    timeout = CLIENT_TIMEOUT
+
+    def handle(self):
+        try:
+            for line in self.rfile:
+                self.answer(line)
+        except TimeoutError:
+            pass  # idle client
+
+    def answer(self, line):
+        if not line.strip():
+            return
+        started = time.perf_counter()
+        # Only a connection's first request waited for a thread
+        queued = started - self.server.accepted.pop(self.request, started)
+        try:
+            request = json.loads(line)
+            if not isinstance(request, dict):
+                raise ValueError("request must be a JSON object")
+        except ValueError as e:
+            reply = {"error": f"bad request: {e}"}
+        else:
+            try:
+                reply = handle(self.server.modules, self.server.cache, request)
+            except Exception as e:
+                reply = {"error": f"grading failed: {e!r}"}
+            reply["queue_ms"] = round(queued * 1000, 3)
+        self.wfile.write(json.dumps(reply).encode() + b"\n")
+        self.wfile.flush()
+
+
+class PooledMixIn:
+    """Serve connections on a bounded thread pool with a bounded backlog.
+
+    socketserver's ThreadingMixIn starts a thread per connection; under a
+    burst of clicks that is an unbounded number of graders competing for the
+    GIL and the disk, and every request gets slower.
+    """
+
+    def setup_pool(self, modules, cache, workers, queue):
+        self.modules = modules
+        self.cache = cache
+        self.pool = ThreadPoolExecutor(workers, thread_name_prefix="grading-daemon")
+        self.slots = threading.BoundedSemaphore(workers + queue)
+        self.accepted = {}
+
+    def process_request(self, request, client_address):
+        if not self.slots.acquire(blocking=False):
+            try:
+                request.sendall(json.dumps({"error": "busy"}).encode() + b"\n")
+            except OSError:
+                pass
+            self.shutdown_request(request)
+            return
+        self.accepted[request] = time.perf_counter()
+        self.pool.submit(self.process_request_thread, request, client_address)
+
+    def process_request_thread(self, request, client_address):
+        try:
+            self.finish_request(request, client_address)
+        except Exception:
+            self.handle_error(request, client_address)
+        finally:
+            self.shutdown_request(request)
+            self.accepted.pop(request, None)
+            self.slots.release()
+
+    def server_close(self):
+        super().server_close()
+        self.pool.shutdown(wait=True)
+
+
+class UnixServer(PooledMixIn, socketserver.UnixStreamServer):
+    bound = False
+
+    def server_bind(self):
+        # A stale socket from a daemon that did not exit cleanly
+        if os.path.exists(self.server_address):
+            probe = socket.socket(socket.AF_UNIX)
+            try:
+                probe.connect(self.server_address)
+            except OSError:
+                os.unlink(self.server_address)
+            else:
+                raise SystemExit(f"a daemon is already listening on {self.server_address}")
+            finally:
+                probe.close()
+        super().server_bind()
+        self.bound = True
+        os.chmod(self.server_address, 0o600)
+
+    def server_close(self):
+        super().server_close()
+        if not self.bound:
+            return  # never remove another daemon's socket
+        try:
+            os.unlink(self.server_address)
+        except OSError:
+            pass
+
+
+class TCPServer(PooledMixIn, socketserver.TCPServer):
+    allow_reuse_address = True
+
+
+def serve(address, workers=DEFAULT_WORKERS, queue=DEFAULT_QUEUE, graders=None,
+          cache_dir=DEFAULT_CACHE_DIR, ready=None):
+    """Load and warm every grader, then answer requests on address until interrupted.
+
+    address is a socket path, or a (host, port) pair for TCP. ready, if
+    given, is called with the bound server once it accepts connections.
+    """
+    graders = graders or discover_graders()
+    modules = {key: load_grader(key, path) for key, path in graders.items()}
+    prewarm(modules)
+    cache = ResultCache(cache_dir) if cache_dir else None
+
+    if isinstance(address, tuple):
+        server = TCPServer(address, Handler, bind_and_activate=False)
+    else:
+        Path(address).parent.mkdir(parents=True, exist_ok=True)
+        server = UnixServer(str(address), Handler, bind_and_activate=False)
+    server.request_queue_size = max(server.request_queue_size, queue)
+    server.setup_pool(modules, cache, workers, queue)
+    try:
+        server.server_bind()
+        server.server_activate()
+    except BaseException:
+        server.server_close()
+        raise
+    with server:
+        if ready is not None:
+            ready(server)
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+    return 0
+
+
+def request(challenge, root, address=DEFAULT_SOCKET, no_cache=False, timeout=None, participant=None):
+    """Send one grading request to a running daemon and return its reply."""
+    if isinstance(address, tuple):
+        conn = socket.create_connection(address, timeout=timeout)
+    else:
+        conn = socket.socket(socket.AF_UNIX)
+        conn.settimeout(timeout)
+        conn.connect(str(address))
+    with conn, conn.makefile("rwb") as stream:
+        payload = {"challenge": challenge, "submission_root": str(Path(root).resolve())}
+        if no_cache:
+            payload["no_cache"] = True
+        if participant is not None:
+            payload["participant"] = participant
+        stream.write(json.dumps(payload).encode() + b"\n")
+        stream.flush()
+        return json.loads(stream.readline())
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Serve grading requests from warm graders.")
+    parser.add_argument("--socket", default=str(DEFAULT_SOCKET), help="Unix socket path")
+    parser.add_argument("--port", type=int, help="Listen on localhost TCP instead of a Unix socket")
+    parser.add_argument("--workers", type=int, default=DEFAULT_WORKERS, help="Grading threads")
+    parser.add_argument("--queue", type=int, default=DEFAULT_QUEUE,
+                        help="Requests that may wait for a thread before clients are turned away")
+    parser.add_argument("--cache-dir", default=str(DEFAULT_CACHE_DIR), help="Result cache directory")
+    parser.add_argument("--no-cache", action="store_true", help="Regrade every request")
+    parser.add_argument("--request", nargs=2, metavar=("CHALLENGE", "ROOT"),
+                        help="Send one request to a running daemon and print the reply")
+    parser.add_argument("--participant", help="With --request: grade against this participant's variant")
+    args = parser.parse_args(argv)
+
+    address = ("127.0.0.1", args.port) if args.port else args.socket
+    if args.request:
+        reply = request(*args.request, address=address, no_cache=args.no_cache,
+                        participant=args.participant)
+        print(json.dumps(reply, indent=2))
+        return 0 if "error" not in reply else 1
+
+    cache_dir = None if args.no_cache else args.cache_dir
+    print(f"Grading daemon listening on {address}", file=sys.stderr)
+    return serve(address, args.workers, args.queue, cache_dir=cache_dir)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
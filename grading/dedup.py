@@ -0,0 +1,77 @@
+"""
+Submission Deduplication
+Grades each distinct submission of a cohort once.
+
+Before grading, ingest() hashes every submission's grader-relevant inputs
+(the files its grader declares in INPUTS, plus the grader's own source and
+the participant's assigned variant: the same key the result cache is
+addressed by) and groups submissions with equal
+keys into clusters. Only the first submission of each cluster is graded;
+fan_out() copies its result to the rest, marking each copy with
+duplicate_of, the participant whose grading it reuses. Graders are not
+involved, so scores are exactly what grading each copy would give.
+
+report() lists the clusters with more than one member, largest first:
+shared solutions, or starters submitted untouched.
+"""
+
+from concurrent.futures import ThreadPoolExecutor
+
+from grading import archive
+from grading.cache import cache_key
+
+# Threads hashing submissions at once; hashing is file I/O and hashlib releases the GIL
+HASH_WORKERS = 8
+
+
+def submission_key(module, root, participant=None):
+    """Content key of a submission as its grader sees it, or None if it cannot be read."""
+    try:
+        with archive.mounted(root, module.INPUTS) as mounted:
+            return cache_key(module.__file__, module.INPUTS, mounted, participant)
+    except (archive.ArchiveError, OSError):
+        return None  # graded on its own, which reports the problem
+
+
+def ingest(tasks, modules, workers=HASH_WORKERS):
+    """Group (participant, challenge, root) tasks into clusters of identical submissions.
+
+    Returns a list of clusters, each a list of tasks in discovery order;
+    clusters are ordered by their first task.
+    """
+    def key(task):
+        return submission_key(modules[task[1]], task[2], task[0])
+
+    with ThreadPoolExecutor(workers) as pool:
+        keys = list(pool.map(key, tasks))
+
+    clusters = {}
+    for task, content in zip(tasks, keys):
+        clusters.setdefault(task if content is None else (task[1], content), []).append(task)
+    return list(clusters.values())
+
+
+def fan_out(tasks, clusters, results):
+    """Result records for every task, in task order, given one result per cluster."""
+    records = {}
+    for cluster, result in zip(clusters, results):
+        first = cluster[0][0]
+        for task in cluster:
+            participant, challenge, _ = task
+            records[task] = dict(result, participant=participant, challenge=challenge,
+                                 duplicate_of=None if task is cluster[0] else first)
+    return [records[task] for task in tasks]
+
+
+def report(results):
+    """Duplicate clusters among result records: [{"challenge", "participants", "score"}], largest first."""
+    clusters = {}
+    for record in results:
+        first = record.get("duplicate_of") or record["participant"]
+        clusters.setdefault((record["challenge"], first), []).append(record)
+    return sorted(
+        ({"challenge": challenge, "participants": [r["participant"] for r in members],
+          "score": members[0]["score"]}
+         for (challenge, _), members in clusters.items() if len(members) > 1),
+        key=lambda c: (-len(c["participants"]), c["challenge"], c["participants"]),
+    )
@@ -0,0 +1,142 @@
+"""
+gh Stand-In
+Implements the `gh pr` commands the challenges use against a local stand-in
+origin (see grading.remote), recording pull requests in a JSON store inside
+it instead of talking to GitHub:
+
+    gh pr create --title "feat: add validateEmail" --body "## Summary ..." [--base main] [--head BRANCH]
+    gh pr list [--state open|closed|merged|all] [--json number,title,...]
+    gh pr view [NUMBER | BRANCH] [--json title,body,...]
+
+Like gh, create refuses a branch that has not been pushed and a branch that
+already has an open pull request.
+"""
+
+import argparse
+import json
+import os
+import sys
+import tempfile
+
+from grading.gitrepo import GitRepo
+from grading.remote import PR_STORE, local_remote
+
+
+def fail(message):
+    print(message, file=sys.stderr)
+    return 1
+
+
+def load(store):
+    try:
+        return json.loads(store.read_text())
+    except (OSError, ValueError):
+        return []
+
+
+def save(store, pulls):
+    fd, tmp = tempfile.mkstemp(dir=store.parent, suffix=".tmp")
+    with os.fdopen(fd, "w") as f:
+        json.dump(pulls, f, indent=2)
+    os.replace(tmp, store)
+
+
+def show(pull, fields):
+    """A pull request as gh shows it: the selected JSON fields, or a summary line."""
+    if fields:
+        return {field: pull.get(field) for field in fields.split(",")}
+    return f"#{pull['number']}\t{pull['title']}\t{pull['headRefName']}\t{pull['state']}"
+
+
+def create(repo, standin, store, args):
+    head = args.head or repo.current_branch()
+    if not head:
+        return fail("could not determine the current branch")
+    if GitRepo(standin).resolve_ref(f"refs/heads/{head}") is None:
+        return fail(f"branch {head} has not been pushed to origin; run git push -u origin {head}")
+
+    pulls = load(store)
+    if any(p["headRefName"] == head and p["state"] == "OPEN" for p in pulls):
+        return fail(f'a pull request for branch "{head}" already exists')
+    body = args.body
+    if args.body_file:
+        with open(args.body_file) as f:
+            body = f.read()
+    if args.title is None or body is None:
+        return fail("--title and --body (or --body-file) are required when not running interactively")
+
+    number = max((p["number"] for p in pulls), default=0) + 1
+    pulls.append({
+        "number": number,
+        "title": args.title,
+        "body": body,
+        "headRefName": head,
+        "baseRefName": args.base,
+        "state": "OPEN",
+        "isDraft": args.draft,
+        "url": f"{standin.as_uri()}/pull/{number}",
+    })
+    save(store, pulls)
+    print(pulls[-1]["url"])
+    return 0
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="gh", description="Offline stand-in for gh pr.")
+    sub = parser.add_subparsers(dest="group", required=True)
+    pr = sub.add_parser("pr").add_subparsers(dest="command", required=True)
+
+    create_parser = pr.add_parser("create")
+    create_parser.add_argument("--title", "-t")
+    create_parser.add_argument("--body", "-b")
+    create_parser.add_argument("--body-file", "-F")
+    create_parser.add_argument("--base", "-B", default="main")
+    create_parser.add_argument("--head", "-H")
+    create_parser.add_argument("--draft", "-d", action="store_true")
+
+    list_parser = pr.add_parser("list")
+    list_parser.add_argument("--state", "-s", default="open",
+                             choices=["open", "closed", "merged", "all"])
+    list_parser.add_argument("--json")
+
+    view_parser = pr.add_parser("view")
+    view_parser.add_argument("target", nargs="?")
+    view_parser.add_argument("--json")
+
+    args = parser.parse_args(argv)
+
+    repo = GitRepo.discover(".")
+    if repo is None:
+        return fail("not a git repository")
+    standin = local_remote(repo, repo.remotes().get("origin"))
+    if standin is None:
+        return fail("origin is not a local stand-in remote (see python -m grading.remote init)")
+    store = standin / PR_STORE
+
+    if args.command == "create":
+        return create(repo, standin, store, args)
+
+    pulls = load(store)
+    if args.command == "list":
+        selected = [p for p in pulls if args.state == "all" or p["state"] == args.state.upper()]
+        if args.json:
+            print(json.dumps([show(p, args.json) for p in selected], indent=2))
+        else:
+            for pull in selected:
+                print(show(pull, None))
+        return 0
+
+    target = args.target or repo.current_branch()
+    matches = [p for p in pulls if str(p["number"]) == target or p["headRefName"] == target]
+    if not matches:
+        return fail(f'no pull requests found for "{target}"')
+    pull = matches[-1]
+    if args.json:
+        print(json.dumps(show(pull, args.json), indent=2))
+    else:
+        print(f"{pull['title']} #{pull['number']}\n{pull['state']}: {pull['headRefName']} into {pull['baseRefName']}\n\n{pull['body']}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
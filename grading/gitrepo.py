@@ -0,0 +1,585 @@
+"""
+Pure-Python Git Reader
+Reads refs, commits and trees straight from a repository's .git directory so
+graders can inspect history without forking a `git` process per check.
+
+Supports loose and packed refs, symbolic refs, annotated tags, loose objects,
+pack files (v2 .idx with OFS/REF deltas), worktrees and object alternates.
+"""
+
+import heapq
+import mmap
+import struct
+import zlib
+from collections import namedtuple
+from pathlib import Path
+
+OBJECT_TYPES = {1: "commit", 2: "tree", 3: "blob", 4: "tag"}
+OFS_DELTA = 6
+REF_DELTA = 7
+
+Commit = namedtuple("Commit", "sha tree parents author committer time message")
+
+
+def subject(message):
+    """First paragraph of a commit message folded onto one line, like git's %s."""
+    paragraph = message.strip().split("\n\n", 1)[0]
+    return " ".join(line.strip() for line in paragraph.splitlines())
+
+
+class GitError(Exception):
+    """Raised when the repository is missing or an object cannot be read."""
+
+
+def find_git_dir(path="."):
+    """Walk up from path to the nearest .git directory (or gitdir: file), like git does.
+
+    Returns (git_dir, work_tree), or (None, None) outside a repository.
+    """
+    path = Path(path).resolve()
+    for candidate in [path, *path.parents]:
+        dot_git = candidate / ".git"
+        if dot_git.is_dir():
+            return dot_git, candidate
+        if dot_git.is_file():
+            text = dot_git.read_text().strip()
+            if text.startswith("gitdir:"):
+                return (candidate / text[len("gitdir:"):].strip()).resolve(), candidate
+    return None, None
+
+
+class _Pack:
+    """A single pack file with its v2 index, opened lazily and memory-mapped."""
+
+    def __init__(self, pack_path):
+        self.pack_path = pack_path
+        self.idx_path = pack_path.with_suffix(".idx")
+        self._idx = None
+        self._pack = None
+
+    def _open(self):
+        if self._idx is not None:
+            return
+        with open(self.idx_path, "rb") as f:
+            idx = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        if idx[:4] != b"\377tOc" or struct.unpack(">I", idx[4:8])[0] != 2:
+            raise GitError(f"Unsupported pack index format: {self.idx_path}")
+        self.fanout = struct.unpack(">256I", idx[8:8 + 1024])
+        self.count = self.fanout[255]
+        self.sha_start = 8 + 1024
+        self.offset_start = self.sha_start + self.count * 24  # sha table + crc table
+        self.large_start = self.offset_start + self.count * 4
+        self._idx = idx
+        with open(self.pack_path, "rb") as f:
+            self._pack = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+    def find(self, sha):
+        """Return the pack offset of a 20-byte binary sha, or None."""
+        self._open()
+        first = sha[0]
+        lo = self.fanout[first - 1] if first else 0
+        hi = self.fanout[first]
+        idx = self._idx
+        while lo < hi:
+            mid = (lo + hi) // 2
+            start = self.sha_start + mid * 20
+            candidate = idx[start:start + 20]
+            if candidate < sha:
+                lo = mid + 1
+            elif candidate > sha:
+                hi = mid
+            else:
+                pos = self.offset_start + mid * 4
+                offset = struct.unpack(">I", idx[pos:pos + 4])[0]
+                if offset & 0x80000000:
+                    pos = self.large_start + (offset & 0x7FFFFFFF) * 8
+                    offset = struct.unpack(">Q", idx[pos:pos + 8])[0]
+                return offset
+        return None
+
+    def _inflate(self, offset, size):
+        decompressor = zlib.decompressobj()
+        chunks = []
+        pos = offset
+        while not decompressor.eof:
+            chunk = self._pack[pos:pos + 65536]
+            if not chunk:
+                raise GitError(f"Truncated pack: {self.pack_path}")
+            chunks.append(decompressor.decompress(chunk))
+            pos += len(chunk)
+        data = b"".join(chunks)
+        if len(data) != size:
+            raise GitError(f"Corrupt object in {self.pack_path} at {offset}")
+        return data
+
+    def read_at(self, offset, repo):
+        """Read (type, data) for the object at offset, resolving delta chains."""
+        pack = self._pack
+        byte = pack[offset]
+        obj_type = (byte >> 4) & 7
+        size = byte & 0x0F
+        shift = 4
+        pos = offset + 1
+        while byte & 0x80:
+            byte = pack[pos]
+            size |= (byte & 0x7F) << shift
+            shift += 7
+            pos += 1
+
+        if obj_type == OFS_DELTA:
+            byte = pack[pos]
+            pos += 1
+            distance = byte & 0x7F
+            while byte & 0x80:
+                byte = pack[pos]
+                pos += 1
+                distance = ((distance + 1) << 7) | (byte & 0x7F)
+            base_type, base = self.read_at(offset - distance, repo)
+            return base_type, apply_delta(base, self._inflate(pos, size))
+
+        if obj_type == REF_DELTA:
+            base_sha = pack[pos:pos + 20].hex()
+            base_type, base = repo.read_object(base_sha)
+            return base_type, apply_delta(base, self._inflate(pos + 20, size))
+
+        return OBJECT_TYPES[obj_type], self._inflate(pos, size)
+
+
+def _read_varint(data, pos):
+    value = shift = 0
+    while True:
+        byte = data[pos]
+        pos += 1
+        value |= (byte & 0x7F) << shift
+        shift += 7
+        if not byte & 0x80:
+            return value, pos
+
+
+def apply_delta(base, delta):
+    """Apply a git pack delta to its base object."""
+    source_size, pos = _read_varint(delta, 0)
+    target_size, pos = _read_varint(delta, pos)
+    if source_size != len(base):
+        raise GitError("Delta base size mismatch")
+
+    out = bytearray()
+    while pos < len(delta):
+        op = delta[pos]
+        pos += 1
+        if op & 0x80:
+            offset = size = 0
+            for i in range(4):
+                if op & (1 << i):
+                    offset |= delta[pos] << (8 * i)
+                    pos += 1
+            for i in range(3):
+                if op & (1 << (4 + i)):
+                    size |= delta[pos] << (8 * i)
+                    pos += 1
+            out += base[offset:offset + (size or 0x10000)]
+        elif op:
+            out += delta[pos:pos + op]
+            pos += op
+        else:
+            raise GitError("Invalid delta opcode")
+
+    if len(out) != target_size:
+        raise GitError("Delta result size mismatch")
+    return bytes(out)
+
+
+def _map_refspec(refspec, ref):
+    """Destination of ref under a fetch refspec ("+refs/heads/*:refs/remotes/origin/*"), or None."""
+    src, sep, dst = refspec.lstrip("+").partition(":")
+    if not sep or not dst or src.startswith("^"):
+        return None
+    if "*" not in src:
+        return dst if ref == src else None
+    head, _, tail = src.partition("*")
+    if len(ref) < len(head) + len(tail) or not (ref.startswith(head) and ref.endswith(tail)):
+        return None
+    return dst.replace("*", ref[len(head):len(ref) - len(tail)], 1)
+
+
+class GitRepo:
+    """Read-only view of a git repository."""
+
+    def __init__(self, git_dir, work_tree=None):
+        self.git_dir = Path(git_dir)
+        self.work_tree = Path(work_tree) if work_tree else self.git_dir.parent
+        commondir = self.git_dir / "commondir"
+        if commondir.exists():
+            self.common_dir = (self.git_dir / commondir.read_text().strip()).resolve()
+        else:
+            self.common_dir = self.git_dir
+        self.object_dirs = self._object_dirs(self.common_dir / "objects")
+        self._packs = None
+        self._packed_refs = None
+        self._config = None
+        self._objects = {}
+        self._trees = {}
+        self._commits = {}
+
+    @classmethod
+    def discover(cls, path="."):
+        """Open the repository containing path, or return None if there is none."""
+        git_dir, work_tree = find_git_dir(path)
+        return cls(git_dir, work_tree) if git_dir else None
+
+    def relative(self, path):
+        """Convert a filesystem path inside the work tree to a repository path."""
+        return Path(path).resolve().relative_to(self.work_tree.resolve()).as_posix()
+
+    @staticmethod
+    def _object_dirs(objects):
+        dirs = [objects]
+        alternates = objects / "info" / "alternates"
+        if alternates.exists():
+            for line in alternates.read_text().splitlines():
+                line = line.strip()
+                if line and not line.startswith("#"):
+                    dirs.append((objects / line).resolve())
+        return dirs
+
+    # ------------------------------------------------------------------ refs
+
+    def _read_packed_refs(self):
+        if self._packed_refs is None:
+            refs = {}
+            path = self.common_dir / "packed-refs"
+            if path.exists():
+                last = None
+                for line in path.read_text().splitlines():
+                    if not line or line.startswith("#"):
+                        continue
+                    if line.startswith("^"):
+                        if last:
+                            refs[last] = line[1:].strip()
+                        continue
+                    sha, name = line.split(" ", 1)
+                    refs[name] = sha
+                    last = name
+            self._packed_refs = refs
+        return self._packed_refs
+
+    def _read_ref_file(self, name):
+        base = self.git_dir if name == "HEAD" or not name.startswith("refs/") else self.common_dir
+        for directory in dict.fromkeys([base, self.git_dir, self.common_dir]):
+            path = directory / name
+            if path.is_file():
+                return path.read_text().strip()
+        return self._read_packed_refs().get(name)
+
+    def refs(self, prefix="refs/"):
+        """Map every ref name under prefix (loose or packed) to the sha it stores."""
+        refs = {name: sha for name, sha in self._read_packed_refs().items()
+                if name.startswith(prefix)}
+        for directory in dict.fromkeys([self.common_dir, self.git_dir]):
+            base = directory / prefix
+            if base.is_dir():
+                for path in base.rglob("*"):
+                    if path.is_file():
+                        value = path.read_text().strip()
+                        if not value.startswith("ref:"):
+                            refs[path.relative_to(directory).as_posix()] = value
+        return dict(sorted(refs.items()))
+
+    def read_symbolic(self, name="HEAD"):
+        """Return the ref a symbolic ref points at (e.g. refs/heads/main), or None if detached."""
+        value = self._read_ref_file(name)
+        if value and value.startswith("ref:"):
+            return value[4:].strip()
+        return None
+
+    def resolve_ref(self, name):
+        """Resolve a full ref name (following symbolic refs) to a sha, or None."""
+        for _ in range(10):
+            value = self._read_ref_file(name)
+            if value is None:
+                return None
+            if not value.startswith("ref:"):
+                return value
+            name = value[4:].strip()
+        return None
+
+    def rev_parse(self, spec):
+        """Resolve HEAD, a branch, tag, remote branch, ref name or full sha to a commit sha."""
+        if len(spec) == 40 and all(c in "0123456789abcdef" for c in spec):
+            return self.peel(spec)
+        for name in (spec, f"refs/{spec}", f"refs/tags/{spec}", f"refs/heads/{spec}",
+                     f"refs/remotes/{spec}", f"refs/remotes/{spec}/HEAD"):
+            sha = self.resolve_ref(name)
+            if sha:
+                return self.peel(sha)
+        return None
+
+    def peel(self, sha):
+        """Follow annotated tags down to the object they point at."""
+        for _ in range(10):
+            obj_type, data = self.read_object(sha)
+            if obj_type != "tag":
+                return sha
+            sha = data.split(b"\n", 1)[0].split(b" ", 1)[1].decode()
+        return sha
+
+    def head(self):
+        """Sha of HEAD, or None for an unborn branch / missing repo."""
+        return self.resolve_ref("HEAD")
+
+    def current_branch(self):
+        """Short name of the checked-out branch, or "" when HEAD is detached."""
+        ref = self.read_symbolic("HEAD")
+        if ref and ref.startswith("refs/heads/"):
+            return ref[len("refs/heads/"):]
+        return ""
+
+    # ---------------------------------------------------------------- config
+
+    def config(self):
+        """Parse .git/config into {(section, subsection): {key: value}}."""
+        if self._config is None:
+            config = {}
+            path = self.common_dir / "config"
+            section = None
+            if path.exists():
+                for raw in path.read_text().splitlines():
+                    line = raw.strip()
+                    if not line or line[0] in "#;":
+                        continue
+                    if line.startswith("["):
+                        header = line[1:line.index("]")]
+                        if '"' in header:
+                            name, sub = header.split('"', 1)
+                            section = (name.strip().lower(), sub.rsplit('"', 1)[0])
+                        else:
+                            name, _, sub = header.partition(".")
+                            section = (name.lower(), sub or None)
+                        config.setdefault(section, {})
+                    elif section is not None:
+                        key, _, value = line.partition("=")
+                        value = value.strip()
+                        if len(value) >= 2 and value[0] == value[-1] == '"':
+                            value = value[1:-1]
+                        config[section][key.strip().lower()] = value
+            self._config = config
+        return self._config
+
+    def remotes(self):
+        """Map remote name to URL."""
+        return {sub: values.get("url", "")
+                for (name, sub), values in self.config().items() if name == "remote"}
+
+    def upstream(self, branch=None):
+        """Upstream of a branch as "<remote>/<branch>" (as shown by `git branch -vv`), or None."""
+        branch = branch if branch is not None else self.current_branch()
+        values = self.config().get(("branch", branch), {})
+        remote, merge = values.get("remote"), values.get("merge")
+        if not remote or not merge:
+            return None
+        if remote == ".":
+            tracking = merge
+        else:
+            # Like git, only a configured remote whose fetch refspec maps the
+            # merge ref gives a remote-tracking branch to report
+            fetch = self.config().get(("remote", remote), {}).get("fetch")
+            tracking = _map_refspec(fetch, merge) if fetch else None
+            if tracking is None:
+                return None
+        for prefix in ("refs/heads/", "refs/remotes/"):
+            if tracking.startswith(prefix):
+                return tracking[len(prefix):]
+        return tracking
+
+    # --------------------------------------------------------------- objects
+
+    def _packs_list(self):
+        if self._packs is None:
+            self._packs = [_Pack(p) for d in self.object_dirs
+                           for p in sorted((d / "pack").glob("*.pack"))
+                           if p.with_suffix(".idx").exists()]
+        return self._packs
+
+    def read_object(self, sha):
+        """Return (type, data) for an object sha from loose storage or a pack."""
+        cached = self._objects.get(sha)
+        if cached is not None:
+            return cached
+
+        for directory in self.object_dirs:
+            path = directory / sha[:2] / sha[2:]
+            if path.exists():
+                raw = zlib.decompress(path.read_bytes())
+                header, _, data = raw.partition(b"\0")
+                obj = (header.split(b" ", 1)[0].decode(), data)
+                break
+        else:
+            binary = bytes.fromhex(sha)
+            for pack in self._packs_list():
+                offset = pack.find(binary)
+                if offset is not None:
+                    obj = pack.read_at(offset, self)
+                    break
+            else:
+                raise GitError(f"Object not found: {sha}")
+
+        if obj[0] != "blob":
+            self._objects[sha] = obj
+        return obj
+
+    def commit(self, sha):
+        """Parse a commit object."""
+        cached = self._commits.get(sha)
+        if cached is not None:
+            return cached
+
+        obj_type, data = self.read_object(sha)
+        if obj_type != "commit":
+            raise GitError(f"{sha} is a {obj_type}, not a commit")
+
+        headers, _, message = data.partition(b"\n\n")
+        tree, parents, author, committer = None, [], "", ""
+        for line in headers.split(b"\n"):
+            if line.startswith(b" "):
+                continue  # continuation of a multi-line header (e.g. gpgsig)
+            key, _, value = line.partition(b" ")
+            if key == b"tree":
+                tree = value.decode()
+            elif key == b"parent":
+                parents.append(value.decode())
+            elif key == b"author":
+                author = value.decode("utf-8", "replace")
+            elif key == b"committer":
+                committer = value.decode("utf-8", "replace")
+
+        try:
+            time = int(committer.rsplit(" ", 2)[1])
+        except (IndexError, ValueError):
+            time = 0
+
+        commit = Commit(sha, tree, tuple(parents), author, committer, time,
+                        message.decode("utf-8", "replace"))
+        self._commits[sha] = commit
+        return commit
+
+    def tree(self, sha):
+        """Parse a tree object into {name: (mode, sha)}."""
+        cached = self._trees.get(sha)
+        if cached is not None:
+            return cached
+
+        _, data = self.read_object(sha)
+        entries = {}
+        pos = 0
+        while pos < len(data):
+            space = data.index(b" ", pos)
+            nul = data.index(b"\0", space)
+            mode = data[pos:space].decode()
+            name = data[space + 1:nul].decode("utf-8", "replace")
+            entries[name] = (mode, data[nul + 1:nul + 21].hex())
+            pos = nul + 21
+        self._trees[sha] = entries
+        return entries
+
+    def tree_entry(self, tree_sha, path):
+        """Sha of the object at path inside a tree, or None if it does not exist."""
+        sha = tree_sha
+        for part in Path(path).as_posix().strip("/").split("/"):
+            entry = self.tree(sha).get(part)
+            if entry is None:
+                return None
+            sha = entry[1]
+        return sha
+
+    def iter_tree(self, tree_sha, prefix=""):
+        """Yield (path, blob sha) for every file under a tree."""
+        for name, (mode, sha) in self.tree(tree_sha).items():
+            path = f"{prefix}{name}"
+            if mode.startswith("4"):
+                yield from self.iter_tree(sha, path + "/")
+            elif not mode.startswith("16"):
+                yield path, sha
+
+    def diff_tree(self, old_tree, new_tree, prefix=""):
+        """Yield (path, old blob sha, new blob sha) for every file that differs between two trees.
+
+        Like `git diff-tree -r`: subtrees with equal shas are skipped without
+        being read, so a commit costs the trees along its changed paths, not
+        the size of the repository. A side where the file does not exist is
+        None; either tree may be None (empty).
+        """
+        if old_tree == new_tree:
+            return
+        old = self.tree(old_tree) if old_tree else {}
+        new = self.tree(new_tree) if new_tree else {}
+        for name in sorted(old.keys() | new.keys()):
+            old_mode, old_sha = old.get(name, (None, None))
+            new_mode, new_sha = new.get(name, (None, None))
+            if old_sha == new_sha and old_mode == new_mode:
+                continue
+            path = f"{prefix}{name}"
+            old_dir = old_mode is not None and old_mode.startswith("4")
+            new_dir = new_mode is not None and new_mode.startswith("4")
+            old_file = old_mode is not None and not old_dir and not old_mode.startswith("16")
+            new_file = new_mode is not None and not new_dir and not new_mode.startswith("16")
+            if old_file or new_file:
+                yield path, old_sha if old_file else None, new_sha if new_file else None
+            if old_dir or new_dir:
+                yield from self.diff_tree(old_sha if old_dir else None, new_sha if new_dir else None,
+                                          path + "/")
+
+    def changed_paths(self, sha):
+        """(path, old blob sha, new blob sha) for every file a commit changed against its first parent."""
+        commit = self.commit(sha)
+        parent = self.commit(commit.parents[0]).tree if commit.parents else None
+        return list(self.diff_tree(parent, commit.tree))
+
+    # --------------------------------------------------------------- history
+
+    def walk(self, start="HEAD"):
+        """Yield commits reachable from start, newest first (git log's default order)."""
+        sha = self.rev_parse(start)
+        if not sha:
+            return
+        seen = {sha}
+        heap = [(-self.commit(sha).time, sha)]
+        while heap:
+            _, sha = heapq.heappop(heap)
+            commit = self.commit(sha)
+            yield commit
+            for parent in commit.parents:
+                if parent not in seen:
+                    seen.add(parent)
+                    heapq.heappush(heap, (-self.commit(parent).time, parent))
+
+    def walk_marked(self, start="HEAD", exclude=None):
+        """Yield (commit, excluded) for every commit reachable from start, newest first.
+
+        excluded is True when the commit is also reachable from exclude, so a
+        single call answers both `git log start` and `git log exclude..start`.
+        """
+        start_sha = self.rev_parse(start)
+        if not start_sha:
+            return
+        exclude_sha = self.rev_parse(exclude) if exclude else None
+
+        # Exclusions are marked in a first pass: during a date-ordered walk a
+        # commit can be reached from start before its link to exclude is
+        # seen (equal committer dates, clock skew), which would count it as new
+        hidden = set()
+        stack = [exclude_sha] if exclude_sha else []
+        while stack:
+            sha = stack.pop()
+            if sha not in hidden:
+                hidden.add(sha)
+                stack.extend(self.commit(sha).parents)
+
+        for commit in self.walk(start_sha):
+            yield commit, commit.sha in hidden
+
+    def find_blob(self, tree_sha, blob_sha):
+        """Path of the first file in a tree with the given blob sha (exact-rename detection)."""
+        for path, sha in self.iter_tree(tree_sha):
+            if sha == blob_sha:
+                return path
+        return None
@@ -0,0 +1,133 @@
+"""
+Identifier References
+Finds where JavaScript/TypeScript identifiers are really referenced, telling
+code apart from the same name inside a string, template text or comment.
+
+    scan(source_bytes, ("getUserData",))
+    -> {"getUserData": [Reference(line=3, context="code", role="import"),
+                        Reference(line=9, context="code", role="call"),
+                        Reference(line=14, context="comment", role=None)]}
+
+Code references carry a role: "import" inside an import or export ... from
+statement (or a require() destructuring), "definition" where a function,
+class or variable of that name is declared, "call" when the name is invoked,
+and "reference" otherwise (types, property access, re-assignment).
+
+The tokenizer only stops at what can change the context of a name
+(comments, quotes, template literals and the braces of their ${...}
+interpolations) and at the names themselves, so a file costs a few regex
+steps per string and comment rather than one per token. Regular expression
+literals are not recognised; a quote inside one can misclassify the rest of
+its line.
+"""
+
+import bisect
+import functools
+import re
+from collections import namedtuple
+
+Reference = namedtuple("Reference", "line context role")
+
+NEWLINE = re.compile(rb"\n")
+
+# Text of a template literal up to its end or its next ${
+TEMPLATE_TEXT = re.compile(rb"(?:[^`\\$]|\\.|\$(?!\{))*", re.S)
+
+# import { a, b } from "x";  export { a } from "x";  import a, * as b from "x"
+IMPORT_STATEMENT = re.compile(
+    rb"\bimport\s+(?:type\s+)?[\w$\s{},*]*?\bfrom\s*['\"]"
+    rb"|\bexport\s+(?:type\s+)?\{[^}]*\}\s*from\s*['\"]"
+    rb"|\b(?:const|let|var)\s*\{[^}]*\}\s*=\s*(?:await\s+)?(?:require|import)\s*\("
+)
+
+CALL = re.compile(rb"\s*(?:<[^<>()]*>)?\s*\(")
+
+# Declaration keywords directly before a name (searched in the text just before it)
+DECLARATION = re.compile(rb"(?:\bfunction\s*\*?|\b(?:class|const|let|var))\s+\Z")
+
+
+def _name_pattern(names):
+    return b"(?<![\\w$])(?:" + b"|".join(re.escape(n.encode()) for n in names) + b")(?![\\w$])"
+
+
+@functools.lru_cache(maxsize=16)
+def _compiled(names):
+    """(token pattern outside templates, same inside ${...}, bare name pattern)."""
+    name = _name_pattern(names)
+    tokens = (
+        rb"(?P<comment>//[^\n]*|/\*.*?(?:\*/|\Z))"
+        rb"|(?P<string>'(?:[^'\\\n]|\\.)*'?|\"(?:[^\"\\\n]|\\.)*\"?)"
+        rb"|(?P<template>`)"
+        rb"|(?P<name>" + name + rb")"
+    )
+    braces = rb"|(?P<open>\{)|(?P<close>\})"
+    return (re.compile(tokens, re.S), re.compile(tokens + braces, re.S),
+            re.compile(name))
+
+
+def _lines(data):
+    """Offset -> 1-based line number for data."""
+    newlines = [m.start() for m in NEWLINE.finditer(data)]
+    return lambda offset: bisect.bisect_left(newlines, offset) + 1
+
+
+def scan(data, names):
+    """References to each of names in one file's bytes: {name: [Reference]} in file order.
+
+    Names that do not occur are left out.
+    """
+    names = tuple(sorted(names))
+    if all(data.find(name.encode()) == -1 for name in names):  # (`in` would test one byte of an mmap)
+        return {}
+    outside, inside, bare = _compiled(names)
+    imports = [(m.start(), m.end()) for m in IMPORT_STATEMENT.finditer(data)]
+    line_of = _lines(data)
+    found = {}
+
+    def record(match, context, role=None):
+        found.setdefault(match.group().decode(), []).append(
+            Reference(line_of(match.start()), context, role))
+
+    def role(match):
+        if any(start <= match.start() < end for start, end in imports):
+            return "import"
+        if DECLARATION.search(data[max(0, match.start() - 32):match.start()]):
+            return "definition"
+        return "call" if CALL.match(data, match.end()) else "reference"
+
+    interpolations = []  # unclosed { inside each open ${...}, innermost last
+    pos = 0
+    while pos < len(data):
+        token = (inside if interpolations else outside).search(data, pos)
+        if token is None:
+            break
+        pos = token.end()
+        kind = token.lastgroup
+        if kind == "name":
+            record(token, "code", role(token))
+        elif kind in ("comment", "string"):
+            for match in bare.finditer(data, token.start(), token.end()):
+                record(match, kind)
+        elif kind == "open":
+            interpolations[-1] += 1
+        elif kind == "close":
+            if interpolations[-1]:
+                interpolations[-1] -= 1
+                continue
+            interpolations.pop()
+            pos = _template(data, pos, interpolations, bare, record)
+        else:
+            pos = _template(data, pos, interpolations, bare, record)
+    return found
+
+
+def _template(data, pos, interpolations, bare, record):
+    """Read template text from pos; returns where code resumes (after ` or ${)."""
+    text = TEMPLATE_TEXT.match(data, pos)
+    for match in bare.finditer(data, text.start(), text.end()):
+        record(match, "string")
+    end = text.end()
+    if data[end:end + 2] == b"${":
+        interpolations.append(0)
+        return end + 2
+    return end + 1  # past the closing ` (or the end of an unterminated template)
@@ -0,0 +1,140 @@
+"""
+Keyword Matching
+Finds many keywords in a text in one pass, case-insensitively, without
+building a lowercased copy of the whole text.
+
+The keywords are merged into a trie (the goto function of an Aho-Corasick
+automaton) that is compiled into a single regular expression, so the scan
+runs inside the regex engine instead of a per-character Python loop. Every
+position where the expression matches is expanded back into all keywords
+that start there and the scan resumes one character later, so overlapping
+and nested keywords are all reported, as Aho-Corasick would.
+
+Case-insensitive sets lowercase the text one window at a time, so memory
+stays bounded however large the report is, and the trie is matched on plain
+characters, where the regex engine is fastest.
+
+    CONCEPTS = KeywordSet(["context", "token", "memory"])
+    CONCEPTS.count_present(report)      # how many of them occur at least once
+    CONCEPTS.counts(report)             # {"context": 12, "token": 40, "memory": 0}
+"""
+
+import re
+
+# Characters lowercased at a time by case-insensitive scans
+WINDOW = 64 * 1024
+
+# Marks a trie node where a keyword ends
+_END = ""
+
+
+class KeywordSet:
+    """A fixed set of keywords compiled for repeated one-pass scanning."""
+
+    def __init__(self, words, ignore_case=True):
+        self.words = tuple(dict.fromkeys(words))
+        if "" in self.words:
+            raise ValueError("keywords must not be empty")
+        self.ignore_case = ignore_case
+        self._trie = {}
+        for word in self.words:
+            node = self._trie
+            for char in self.fold(word):
+                node = node.setdefault(char, {})
+            node.setdefault(_END, []).append(word)
+        self.longest = max((len(self.fold(word)) for word in self.words), default=0)
+        self.source = self._emit(self._trie)
+        self.pattern = re.compile(self.source or "(?!)")
+        self._subsets = {}
+
+    def fold(self, text):
+        """Text as the trie sees it."""
+        return text.lower() if self.ignore_case else text
+
+    def _emit(self, node):
+        """Regex for the trie below node, trying longer keywords first."""
+        branches = [re.escape(c) + self._emit(child)
+                    for c, child in sorted(node.items()) if c != _END]
+        if not branches:
+            return ""
+        body = branches[0] if len(branches) == 1 else "(?:" + "|".join(branches) + ")"
+        return f"(?:{body})?" if _END in node else body
+
+    def _windows(self, text):
+        """(folded buffer, limit) pairs covering text.
+
+        Matches starting before limit belong to the window; the characters
+        past it only let keywords that straddle two windows complete.
+        """
+        if not self.ignore_case:
+            yield text, len(text)
+            return
+        overlap = self.longest - 1
+        for start in range(0, len(text), WINDOW):
+            window = text[start:start + WINDOW].lower()
+            tail = text[start + WINDOW:start + WINDOW + overlap].lower()
+            yield window + tail, len(window)
+
+    def starting_at(self, folded, pos):
+        """Every keyword occurring in already-folded text starting exactly at pos."""
+        found = []
+        node = self._trie
+        for char in folded[pos:pos + self.longest]:
+            node = node.get(char)
+            if node is None:
+                break
+            found.extend(node.get(_END, ()))
+        return found
+
+    def counts(self, text):
+        """Occurrences of every keyword (overlapping ones included)."""
+        counts = dict.fromkeys(self.words, 0)
+        for buffer, limit in self._windows(text):
+            pos = 0
+            while True:
+                match = self.pattern.search(buffer, pos)
+                if match is None or match.start() >= limit:
+                    break
+                pos = match.start()
+                for word in self.starting_at(buffer, pos):
+                    counts[word] += 1
+                pos += 1
+        return counts
+
+    def subset(self, words):
+        """The KeywordSet for some of these keywords, compiled once."""
+        key = frozenset(words)
+        if key == frozenset(self.words):
+            return self
+        subset = self._subsets.get(key)
+        if subset is None:
+            subset = self._subsets[key] = KeywordSet(
+                [word for word in self.words if word in key], self.ignore_case)
+        return subset
+
+    def present(self, text):
+        """The keywords that occur at least once.
+
+        Keywords drop out of the search as soon as they are found and the scan
+        stops once all of them have been, so a report that mentions every
+        concept near the top is never read to the end.
+        """
+        found = set()
+        remaining = self
+        for buffer, limit in self._windows(text):
+            pos = 0
+            while remaining.words:
+                match = remaining.pattern.search(buffer, pos)
+                if match is None or match.start() >= limit:
+                    break
+                pos = match.start()
+                found.update(remaining.starting_at(buffer, pos))
+                remaining = self.subset(word for word in self.words if word not in found)
+                pos += 1
+            if not remaining.words:
+                break
+        return found
+
+    def count_present(self, text):
+        """How many distinct keywords occur at least once."""
+        return len(self.present(text))
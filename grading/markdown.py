@@ -0,0 +1,165 @@
+"""
+Markdown Sections
+Parses a markdown report once into a tree of sections, so graders can ask
+about a section's own text, list items and checklist instead of searching
+the whole document for "## Heading" and hoping it is the right one.
+
+    doc = markdown.load(root, "handoff.md")
+    tasks = doc.section("Outstanding Tasks")
+    tasks.tasks        # [(False, "Implement password reset"), ...]
+    doc.section("MCP Servers").rows  # [["github", "running", "..."], ...]
+    doc.section("Root Cause", prefix=True)  # also "Root Cause Analysis"
+
+Titles are matched case-insensitively, ignoring emphasis, trailing colons and
+extra whitespace. Headings inside fenced code blocks are not headings. A
+section's text is its own body, up to the next heading of any level; its
+children are the deeper headings under it.
+"""
+
+import functools
+import os
+import re
+from pathlib import Path
+
+from grading.rubric import DEFAULT_MAX_INPUT_BYTES
+
+HEADING = re.compile(r"^ {0,3}(#{1,6})[ \t]+(.*?)(?:[ \t]+#+)?[ \t]*$")
+FENCE = re.compile(r"^ {0,3}(`{3,}|~{3,})")
+LIST_ITEM = re.compile(r"^[ \t]*(?:[-*+]|\d+[.)])[ \t]+(.*\S)")
+TASK = re.compile(r"^\[([ xX])\][ \t]+(.*)")
+TABLE_ROW = re.compile(r"^[ \t]*\|(.*?)\|?[ \t]*$")
+TABLE_SEPARATOR = re.compile(r"^[\s|:-]+$")
+
+
+def normalize(title):
+    """Comparable form of a heading title."""
+    title = re.sub(r"[*_`]", "", title)
+    return " ".join(title.split()).rstrip(":").strip().lower()
+
+
+class Section:
+    """One heading and what follows it (the document itself is the level-0 section)."""
+
+    def __init__(self, title, level, line, parent=None):
+        self.title = title
+        self.level = level
+        self.line = line
+        self.parent = parent
+        self.children = []
+        self.lines = []
+
+    @property
+    def text(self):
+        """The section's own body, without its heading or subsections."""
+        return "\n".join(self.lines).strip()
+
+    @property
+    def items(self):
+        """Text of the section's list items (bulleted or numbered), checkbox included."""
+        return [match.group(1) for match in map(LIST_ITEM.match, self.lines) if match]
+
+    @property
+    def tasks(self):
+        """(done, text) for each checklist item ("- [ ] ..." / "- [x] ...")."""
+        tasks = []
+        for item in self.items:
+            match = TASK.match(item)
+            if match:
+                tasks.append((match.group(1) != " ", match.group(2).strip()))
+        return tasks
+
+    @property
+    def rows(self):
+        """Cells of the section's table rows (header row and separator excluded), stripped of emphasis."""
+        rows = []
+        for line in self.lines:
+            match = TABLE_ROW.match(line)
+            if match is None:
+                if rows:
+                    break  # only the first table
+                continue
+            if TABLE_SEPARATOR.match(line):
+                rows = []  # what came before was the header
+                continue
+            rows.append([cell.strip().strip("*_`").strip() for cell in match.group(1).split("|")])
+        return rows
+
+    def walk(self):
+        """This section's subsections, depth first in document order."""
+        for child in self.children:
+            yield child
+            yield from child.walk()
+
+    def section(self, *titles, prefix=False):
+        """First subsection titled any of titles (or starting with one, with prefix=True), or None."""
+        wanted = [normalize(title) for title in titles]
+        for child in self.walk():
+            title = normalize(child.title)
+            if any(title == w or (prefix and title.startswith(w)) for w in wanted):
+                return child
+        return None
+
+    def __repr__(self):
+        return f"Section({self.title!r}, level={self.level}, line={self.line})"
+
+
+class Document(Section):
+    """A parsed markdown file: the root of its section tree."""
+
+    def __init__(self, size=0, truncated=False):
+        super().__init__("", 0, 0)
+        self.size = size
+        self.truncated = truncated
+
+
+def parse(text, size=None, truncated=False):
+    """Parse markdown text into a Document in one pass over its lines."""
+    doc = Document(len(text) if size is None else size, truncated)
+    current = doc
+    fence = None
+    for number, line in enumerate(text.splitlines(), 1):
+        opening = FENCE.match(line)
+        if fence is not None:
+            if opening and opening.group(1)[0] == fence[0] and len(opening.group(1)) >= len(fence):
+                fence = None
+            current.lines.append(line)
+            continue
+        if opening:
+            fence = opening.group(1)
+            current.lines.append(line)
+            continue
+
+        heading = HEADING.match(line)
+        if heading is None:
+            current.lines.append(line)
+            continue
+        level = len(heading.group(1))
+        parent = current
+        while parent.level >= level:
+            parent = parent.parent
+        current = Section(heading.group(2), level, number, parent)
+        parent.children.append(current)
+    return doc
+
+
+@functools.lru_cache(maxsize=256)
+def _load(path, size, mtime_ns, max_bytes):
+    with open(path, encoding="utf-8", errors="replace") as f:
+        text = f.read(max_bytes)
+    return parse(text, size, truncated=size > max_bytes)
+
+
+def load(root, path, max_bytes=DEFAULT_MAX_INPUT_BYTES):
+    """Parse root/path (reading at most max_bytes), or None if it does not exist.
+
+    Memoized on the file's size and mtime, so every check of a grader shares
+    one parse.
+    """
+    full = Path(root) / path
+    try:
+        st = os.stat(full)
+    except OSError:
+        return None
+    if not full.is_file():
+        return None
+    return _load(str(full.resolve()), st.st_size, st.st_mtime_ns, max_bytes)
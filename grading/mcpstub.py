@@ -0,0 +1,643 @@
+"""
+MCP Stand-Ins
+Local stand-ins for the GitHub, Memory, Filesystem and Sequential Thinking
+MCP servers, so the MCP Orchestra workflow runs offline and is graded from
+what the servers saw rather than from what the report claims:
+
+    python -m grading.mcpstub init .      # writes .mcp.json for the four stand-ins
+    claude                                 # approve them; /mcp lists them
+
+Each stand-in speaks MCP (JSON-RPC over stdio, one message per line) and
+appends one JSON line per request to mcp_calls.jsonl with the tool, its
+arguments and result, and when the call started and ended. Tool calls are
+answered on a thread pool, so a client can have several in flight at once.
+
+GitHub serves a fixture repository from a JSON file after a simulated
+network latency, and fails the first list_commits with a rate limit error.
+Memory keeps its knowledge graph in .mcp-standins/memory.json. Filesystem
+only reaches inside the directory it was started for.
+
+Timeline() reads the log back: a call depends on an earlier one when it used
+a value that call returned or state it wrote. From that it finds the critical
+path and whether calls that did not depend on each other overlapped or were
+run one after another.
+"""
+
+import argparse
+import heapq
+import json
+import os
+import re
+import sys
+import tempfile
+import threading
+import time
+from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+from grading.rubric import DEFAULT_MAX_INPUT_BYTES
+
+SERVERS = ("github", "memory", "filesystem", "sequential-thinking")
+THINKING = "sequential-thinking"
+LOG = "mcp_calls.jsonl"
+# Stand-in state inside the submission (memory graph, injected failures)
+STATE_DIR = ".mcp-standins"
+PROTOCOL_VERSION = "2025-06-18"
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+DEFAULT_REPO = REPO_ROOT / "hard" / "02-mcp-orchestra" / "fixture" / "repo.json"
+
+# Simulated response time of each stand-in, in seconds
+LATENCY = {"github": 0.4, "memory": 0.05, "filesystem": 0.02, THINKING: 0.0}
+# The GitHub tool that fails once, to exercise error handling
+FAIL_ONCE = "list_commits"
+# Tool calls answered concurrently by one stand-in
+MAX_IN_FLIGHT = 8
+# Logged results are cut to this many characters
+MAX_LOGGED_RESULT = 64 * 1024
+
+# Tools that change a stand-in's state, which later calls to it may read
+WRITES = frozenset(("create_entities", "create_relations", "add_observations", "write_file", "create_directory"))
+# Values long enough to tell where data came from (shas, names, paths, titles)
+TOKEN = re.compile(r"[\w.@/:#-]{6,}")
+
+Call = namedtuple("Call", "server tool start end ok arguments result")
+
+
+class ToolError(Exception):
+    """A tool call answered with isError: bad arguments, not found, rate limited."""
+
+
+def tool(description, required=(), **properties):
+    """Mark a StandIn method as an MCP tool; properties map argument names to JSON schema types."""
+    def mark(method):
+        method.tool = {
+            "description": description,
+            "inputSchema": {
+                "type": "object",
+                "properties": {name: {"type": kind} for name, kind in properties.items()},
+                "required": list(required),
+            },
+        }
+        return method
+    return mark
+
+
+class StandIn:
+    """An MCP server's tools; subclasses define them with @tool."""
+
+    name = None
+
+    def tools(self):
+        """{tool name: bound method}."""
+        return {name: getattr(self, name) for name in dir(type(self))
+                if hasattr(getattr(type(self), name), "tool")}
+
+    def describe(self):
+        """The tools/list answer."""
+        return [dict(name=name, **method.tool) for name, method in sorted(self.tools().items())]
+
+    def call(self, name, arguments):
+        """Result text of a tool call; raises ToolError."""
+        method = self.tools().get(name)
+        if method is None:
+            raise ToolError(f"Unknown tool: {name}")
+        missing = [arg for arg in method.tool["inputSchema"]["required"] if arg not in arguments]
+        if missing:
+            raise ToolError(f"Missing required arguments for {name}: {', '.join(missing)}")
+        result = method(**arguments)
+        return result if isinstance(result, str) else json.dumps(result, indent=2)
+
+
+class GitHub(StandIn):
+    """Serves one repository, described by a fixture JSON file."""
+
+    name = "github"
+
+    def __init__(self, repo=DEFAULT_REPO, fail_once=FAIL_ONCE, state_dir=None):
+        with open(repo) as f:
+            self.repo = json.load(f)
+        self.fail_once = fail_once
+        # Failures are injected once per submission, not once per server start
+        self.failed_marker = Path(state_dir) / "github-failed" if state_dir else None
+        self._failed = False
+        self._lock = threading.Lock()
+
+    def _check(self, owner, repo):
+        if f"{owner}/{repo}".lower() != self.repo["full_name"].lower():
+            raise ToolError(f"Not Found: {owner}/{repo}")
+
+    def _maybe_fail(self, name):
+        if name != self.fail_once:
+            return
+        with self._lock:
+            if self._failed or (self.failed_marker and self.failed_marker.exists()):
+                return
+            self._failed = True
+            if self.failed_marker:
+                self.failed_marker.parent.mkdir(parents=True, exist_ok=True)
+                self.failed_marker.touch()
+        raise ToolError("API rate limit exceeded for this token. Retry after 1 second.")
+
+    def metadata(self):
+        keys = ("full_name", "description", "default_branch", "language", "stargazers_count", "html_url")
+        return {key: self.repo.get(key) for key in keys}
+
+    @tool("Search for GitHub repositories", required=("query",), query="string", page="number", perPage="number")
+    def search_repositories(self, query, page=1, perPage=30):
+        haystack = f"{self.repo['full_name']} {self.repo.get('description', '')}".lower()
+        terms = [term.split(":", 1)[-1].lower() for term in query.split()]
+        items = [self.metadata()] if all(term in haystack for term in terms) else []
+        return {"total_count": len(items), "items": items if page == 1 else []}
+
+    @tool("Get the contents of a file or directory from a GitHub repository",
+          required=("owner", "repo", "path"), owner="string", repo="string", path="string", branch="string")
+    def get_file_contents(self, owner, repo, path, branch=None):
+        self._check(owner, repo)
+        path = path.strip("/")
+        files = self.repo["files"]
+        if path in files:
+            return {"name": path.rsplit("/", 1)[-1], "path": path, "type": "file", "content": files[path]}
+        prefix = f"{path}/" if path else ""
+        entries = {}
+        for name in files:
+            if name.startswith(prefix):
+                child, _, rest = name[len(prefix):].partition("/")
+                entries[child] = "dir" if rest else "file"
+        if not entries:
+            raise ToolError(f"Not Found: {path}")
+        return [{"name": child, "path": prefix + child, "type": kind} for child, kind in sorted(entries.items())]
+
+    @tool("Get list of commits of a branch in a GitHub repository",
+          required=("owner", "repo"), owner="string", repo="string", sha="string", page="number", perPage="number")
+    def list_commits(self, owner, repo, sha=None, page=1, perPage=30):
+        self._check(owner, repo)
+        self._maybe_fail("list_commits")
+        commits = self.repo["commits"][(page - 1) * perPage:page * perPage]
+        return [{"sha": c["sha"],
+                 "commit": {"author": {"name": c["author"]["name"], "email": c["author"]["email"],
+                                       "date": c["date"]},
+                            "message": c["message"]},
+                 "author": {"login": c["author"]["login"]}} for c in commits]
+
+    @tool("List issues in a GitHub repository", required=("owner", "repo"),
+          owner="string", repo="string", state="string")
+    def list_issues(self, owner, repo, state="open"):
+        self._check(owner, repo)
+        return [issue for issue in self.repo.get("issues", ()) if state == "all" or issue["state"] == state]
+
+
+class Memory(StandIn):
+    """A knowledge graph of entities and relations, kept in a JSON file."""
+
+    name = "memory"
+
+    def __init__(self, store):
+        self.store = Path(store)
+        self._lock = threading.Lock()
+
+    def _load(self):
+        try:
+            return json.loads(self.store.read_text())
+        except (OSError, ValueError):
+            return {"entities": [], "relations": []}
+
+    def _save(self, graph):
+        self.store.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=self.store.parent, suffix=".tmp")
+        with os.fdopen(fd, "w") as f:
+            json.dump(graph, f, indent=2)
+        os.replace(tmp, self.store)
+
+    @staticmethod
+    def _subgraph(graph, entities):
+        names = {entity["name"] for entity in entities}
+        return {"entities": entities,
+                "relations": [r for r in graph["relations"] if r["from"] in names and r["to"] in names]}
+
+    @tool("Create multiple new entities in the knowledge graph", required=("entities",), entities="array")
+    def create_entities(self, entities):
+        with self._lock:
+            graph = self._load()
+            existing = {entity["name"] for entity in graph["entities"]}
+            created = [{"name": e["name"], "entityType": e.get("entityType", ""),
+                        "observations": list(e.get("observations", ()))}
+                       for e in entities if e["name"] not in existing]
+            graph["entities"] += created
+            self._save(graph)
+        return created
+
+    @tool("Create multiple new relations between entities", required=("relations",), relations="array")
+    def create_relations(self, relations):
+        with self._lock:
+            graph = self._load()
+            created = [{"from": r["from"], "to": r["to"], "relationType": r["relationType"]}
+                       for r in relations]
+            created = [r for r in created if r not in graph["relations"]]
+            graph["relations"] += created
+            self._save(graph)
+        return created
+
+    @tool("Add new observations to existing entities", required=("observations",), observations="array")
+    def add_observations(self, observations):
+        with self._lock:
+            graph = self._load()
+            entities = {entity["name"]: entity for entity in graph["entities"]}
+            added = []
+            for item in observations:
+                entity = entities.get(item["entityName"])
+                if entity is None:
+                    raise ToolError(f"Entity with name {item['entityName']} not found")
+                new = [text for text in item["contents"] if text not in entity["observations"]]
+                entity["observations"] += new
+                added.append({"entityName": item["entityName"], "addedObservations": new})
+            self._save(graph)
+        return added
+
+    @tool("Search for nodes in the knowledge graph", required=("query",), query="string")
+    def search_nodes(self, query):
+        graph = self._load()
+        query = query.lower()
+        return self._subgraph(graph, [
+            e for e in graph["entities"]
+            if query in e["name"].lower() or query in e["entityType"].lower()
+            or any(query in text.lower() for text in e["observations"])])
+
+    @tool("Open specific nodes in the knowledge graph by their names", required=("names",), names="array")
+    def open_nodes(self, names):
+        graph = self._load()
+        return self._subgraph(graph, [e for e in graph["entities"] if e["name"] in names])
+
+    @tool("Read the entire knowledge graph")
+    def read_graph(self):
+        return self._load()
+
+
+class Filesystem(StandIn):
+    """File access confined to one directory."""
+
+    name = "filesystem"
+
+    def __init__(self, root):
+        self.root = Path(root).resolve()
+
+    def _path(self, path):
+        full = (self.root / path).resolve()
+        if full != self.root and self.root not in full.parents:
+            raise ToolError(f"Access denied - path outside allowed directories: {path}")
+        return full
+
+    @tool("Read the complete contents of a file", required=("path",), path="string")
+    def read_file(self, path):
+        try:
+            return self._path(path).read_text(errors="replace")
+        except OSError as e:
+            raise ToolError(f"Error reading {path}: {e.strerror}") from None
+
+    @tool("Create a new file or overwrite an existing file", required=("path", "content"),
+          path="string", content="string")
+    def write_file(self, path, content):
+        try:
+            self._path(path).write_text(content)
+        except OSError as e:
+            raise ToolError(f"Error writing {path}: {e.strerror}") from None
+        return f"Successfully wrote to {path}"
+
+    @tool("Create a new directory, including parents", required=("path",), path="string")
+    def create_directory(self, path):
+        self._path(path).mkdir(parents=True, exist_ok=True)
+        return f"Successfully created directory {path}"
+
+    @tool("List the files and directories in a directory", required=("path",), path="string")
+    def list_directory(self, path):
+        directory = self._path(path)
+        if not directory.is_dir():
+            raise ToolError(f"Not a directory: {path}")
+        return "\n".join(f"[{'DIR' if p.is_dir() else 'FILE'}] {p.name}" for p in sorted(directory.iterdir()))
+
+    @tool("Recursively search for files whose name contains a pattern", required=("path", "pattern"),
+          path="string", pattern="string")
+    def search_files(self, path, pattern):
+        found = [str(p) for p in sorted(self._path(path).rglob("*")) if pattern.lower() in p.name.lower()]
+        return "\n".join(found) or "No matches found"
+
+
+class SequentialThinking(StandIn):
+    """Records numbered thoughts, as the reference server does."""
+
+    name = THINKING
+
+    def __init__(self):
+        self.history = []
+        self._lock = threading.Lock()
+
+    @tool("Think through a problem step by step; each call is one thought",
+          required=("thought", "nextThoughtNeeded", "thoughtNumber", "totalThoughts"),
+          thought="string", nextThoughtNeeded="boolean", thoughtNumber="integer", totalThoughts="integer",
+          isRevision="boolean", revisesThought="integer", branchFromThought="integer", branchId="string",
+          needsMoreThoughts="boolean")
+    def sequentialthinking(self, thought, nextThoughtNeeded, thoughtNumber, totalThoughts, **_):
+        with self._lock:
+            self.history.append(thoughtNumber)
+            length = len(self.history)
+        return {"thoughtNumber": thoughtNumber, "totalThoughts": max(totalThoughts, thoughtNumber),
+                "nextThoughtNeeded": nextThoughtNeeded, "branches": [], "thoughtHistoryLength": length}
+
+
+# Tool names of each server
+TOOLS = {cls.name: sorted(name for name in dir(cls) if hasattr(getattr(cls, name), "tool"))
+         for cls in (GitHub, Memory, Filesystem, SequentialThinking)}
+
+
+def standin(name, root, repo=DEFAULT_REPO, fail_once=FAIL_ONCE):
+    """The stand-in for server name, keeping its state under root."""
+    state = Path(root) / STATE_DIR
+    if name == "github":
+        return GitHub(repo, fail_once, state)
+    if name == "memory":
+        return Memory(state / "memory.json")
+    if name == "filesystem":
+        return Filesystem(root)
+    if name == THINKING:
+        return SequentialThinking()
+    raise ValueError(f"unknown server {name!r}; expected one of {', '.join(SERVERS)}")
+
+
+class CallLog:
+    """Appends records to the call log, one write each so concurrent stand-ins never interleave."""
+
+    def __init__(self, path):
+        self.path = path
+
+    def write(self, record):
+        fd = os.open(self.path, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+        try:
+            os.write(fd, (json.dumps(record) + "\n").encode())
+        finally:
+            os.close(fd)
+
+
+def _call(server, request, log, latency, reply):
+    params = request.get("params") or {}
+    name, arguments = params.get("name"), params.get("arguments") or {}
+    start = time.time()
+    time.sleep(latency)
+    try:
+        text, ok = server.call(name, arguments), True
+    except ToolError as e:
+        text, ok = str(e), False
+    except Exception as e:  # a bad argument shape must not leave the client waiting
+        text, ok = f"Error: {type(e).__name__}: {e}", False
+    log.write({"server": server.name, "method": "tools/call", "tool": name, "start": start, "end": time.time(),
+               "ok": ok, "arguments": arguments, "result": text[:MAX_LOGGED_RESULT]})
+    reply({"jsonrpc": "2.0", "id": request.get("id"),
+           "result": {"content": [{"type": "text", "text": text}], "isError": not ok}})
+
+
+def _answer(server, request, log):
+    method = request.get("method")
+    start = time.time()
+    if method == "initialize":
+        requested = (request.get("params") or {}).get("protocolVersion")
+        result = {"protocolVersion": requested or PROTOCOL_VERSION, "capabilities": {"tools": {}},
+                  "serverInfo": {"name": f"{server.name}-standin", "version": "1.0.0"}}
+    elif method == "tools/list":
+        result = {"tools": server.describe()}
+    elif method == "ping":
+        result = {}
+    else:
+        return {"jsonrpc": "2.0", "id": request.get("id"),
+                "error": {"code": -32601, "message": f"Method not found: {method}"}}
+    if method != "ping":
+        log.write({"server": server.name, "method": method, "start": start, "end": time.time()})
+    return {"jsonrpc": "2.0", "id": request.get("id"), "result": result}
+
+
+def serve(server, log, latency=0.0, stdin=None, stdout=None):
+    """Answer MCP requests from stdin until it closes, logging each one."""
+    stdin = stdin or sys.stdin
+    stdout = stdout or sys.stdout
+    lock = threading.Lock()
+
+    def reply(message):
+        with lock:
+            stdout.write(json.dumps(message) + "\n")
+            stdout.flush()
+
+    with ThreadPoolExecutor(max_workers=MAX_IN_FLIGHT) as pool:
+        for line in stdin:
+            if not line.strip():
+                continue
+            try:
+                request = json.loads(line)
+            except ValueError:
+                reply({"jsonrpc": "2.0", "id": None, "error": {"code": -32700, "message": "Parse error"}})
+                continue
+            if request.get("method") == "tools/call":
+                pool.submit(_call, server, request, log, latency, reply)
+            elif "id" in request:  # notifications get no answer
+                reply(_answer(server, request, log))
+
+
+# ---------------------------------------------------------------- grading
+
+def load_log(root=".", max_bytes=DEFAULT_MAX_INPUT_BYTES):
+    """(tool calls in start order, servers that were initialized) from root's call log, or None without one."""
+    path = Path(root) / LOG
+    if not path.is_file():
+        return None
+    calls, initialized = [], set()
+    read = 0
+    with open(path, "rb") as f:
+        for line in f:
+            read += len(line)
+            if read > max_bytes:
+                break
+            try:
+                record = json.loads(line)
+                if record.get("method") == "initialize":
+                    initialized.add(record["server"])
+                elif record.get("method") == "tools/call":
+                    calls.append(Call(record["server"], record["tool"], float(record["start"]),
+                                      float(record["end"]), bool(record["ok"]),
+                                      record.get("arguments") or {}, record.get("result") or ""))
+            except (ValueError, KeyError, TypeError, AttributeError):
+                continue
+    calls.sort(key=lambda call: call.start)
+    return calls, initialized
+
+
+def _leaves(value):
+    if isinstance(value, dict):
+        for item in value.values():
+            yield from _leaves(item)
+    elif isinstance(value, list):
+        for item in value:
+            yield from _leaves(item)
+    elif isinstance(value, str):
+        yield value
+
+
+def _tokens(value):
+    return set(TOKEN.findall("\n".join(_leaves(value))))
+
+
+def _result_value(text):
+    try:
+        return json.loads(text)
+    except ValueError:
+        return text
+
+
+class Timeline:
+    """Dependencies, critical path and overlap of a workflow's tool calls.
+
+    A call depends on an earlier, finished call that returned a value found
+    in its arguments (values that call was itself given do not count), on
+    the last finished write to the same server's state by another tool
+    (sibling writes such as two write_file calls stay independent) and,
+    when it is a retry, on the attempt that failed; each thought depends on
+    the one before. A successful call is an overlap opportunity when it ran
+    alongside a call it did not need, or was ready before the previous call
+    started but still waited for it to finish.
+    """
+
+    def __init__(self, calls):
+        self.calls = calls = sorted(calls, key=lambda call: call.start)
+        consumed = [_tokens(call.arguments) for call in calls]
+        producers = {}
+        for i, call in enumerate(calls):
+            if call.ok:
+                for token in _tokens(_result_value(call.result)) - consumed[i]:
+                    producers.setdefault(token, []).append(i)
+
+        self.depends = []
+        ancestors = []  # bitsets of transitive dependencies
+        last_write, last_failure = {}, {}
+        previous_thought = None
+        for i, call in enumerate(calls):
+            direct = {j for token in consumed[i] for j in producers.get(token, ())
+                      if j < i and calls[j].end <= call.start}
+            writes = [j for tool, j in last_write.get(call.server, {}).items() if tool != call.tool]
+            for j in (*writes, last_failure.get((call.server, call.tool)),
+                      previous_thought if call.server == THINKING else None):
+                if j is not None and calls[j].end <= call.start:
+                    direct.add(j)
+            if call.server == THINKING:
+                previous_thought = i
+            if not call.ok:
+                last_failure[call.server, call.tool] = i
+            elif call.tool in WRITES:
+                last_write.setdefault(call.server, {})[call.tool] = i
+            self.depends.append(direct)
+            bits = 0
+            for j in direct:
+                bits |= ancestors[j] | (1 << j)
+            ancestors.append(bits)
+
+        # Longest chain of dependent calls, by time spent in the calls themselves
+        chain, via = [], []
+        for i, call in enumerate(calls):
+            best = max(self.depends[i], key=chain.__getitem__, default=None)
+            chain.append(call.end - call.start + (chain[best] if best is not None else 0.0))
+            via.append(best)
+        last = max(range(len(calls)), key=chain.__getitem__, default=None)
+        self.critical = chain[last] if last is not None else 0.0
+        self.critical_path = []
+        while last is not None:
+            self.critical_path.append(calls[last])
+            last = via[last]
+        self.critical_path.reverse()
+
+        self.opportunities = self.overlapped = 0
+        in_flight = []  # (end, index) of earlier work calls
+        previous = None
+        for i, call in enumerate(calls):
+            if not call.ok or call.server == THINKING:
+                continue
+            while in_flight and in_flight[0][0] <= call.start:
+                heapq.heappop(in_flight)
+            overlapped = any(not ancestors[i] >> j & 1 for _, j in in_flight)
+            ready = max((calls[j].end for j in self.depends[i]), default=calls[0].start)
+            if overlapped or (previous is not None and ready <= calls[previous].start):
+                self.opportunities += 1
+                self.overlapped += overlapped
+            heapq.heappush(in_flight, (call.end, i))
+            previous = i
+
+    @property
+    def wall(self):
+        """Seconds from the first call's start to the last call's end."""
+        if not self.calls:
+            return 0.0
+        return max(call.end for call in self.calls) - self.calls[0].start
+
+    @property
+    def in_flight(self):
+        """Seconds during which at least one call was running."""
+        total, start, end = 0.0, None, None
+        for call in self.calls:
+            if end is None or call.start > end:
+                if end is not None:
+                    total += end - start
+                start, end = call.start, call.end
+            else:
+                end = max(end, call.end)
+        return total + (end - start if end is not None else 0.0)
+
+
+# ---------------------------------------------------------------- setup
+
+def init(directory, repo=None):
+    """Point directory's .mcp.json at the stand-ins; returns the servers' config."""
+    root = Path(directory).resolve()
+    if repo is None:
+        repo = root / "fixture" / "repo.json"
+        repo = repo if repo.is_file() else DEFAULT_REPO
+    config_path = root / ".mcp.json"
+    try:
+        config = json.loads(config_path.read_text())
+    except (OSError, ValueError):
+        config = {}
+    servers = config.setdefault("mcpServers", {})
+    for name in SERVERS:
+        args = ["-m", "grading.mcpstub", "serve", name, "--root", str(root)]
+        if name == "github":
+            args += ["--repo", str(Path(repo).resolve())]
+        servers[name] = {"command": sys.executable, "args": args, "env": {"PYTHONPATH": str(REPO_ROOT)}}
+    config_path.write_text(json.dumps(config, indent=2) + "\n")
+    return servers
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Offline stand-ins for the MCP Orchestra servers.")
+    sub = parser.add_subparsers(dest="command", required=True)
+    init_parser = sub.add_parser("init", help="Configure the stand-ins in a directory's .mcp.json")
+    init_parser.add_argument("directory", nargs="?", default=".", help="Working directory (default: .)")
+    init_parser.add_argument("--repo", help="Repository fixture for GitHub (default: fixture/repo.json)")
+    serve_parser = sub.add_parser("serve", help="Run one stand-in on stdio")
+    serve_parser.add_argument("server", choices=SERVERS)
+    serve_parser.add_argument("--root", default=".", help="Directory for the call log and state (default: .)")
+    serve_parser.add_argument("--repo", default=str(DEFAULT_REPO), help="Repository fixture for GitHub")
+    serve_parser.add_argument("--latency", type=float, help="Seconds before each answer")
+    serve_parser.add_argument("--fail-once", default=FAIL_ONCE,
+                              help=f"GitHub tool whose first call fails (default: {FAIL_ONCE}; '' for none)")
+    args = parser.parse_args(argv)
+
+    if args.command == "init":
+        init(args.directory, args.repo)
+        root = Path(args.directory).resolve()
+        print(f"Configured {', '.join(SERVERS)} in {root / '.mcp.json'}")
+        print(f"Start claude in {root} and approve the project servers; calls are logged to {root / LOG}")
+        return 0
+
+    root = Path(args.root).resolve()
+    server = standin(args.server, root, args.repo, args.fail_once or None)
+    latency = LATENCY[args.server] if args.latency is None else args.latency
+    serve(server, CallLog(root / LOG), latency)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,18 @@
+"""
+Grader Preload
+Importing this module imports and warms every grader in the repository (see
+grading.batch.prewarm). The batch runner's forkserver preloads it, so every
+worker forked from it starts with the graders, their compiled patterns and
+their starter indexes already in memory.
+"""
+
+import warnings
+
+from grading.batch import discover_graders, load_grader, prewarm
+
+# Workers of `python -m grading.batch` re-run it as __mp_main__ after this has
+# imported it, which is harmless: it only defines functions
+warnings.filterwarnings("ignore", r"'grading\.batch' found in sys\.modules", RuntimeWarning)
+
+GRADERS = {key: load_grader(key, path) for key, path in discover_graders().items()}
+prewarm(GRADERS)
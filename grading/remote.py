@@ -0,0 +1,191 @@
+"""
+Offline Remotes
+Lets PR workflows be practised and graded without a network.
+
+A stand-in origin is a bare repository kept inside the participant's own git
+directory, together with a `gh` shim (see grading.ghstub) that records pull
+requests in a JSON store next to it:
+
+    python -m grading.remote init starter/
+    export PATH="starter/.git/grading-bin:$PATH"   # as printed by init
+    git push -u origin feat/x && gh pr create --title ... --body ...
+
+When grading, ls_remote_heads() answers `git ls-remote --heads` for a local
+remote by reading its refs directly. For a network remote it keeps the
+listing in the grading cache, keyed by the remote URL and the submission's
+remote-tracking refs. Regrading then costs a file read, and a new push
+(which moves those refs) fetches a fresh listing.
+"""
+
+import argparse
+import fnmatch
+import hashlib
+import json
+import os
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+
+from grading import aio
+from grading.cache import DEFAULT_CACHE_DIR
+from grading.gitrepo import GitRepo
+
+# Directory names inside the participant's git directory
+STANDIN = "grading-origin.git"
+BIN_DIR = "grading-bin"
+# Pull requests recorded by the gh shim, inside the stand-in remote
+PR_STORE = "pull_requests.json"
+
+LISTING_DIR = DEFAULT_CACHE_DIR / "remotes"
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+
+
+def local_remote(repo, url):
+    """Path of the bare repository a local remote URL points at, or None for network URLs.
+
+    A stand-in whose submission was moved since init still resolves to the
+    copy inside the submission's git directory.
+    """
+    if not url:
+        return None
+    if url.startswith("file://"):
+        url = url[len("file://"):]
+    elif "://" in url or (":" in url.split("/", 1)[0] and not Path(url).exists()):
+        return None  # http(s)://, ssh://, git:// or scp-like user@host:path
+    path = Path(url)
+    if not path.is_absolute():
+        path = repo.work_tree / path
+    if path.is_dir():
+        return path
+    moved = repo.common_dir / STANDIN
+    if path.name == STANDIN and moved.is_dir():
+        return moved
+    return None
+
+
+def _matches(name, pattern):
+    """Whether a ref matches an ls-remote pattern (matched on trailing path components)."""
+    parts = name.split("/")
+    return any(fnmatch.fnmatchcase("/".join(parts[i:]), pattern) for i in range(len(parts)))
+
+
+def _listing(refs, pattern):
+    return "\n".join(f"{sha}\t{name}" for name, sha in refs.items()
+                     if not pattern or _matches(name, pattern))
+
+
+def _query(repo, remote, pattern):
+    """(git args, cache file) of a network listing, or None when the remote is local or unknown."""
+    url = repo.remotes().get(remote)
+    if url is None or local_remote(repo, url) is not None:
+        return None
+    tracking = repo.refs(f"refs/remotes/{remote}/")
+    key = hashlib.sha256(json.dumps(
+        [str(repo.common_dir.resolve()), url, pattern, tracking]).encode()).hexdigest()
+    return ["ls-remote", "--heads", remote, pattern], LISTING_DIR / f"{key}.json"
+
+
+def _read_listing(path):
+    try:
+        return json.loads(path.read_text())
+    except (OSError, ValueError):
+        return None
+
+
+def _store_listing(path, output):
+    """Keep a successful listing; an unwritable cache only costs another round trip."""
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+        with os.fdopen(fd, "w") as f:
+            json.dump(output, f)
+        os.replace(tmp, path)
+    except OSError:
+        pass
+
+
+def ls_remote_heads(repo, remote, pattern):
+    """(output, returncode) of `git ls-remote --heads <remote> <pattern>` in repo."""
+    url = repo.remotes().get(remote)
+    standin = local_remote(repo, url)
+    if standin is not None:
+        return _listing(GitRepo(standin).refs("refs/heads/"), pattern), 0
+
+    query = _query(repo, remote, pattern)
+    if query is None:
+        return aio.run_git(["ls-remote", "--heads", remote, pattern], repo.work_tree)
+    args, path = query
+    cached = _read_listing(path)
+    if cached is not None:
+        return cached, 0
+    output, code = aio.run_git(args, repo.work_tree)
+    if code == 0:
+        _store_listing(path, output)
+    return output, code
+
+
+async def prefetch_heads(repo, remote, pattern):
+    """Fetch a network listing without blocking the loop, for ls_remote_heads() to reuse."""
+    query = _query(repo, remote, pattern)
+    if query is None or _read_listing(query[1]) is not None:
+        return
+    output, code = await aio.run_git_async(query[0], repo.work_tree)
+    if code == 0:
+        _store_listing(query[1], output)
+
+
+def pull_requests(repo, remote="origin"):
+    """Pull requests the gh shim recorded on a local remote, oldest first."""
+    standin = local_remote(repo, repo.remotes().get(remote))
+    if standin is None:
+        return []
+    try:
+        return json.loads((standin / PR_STORE).read_text())
+    except (OSError, ValueError):
+        return []
+
+
+def init(path, replace=False):
+    """Give the repository at path a stand-in origin and a gh shim; return the shim directory."""
+    repo = GitRepo.discover(path)
+    if repo is None:
+        raise SystemExit(f"{path} is not inside a git repository")
+    if "origin" in repo.remotes() and not replace:
+        raise SystemExit("origin is already configured (pass --replace to point it at the stand-in)")
+
+    standin = (repo.common_dir / STANDIN).resolve()
+    if not standin.exists():
+        subprocess.run(["git", "init", "--quiet", "--bare", str(standin)], check=True)
+    verb = "set-url" if "origin" in repo.remotes() else "add"
+    subprocess.run(["git", "remote", verb, "origin", str(standin)], cwd=repo.work_tree, check=True)
+
+    bin_dir = repo.common_dir.resolve() / BIN_DIR
+    bin_dir.mkdir(exist_ok=True)
+    shim = bin_dir / "gh"
+    shim.write_text(
+        "#!/bin/sh\n"
+        f'PYTHONPATH="{REPO_ROOT}${{PYTHONPATH:+:$PYTHONPATH}}" '
+        f'exec "{sys.executable}" -m grading.ghstub "$@"\n'
+    )
+    shim.chmod(0o755)
+    return bin_dir
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Set up an offline stand-in for origin.")
+    sub = parser.add_subparsers(dest="command", required=True)
+    init_parser = sub.add_parser("init", help="Create the stand-in origin and gh shim for a repository")
+    init_parser.add_argument("repo", nargs="?", default=".", help="Repository directory (default: .)")
+    init_parser.add_argument("--replace", action="store_true", help="Repoint an existing origin")
+    args = parser.parse_args(argv)
+
+    bin_dir = init(args.repo, replace=args.replace)
+    print(f'origin now points at a local stand-in. Put the gh shim first on PATH:\n'
+          f'    export PATH="{bin_dir}:$PATH"')
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
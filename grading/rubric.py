@@ -0,0 +1,335 @@
+"""
+Rubric Engine
+Declares the text checks a grader runs against each file as data, compiles
+them into one combined pattern per file (plus one keyword set for the
+case-insensitive literals) and evaluates them all with a single read.
+
+    RUBRIC = Rubric({
+        "debug_report.md": [
+            keywords("floating", "precision", ignore_case=True),
+            keywords("## Root Cause"),
+            section("Prevention"),
+        ],
+        "starter/src/cart/discount.ts": [regex(r"\\.toFixed\\(2\\)")],
+    })
+
+    facts = RUBRIC.file(root, "debug_report.md")
+    facts.exists, facts.contains("## Root Cause"), facts.search(r"\\.toFixed\\(2\\)")
+
+Files are streamed in chunks rather than read whole: memory stays bounded
+whatever their size, reading stops as soon as every check on the file has
+its final result, and nothing past GRADING_MAX_INPUT_BYTES (default 64 MiB)
+is read at all; facts.truncated tells when that cap cut a file short.
+
+Results are memoized per file on (size, mtime), so every check in a grader
+can ask for the same file's facts without re-reading it, including checks
+running concurrently: the first one scans and the others wait for it.
+"""
+
+import os
+import re
+import threading
+from collections import namedtuple
+from concurrent.futures import Future
+from pathlib import Path
+
+from grading.keywords import KeywordSet
+
+DEFAULT_MAX_INPUT_BYTES = int(os.environ.get("GRADING_MAX_INPUT_BYTES", 64 * 1024 * 1024))
+
+# Characters read per step
+CHUNK_SIZE = 1024 * 1024
+# Text every match start is decided with: a match is only accepted once this
+# much follows it (or the file has ended), so patterns whose matches fit in
+# it give exactly the results of a whole-file re.search
+OVERLAP = 64 * 1024
+# Text kept before the scan position so ^, \b and lookbehinds see context
+BEHIND = 256
+# Leading characters kept for previews
+HEAD_SIZE = 1024
+
+Spec = namedtuple("Spec", "kind key pattern count")
+
+Hit = namedtuple("Hit", "start end groups")
+Hit.group = lambda self, n=0: self.groups[n]
+
+
+def keywords(*words, ignore_case=False):
+    """Literal substrings, like `word in text` (or `word in text.lower()`)."""
+    return [Spec("literal", (word, ignore_case), None, False) for word in words]
+
+
+def regex(*patterns, flags=0):
+    """Regular expressions, like re.search(pattern, text, flags)."""
+    return [Spec("regex", (pattern, flags), _scoped(pattern, flags), False)
+            for pattern in patterns]
+
+
+def count(*patterns, flags=0):
+    """Regular expressions whose non-overlapping matches are counted, like len(re.findall(...))."""
+    return [Spec("count", (pattern, flags), _scoped(pattern, flags), True)
+            for pattern in patterns]
+
+
+def section(*titles):
+    """Markdown headings (any level) with the given titles."""
+    return [Spec("section", title, rf"(?m:^#{{1,6}}[ \t]+{re.escape(title)}[ \t]*$)", False)
+            for title in titles]
+
+
+def _scoped(pattern, flags):
+    letters = "".join(letter for flag, letter in ((re.IGNORECASE, "i"), (re.MULTILINE, "m"),
+                                                  (re.DOTALL, "s"), (re.VERBOSE, "x"))
+                      if flags & flag)
+    return f"(?{letters}:{pattern})" if letters else f"(?:{pattern})"
+
+
+class FileFacts:
+    """Everything the rubric declared for one file, computed from one scan."""
+
+    def __init__(self, declared, exists, found=None, counts=None, size=0,
+                 head="", truncated=False):
+        self.exists = exists
+        self.size = size
+        self.head = head
+        self.truncated = truncated
+        self._declared = declared
+        self._found = found or {}
+        self._counts = counts or {}
+
+    def _lookup(self, kind, key):
+        if (kind, key) not in self._declared:
+            raise KeyError(f"{kind} {key!r} was not declared in the rubric")
+        return self._found.get((kind, key))
+
+    def contains(self, word, ignore_case=False):
+        """Whether a declared literal occurs in the file."""
+        return self._lookup("literal", (word, ignore_case)) is not None
+
+    def search(self, pattern, flags=0):
+        """First match of a declared regex (a Hit with .group()), or None."""
+        return self._lookup("regex", (pattern, flags))
+
+    def has_section(self, title):
+        """Whether a declared markdown heading is present."""
+        return self._lookup("section", title) is not None
+
+    def count(self, pattern, flags=0):
+        """Number of non-overlapping matches of a declared counted regex."""
+        if ("count", (pattern, flags)) not in self._declared:
+            raise KeyError(f"count {pattern!r} was not declared in the rubric")
+        return self._counts.get(("count", (pattern, flags)), 0)
+
+    def count_present(self, words, ignore_case=False):
+        """How many of the declared literals occur at least once."""
+        return sum(1 for word in words if self.contains(word, ignore_case))
+
+
+class _Reader:
+    """Chunks of a text file, up to a byte cap."""
+
+    def __init__(self, f, max_bytes):
+        self.f = f
+        self.max_bytes = max_bytes
+        self.head = ""
+        self.truncated = False
+
+    def __iter__(self):
+        while True:
+            chunk = self.f.read(CHUNK_SIZE)
+            if not chunk:
+                return
+            if len(self.head) < HEAD_SIZE:
+                self.head += chunk[:HEAD_SIZE - len(self.head)]
+            yield chunk
+            if self.max_bytes and self.f.buffer.tell() >= self.max_bytes:
+                self.truncated = bool(self.f.read(1))
+                return
+
+
+class _CompiledFile:
+    """All specs for one file folded into a single alternation.
+
+    Case-sensitive literals are merged into one keyword trie (see
+    grading.keywords) that is an alternative next to the regexes;
+    case-insensitive literals are scanned by their own KeywordSet, which
+    lowercases the text a window at a time.
+    """
+
+    # Distinct pending-spec subsets whose scanners are kept per file
+    SCANNER_CACHE_SIZE = 256
+
+    def __init__(self, specs):
+        self.specs = list({(s.kind, s.key): s for s in specs}.values())
+        self.declared = frozenset((s.kind, s.key) for s in self.specs)
+        self.compiled = [s.pattern and re.compile(s.pattern) for s in self.specs]
+        self.literals = {s.key: i for i, s in enumerate(self.specs) if s.kind == "literal"}
+        self.exact = KeywordSet([word for word, ic in self.literals if not ic], ignore_case=False)
+        self.folded = KeywordSet([word for word, ic in self.literals if ic])
+        self._scanners = {}
+
+    def _scanner(self, pending):
+        """Combined pattern and keyword sets for the specs still pending."""
+        scanner = self._scanners.get(pending)
+        if scanner is None:
+            if len(self._scanners) >= self.SCANNER_CACHE_SIZE:
+                self._scanners.clear()
+            words = [self.specs[i].key[0] for i in pending if self.specs[i].kind == "literal"]
+            exact = self.exact.subset(words) if words else None
+            alternatives = [exact.source] if exact else []
+            alternatives += [self.specs[i].pattern for i in sorted(pending)
+                             if self.specs[i].kind != "literal"]
+            scanner = self._scanners[pending] = (re.compile("|".join(alternatives)), exact)
+        return scanner
+
+    def _initial(self):
+        """Specs the combined pattern looks for when a scan starts."""
+        return frozenset(i for i, s in enumerate(self.specs)
+                         if s.kind != "literal" or not s.key[1])
+
+    def warm(self):
+        """Compile the scanner every scan starts with."""
+        pending = self._initial()
+        if pending:
+            self._scanner(pending)
+
+    def scan(self, chunks):
+        """Evaluate every spec over the text arriving as chunks.
+
+        Case-insensitive literals come from their keyword set. For everything
+        else, one left-to-right pass: the combined pattern finds the next
+        position where at least one pending spec matches; every pending spec
+        is then tried at that position, so each spec sees exactly the first
+        match re.search would return (and counted specs the same
+        non-overlapping matches re.findall would). Specs drop out of the
+        alternation as soon as they are found, and no more chunks are pulled
+        once nothing is left to find.
+        """
+        found, counts = {}, {}
+        folded = self.folded
+        pending = self._initial()
+        counting = {i for i in pending if self.specs[i].count}
+        next_allowed = dict.fromkeys(counting, 0)
+        for i in counting:
+            counts[self.specs[i].kind, self.specs[i].key] = 0
+
+        chunks = iter(chunks)
+        buffer, base, pos = "", 0, 0
+        final = False
+        while (pending or folded.words) and not final:
+            chunk = next(chunks, None)
+            if chunk is None:
+                final = True
+            else:
+                buffer += chunk
+            limit = len(buffer) if final else len(buffer) - OVERLAP
+            if limit <= pos and not final:
+                continue
+
+            if folded.words:
+                for word in folded.present(buffer[pos:limit + folded.longest - 1]):
+                    found["literal", (word, True)] = True
+                folded = self.folded.subset(w for w in folded.words
+                                            if ("literal", (w, True)) not in found)
+
+            while pending and pos <= len(buffer):
+                pattern, exact = self._scanner(pending)
+                hit = pattern.search(buffer, pos)
+                if hit is None or (hit.start() >= limit and not final):
+                    pos = max(pos, limit)
+                    break
+                pos = hit.start()
+                done = set()
+                for word in exact.starting_at(buffer, pos) if exact else ():
+                    found["literal", (word, False)] = True
+                    done.add(self.literals[word, False])
+                for i in pending:
+                    if self.specs[i].kind == "literal":
+                        continue
+                    if i in counting and base + pos < next_allowed[i]:
+                        continue
+                    match = self.compiled[i].match(buffer, pos)
+                    if match is None:
+                        continue
+                    spec = self.specs[i]
+                    if i in counting:
+                        counts[spec.kind, spec.key] += 1
+                        end = match.end() if match.end() > pos else pos + 1
+                        next_allowed[i] = base + end
+                    else:
+                        found[spec.kind, spec.key] = Hit(base + match.start(), base + match.end(),
+                                                         (match.group(0),) + match.groups())
+                        done.add(i)
+                pending -= done
+                pos += 1
+            else:
+                pos = max(pos, limit)
+
+            keep = max(0, pos - BEHIND)
+            buffer, base, pos = buffer[keep:], base + keep, pos - keep
+
+        return found, counts
+
+
+class Rubric:
+    """Per-file declarative checks, compiled once and evaluated lazily per submission."""
+
+    def __init__(self, files, cache_size=256, max_bytes=None):
+        self.files = {
+            path: _CompiledFile(spec for group in groups for spec in group)
+            for path, groups in files.items()
+        }
+        self.cache_size = cache_size
+        self.max_bytes = DEFAULT_MAX_INPUT_BYTES if max_bytes is None else max_bytes
+        self._cache = {}
+        self._scanning = {}
+        self._lock = threading.Lock()
+
+    def warm(self):
+        """Compile every file's combined pattern now rather than on its first scan."""
+        for compiled in self.files.values():
+            compiled.warm()
+
+    def file(self, root, path):
+        """Facts for one declared file of the submission at root."""
+        compiled = self.files[path]
+        full = Path(root) / path
+        try:
+            stat = full.stat()
+        except OSError:
+            return FileFacts(compiled.declared, False)
+        if not full.is_file():
+            return FileFacts(compiled.declared, False)
+
+        key = (str(full.resolve()), stat.st_size, stat.st_mtime_ns, stat.st_ino, self.max_bytes)
+        with self._lock:
+            facts = self._cache.get(key)
+            scanning = self._scanning.get(key) if facts is None else None
+            if facts is None and scanning is None:
+                self._scanning[key] = owned = Future()
+        if facts is not None:
+            return facts
+        if scanning is not None:
+            return scanning.result()
+
+        try:
+            with open(full) as f:
+                reader = _Reader(f, self.max_bytes)
+                found, counts = compiled.scan(reader)
+                if len(reader.head) < HEAD_SIZE and not reader.truncated:
+                    # Checks may have settled before the preview was read
+                    reader.head += f.read(HEAD_SIZE - len(reader.head))
+            facts = FileFacts(compiled.declared, True, found, counts, stat.st_size,
+                              reader.head, reader.truncated)
+        except BaseException as e:
+            owned.set_exception(e)
+            raise
+        finally:
+            with self._lock:
+                del self._scanning[key]
+                if facts is not None:
+                    if len(self._cache) >= self.cache_size:
+                        self._cache.pop(next(iter(self._cache)))
+                    self._cache[key] = facts
+        owned.set_result(facts)
+        return facts
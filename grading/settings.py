@@ -0,0 +1,377 @@
+"""
+Settings Hierarchy
+Resolves a Claude Code configuration fixture into its effective settings,
+and generates randomized fixtures with a known misconfiguration.
+
+A fixture lays out both ends of the hierarchy:
+
+    fixture/home/.claude/settings.json         user settings
+    fixture/home/.claude/CLAUDE.md
+    fixture/project/.claude/settings.json      shared project settings
+    fixture/project/.claude/settings.local.json
+    fixture/project/.claude/commands/*.md      custom slash commands
+    fixture/project/.mcp.json                  project MCP servers
+    fixture/project/CLAUDE.md
+
+Layers apply user < project < local: objects merge key by key, lists are
+combined (permissions, hook entries) and any other value is overridden.
+resolve() also diagnoses the three problems the Config Detective scenario
+asks about (GitHub MCP server, custom slash commands, auto-formatting hook)
+from the files alone, so any fixture can be graded, generated or hand-made.
+
+Resolutions are memoized on the fixture's file stats and shared between
+fixtures with the same content hash, so hundreds of participants on a few
+dozen variants cost a few dozen resolutions.
+
+    python -m grading.settings fixture DEST [--seed N]   # one variant per seed
+    python -m grading.settings resolve DIR              # print the effective configuration
+"""
+
+import argparse
+import functools
+import hashlib
+import json
+import os
+import random
+import re
+import sys
+import threading
+from pathlib import Path
+
+USER_SETTINGS = "home/.claude/settings.json"
+PROJECT_SETTINGS = "project/.claude/settings.json"
+LOCAL_SETTINGS = "project/.claude/settings.local.json"
+PROJECT_MCP = "project/.mcp.json"
+COMMANDS_DIR = "project/.claude/commands"
+LAYERS = (("user", USER_SETTINGS), ("project", PROJECT_SETTINGS), ("local", LOCAL_SETTINGS))
+CLAUDE_MD = {"user": "home/.claude/CLAUDE.md", "project": "project/CLAUDE.md",
+             "local": "project/.claude/CLAUDE.md"}
+
+HOOK_EVENTS = ("PreToolUse", "PostToolUse", "Stop")
+# Tools whose edits an auto-format hook has to follow
+EDIT_TOOLS = ("Edit", "Write")
+FORMATTER = re.compile(r"prettier|format|eslint\s+--fix|black|gofmt", re.I)
+ENV_REFERENCE = re.compile(r"\$\{(\w+)\}")
+PLACEHOLDER_VALUE = re.compile(r"^$|^<.*>$|^your[-_]", re.I)
+SCRIPT_PATH = re.compile(r"(?:\$CLAUDE_PROJECT_DIR/|\./)([\w./-]+)")
+# Server entries of an .mcp.json that does not parse, as /mcp still lists them
+SERVER_ENTRY = re.compile(r'"([\w.-]+)"\s*:\s*\{\s*"(?:command|url|type)"')
+
+# Resolutions kept in memory, by fixture content hash
+MAX_RESOLVED = 1024
+
+_resolved = {}
+_resolved_lock = threading.Lock()
+
+
+def merge(base, override):
+    """Settings layer override applied over base (neither is modified)."""
+    if isinstance(base, dict) and isinstance(override, dict):
+        merged = dict(base)
+        for key, value in override.items():
+            merged[key] = merge(base[key], value) if key in base else value
+        return merged
+    if isinstance(base, list) and isinstance(override, list):
+        seen = {json.dumps(item, sort_keys=True) for item in base}
+        return base + [item for item in override if json.dumps(item, sort_keys=True) not in seen]
+    return override
+
+
+def _read_json(path, errors, name):
+    try:
+        data = json.loads(path.read_text())
+    except FileNotFoundError:
+        return {}
+    except (OSError, ValueError) as e:
+        errors[name] = str(e)
+        return {}
+    if not isinstance(data, dict):
+        errors[name] = "not a JSON object"
+        return {}
+    return data
+
+
+def _matches(matcher, tool):
+    if matcher in (None, "", "*"):
+        return True
+    try:
+        return re.fullmatch(matcher, tool) is not None
+    except re.error:
+        return matcher == tool
+
+
+def _hook_commands(settings):
+    """{event: [(matcher, command)]} of the effective command hooks."""
+    hooks = {}
+    configured = settings.get("hooks")
+    for event, entries in (configured.items() if isinstance(configured, dict) else ()):
+        for entry in entries if isinstance(entries, list) else ():
+            if not isinstance(entry, dict):
+                continue
+            for hook in entry.get("hooks") or ():
+                if isinstance(hook, dict) and hook.get("command"):
+                    hooks.setdefault(event, []).append((entry.get("matcher"), hook["command"]))
+    return hooks
+
+
+def _mcp_servers(fixture, settings, errors):
+    """{name: {"scope", "status", "problem"}} for every configured MCP server."""
+    servers = {}
+    for name, config in (settings.get("mcpServers") or {}).items():
+        servers[name] = ("user", config)
+    project = _read_json(fixture / PROJECT_MCP, errors, PROJECT_MCP)
+    for name, config in (project.get("mcpServers") or {}).items():
+        servers[name] = ("project", config)
+    broken = set()
+    if PROJECT_MCP in errors:
+        broken = set(SERVER_ENTRY.findall((fixture / PROJECT_MCP).read_text(errors="replace")))
+        servers.update((name, ("project", None)) for name in broken)
+
+    env = settings.get("env") or {}
+    disabled = set(settings.get("disabledMcpjsonServers") or ())
+    enabled = set(settings.get("enabledMcpjsonServers") or ())
+    approve_all = settings.get("enableAllProjectMcpServers") is True
+
+    resolved = {}
+    for name, (scope, config) in sorted(servers.items()):
+        config = config if isinstance(config, dict) else {}
+        problem = None
+        if name in broken:
+            problem = "invalid_json"
+        elif scope == "project" and name in disabled:
+            problem = "disabled"
+        elif scope == "project" and not approve_all and name not in enabled:
+            problem = "not_approved"
+        else:
+            for value in (config.get("env") or {}).values():
+                referenced = ENV_REFERENCE.findall(str(value))
+                if PLACEHOLDER_VALUE.match(str(value)) or any(
+                        PLACEHOLDER_VALUE.match(str(env.get(var, ""))) for var in referenced):
+                    problem = "missing_token"
+        resolved[name] = {"scope": scope, "status": "failed" if problem else "running", "problem": problem}
+    return resolved
+
+
+def _diagnose_github(servers, errors):
+    github = next((server for name, server in servers.items() if name.lower() == "github"), None)
+    if github is None and PROJECT_MCP in errors:
+        return "invalid_json"
+    if github is None:
+        return "missing_server"
+    return github["problem"]
+
+
+def _diagnose_commands(fixture):
+    commands = fixture / COMMANDS_DIR
+    if commands.is_dir():
+        files = [p for p in commands.rglob("*") if p.is_file()]
+        if files and not any(p.suffix == ".md" for p in files):
+            return "wrong_extension"
+        return None if files else "missing"
+    for misplaced in ("project/.claude/command", "project/commands", "project/.commands", "home/.claude/command"):
+        if (fixture / misplaced).is_dir():
+            return "wrong_location"
+    return "missing"
+
+
+def _diagnose_format(fixture, settings, hooks):
+    formatters = [(event, matcher, command) for event, entries in hooks.items()
+                  for matcher, command in entries if FORMATTER.search(command)]
+    if not formatters:
+        return "missing_hook"
+    if settings.get("disableAllHooks") is True:
+        return "hooks_disabled"
+    after_edits = [(matcher, command) for event, matcher, command in formatters if event == "PostToolUse"]
+    if not after_edits:
+        return "wrong_event"
+    if not any(all(_matches(matcher, tool) for tool in EDIT_TOOLS) for matcher, _ in after_edits):
+        return "wrong_matcher"
+    for _, command in after_edits:
+        script = SCRIPT_PATH.search(command)
+        if script and not (fixture / "project" / script.group(1)).exists():
+            return "missing_script"
+    return None
+
+
+def _resolve(fixture):
+    errors = {}
+    settings, sources = {}, {}
+    for layer, path in LAYERS:
+        data = _read_json(fixture / path, errors, path)
+        settings = merge(settings, data)
+        sources.update(dict.fromkeys(data, layer))
+
+    hooks = _hook_commands(settings)
+    servers = _mcp_servers(fixture, settings, errors)
+    return {
+        "settings": settings,
+        "sources": sources,
+        "errors": errors,
+        "hooks": {event: [{"matcher": m, "command": c} for m, c in entries] for event, entries in hooks.items()},
+        "mcp_servers": servers,
+        "claude_md": {scope: (fixture / path).is_file() for scope, path in CLAUDE_MD.items()},
+        "problems": {
+            "github_mcp": _diagnose_github(servers, errors),
+            "slash_commands": _diagnose_commands(fixture),
+            "auto_format": _diagnose_format(fixture, settings, hooks),
+        },
+    }
+
+
+def _fixture_files(fixture):
+    found = []
+    for directory, dirs, names in os.walk(fixture):
+        dirs.sort()
+        for name in names:
+            found.append(os.path.relpath(os.path.join(directory, name), fixture))
+    return sorted(found)
+
+
+@functools.lru_cache(maxsize=256)
+def _load(fixture, stats):
+    digest = hashlib.sha256()
+    for path, _, _ in stats:
+        digest.update(path.encode() + b"\0" + hashlib.sha256(Path(fixture, path).read_bytes()).digest())
+    key = digest.hexdigest()
+    with _resolved_lock:
+        cached = _resolved.get(key)
+    if cached is None:
+        cached = _resolve(Path(fixture))
+        with _resolved_lock:
+            if len(_resolved) >= MAX_RESOLVED:
+                _resolved.clear()
+            _resolved[key] = cached
+    return cached
+
+
+def resolve(fixture):
+    """Effective configuration and diagnosed problems of a fixture directory (treat as read-only).
+
+    Returns {"settings", "sources", "errors", "hooks", "mcp_servers",
+    "claude_md", "problems"}; problems maps "github_mcp", "slash_commands"
+    and "auto_format" to a cause (e.g. "missing_token"), or None.
+    """
+    fixture = Path(fixture).resolve()
+    stats = []
+    for path in _fixture_files(fixture):
+        st = os.stat(fixture / path)
+        stats.append((path, st.st_size, st.st_mtime_ns))
+    return _load(str(fixture), tuple(stats))
+
+
+# ---------------------------------------------------------------- fixtures
+
+GITHUB_PROBLEMS = ("missing_token", "disabled", "not_approved", "invalid_json")
+COMMAND_PROBLEMS = ("wrong_location", "wrong_extension")
+FORMAT_PROBLEMS = ("wrong_event", "wrong_matcher", "missing_script", "hooks_disabled")
+EXTRA_SERVERS = {
+    "postgres": {"command": "npx", "args": ["-y", "@modelcontextprotocol/server-postgres", "postgresql://localhost/app"]},
+    "sentry": {"command": "npx", "args": ["-y", "@sentry/mcp-server"]},
+    "puppeteer": {"command": "npx", "args": ["-y", "@modelcontextprotocol/server-puppeteer"]},
+}
+
+
+def _write_json(path, data):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps(data, indent=2) + "\n")
+
+
+def make_fixture(dest, seed=0, rng=None):
+    """Write a randomized fixture to dest: the same seed always gives the same variant."""
+    rng = rng or random.Random(seed)
+    dest = Path(dest)
+    github_problem = rng.choice(GITHUB_PROBLEMS)
+    command_problem = rng.choice(COMMAND_PROBLEMS)
+    format_problem = rng.choice(FORMAT_PROBLEMS)
+
+    user = {
+        "model": rng.choice(["sonnet", "opus", "haiku"]),
+        "theme": rng.choice(["dark", "light", "dark-daltonized", "light-daltonized"]),
+        "autoCompactEnabled": rng.choice([True, False]),
+        "permissions": {"allow": ["Bash(npm run lint)"]},
+        "env": {"GITHUB_PERSONAL_ACCESS_TOKEN": "" if github_problem == "missing_token" else "ghp_" + "x" * 36},
+    }
+    project = {"permissions": {"allow": ["Bash(npm test)"]}}
+    local = {}
+    if rng.random() < 0.3:
+        local["model"] = rng.choice(["sonnet", "opus", "haiku"])
+
+    servers = {
+        "github": {"command": "npx", "args": ["-y", "@modelcontextprotocol/server-github"],
+                   "env": {"GITHUB_PERSONAL_ACCESS_TOKEN": "${GITHUB_PERSONAL_ACCESS_TOKEN}"}},
+        "filesystem": {"command": "npx", "args": ["-y", "@modelcontextprotocol/server-filesystem", "."]},
+    }
+    for name in rng.sample(sorted(EXTRA_SERVERS), rng.randint(0, 2)):
+        servers[name] = EXTRA_SERVERS[name]
+    if github_problem == "not_approved":
+        project["enabledMcpjsonServers"] = sorted(set(servers) - {"github"})
+    else:
+        project["enabledMcpjsonServers"] = sorted(servers)
+        if github_problem == "disabled":
+            local["disabledMcpjsonServers"] = ["github"]
+    mcp = json.dumps({"mcpServers": servers}, indent=2) + "\n"
+    if github_problem == "invalid_json":
+        mcp = mcp.replace('"."\n', '".",\n', 1)  # a trailing comma
+    (dest / PROJECT_MCP).parent.mkdir(parents=True, exist_ok=True)
+    (dest / PROJECT_MCP).write_text(mcp)
+
+    hooks = {}
+    if rng.random() < 0.5:
+        hooks["PreToolUse"] = [{"matcher": "Bash", "hooks": [
+            {"type": "command", "command": "$CLAUDE_PROJECT_DIR/scripts/guard-bash.sh"}]}]
+    if rng.random() < 0.5:
+        hooks["Stop"] = [{"hooks": [{"type": "command", "command": "notify-send 'Claude is done'"}]}]
+    event = "PreToolUse" if format_problem == "wrong_event" else "PostToolUse"
+    matcher = "Bash" if format_problem == "wrong_matcher" else "Edit|MultiEdit|Write"
+    hooks.setdefault(event, []).append({"matcher": matcher, "hooks": [
+        {"type": "command", "command": "$CLAUDE_PROJECT_DIR/scripts/format.sh"}]})
+    project["hooks"] = hooks
+    if format_problem == "hooks_disabled":
+        local["disableAllHooks"] = True
+    scripts = dest / "project/scripts"
+    scripts.mkdir(parents=True, exist_ok=True)
+    (scripts / "guard-bash.sh").write_text("#!/bin/sh\nexit 0\n")
+    if format_problem != "missing_script":
+        (scripts / "format.sh").write_text("#!/bin/sh\nnpx prettier --write \"$CLAUDE_FILE_PATHS\"\n")
+
+    commands = {"review": "Review the staged changes for bugs.\n", "changelog": "Draft a changelog entry.\n"}
+    directory = "project/.claude/command" if command_problem == "wrong_location" else COMMANDS_DIR
+    suffix = ".txt" if command_problem == "wrong_extension" else ".md"
+    for name, text in commands.items():
+        (dest / directory).mkdir(parents=True, exist_ok=True)
+        (dest / directory / f"{name}{suffix}").write_text(text)
+
+    _write_json(dest / USER_SETTINGS, user)
+    _write_json(dest / PROJECT_SETTINGS, project)
+    if local:
+        _write_json(dest / LOCAL_SETTINGS, local)
+    if rng.random() < 0.7:
+        (dest / CLAUDE_MD["user"]).write_text("# Global instructions\n\nPrefer small, reviewed commits.\n")
+    if rng.random() < 0.5:
+        (dest / CLAUDE_MD["project"]).write_text("# Project\n\nTypeScript monorepo; run npm test before committing.\n")
+    return dest
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Generate or resolve Claude Code settings fixtures.")
+    sub = parser.add_subparsers(dest="command", required=True)
+    fixture_parser = sub.add_parser("fixture", help="Write a randomized fixture")
+    fixture_parser.add_argument("dest", help="Directory to create")
+    fixture_parser.add_argument("--seed", type=int, default=0, help="Variant to generate (default: 0)")
+    resolve_parser = sub.add_parser("resolve", help="Print a fixture's effective configuration")
+    resolve_parser.add_argument("fixture", nargs="?", default=".", help="Fixture directory (default: .)")
+    args = parser.parse_args(argv)
+
+    if args.command == "fixture":
+        if Path(args.dest).exists() and any(Path(args.dest).iterdir()):
+            print(f"{args.dest} is not empty", file=sys.stderr)
+            return 1
+        make_fixture(args.dest, args.seed)
+        print(f"Wrote fixture variant {args.seed} to {args.dest}")
+        return 0
+    print(json.dumps(resolve(args.fixture), indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
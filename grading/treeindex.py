@@ -0,0 +1,290 @@
+"""
+Starter Tree Index
+Inverted index of a starter code tree: for each search term, the files and
+line numbers where it occurs, where every symbol is defined, where given
+identifiers are referenced in code, strings and comments (see
+grading.identifiers), and each file's line count.
+
+Graders derive their expected answers from it instead of hardcoding them, so
+a starter can grow or vary per participant without touching the grader.
+Building reads each file once through mmap, and large trees are split across
+a process pool (GRADING_INDEX_WORKERS, default one per CPU). The result is
+stored on disk under the grading cache, keyed by the content hash of the tree
+and the term definitions, and memoized in-process on file stats, so every
+submission graded against the same starter shares one build.
+
+    index = index_tree("starter", {"todo": r"TODO", "log": r"console\\.log"}, (".ts",),
+                       symbols=r"function\\s+(\\w+)")
+    index.files_with("todo"), index.count("log"), index.definitions("calculateTotal")
+
+    index = index_tree("starter", extensions=(".ts",), identifiers=("getUserData",))
+    index.references("getUserData", context="code", role="call")
+"""
+
+import bisect
+import contextlib
+import functools
+import hashlib
+import json
+import mmap
+import multiprocessing
+import os
+import re
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+from grading import identifiers as _identifiers
+from grading import variants
+from grading.cache import DEFAULT_CACHE_DIR
+
+# Bump when the stored format or matching rules change
+INDEX_VERSION = 3
+
+INDEX_DIR = DEFAULT_CACHE_DIR / "index"
+
+SKIP_DIRS = {".git", "node_modules", "__pycache__"}
+
+NEWLINE = re.compile(rb"\n")
+
+# Trees with at least this many files are scanned on a process pool
+PARALLEL_MIN_FILES = 200
+INDEX_WORKERS = int(os.environ.get("GRADING_INDEX_WORKERS", os.cpu_count() or 1))
+
+
+class TreeIndex:
+    """Term postings, symbol definitions, identifier references and line counts for the files of one tree."""
+
+    def __init__(self, files, postings, symbols, identifiers=None):
+        self.files = files
+        self.postings = postings
+        self.symbols = symbols
+        self.identifiers = identifiers or {}
+
+    def line_count(self, path):
+        """Number of lines in a file, counted like wc -l plus an unterminated last line."""
+        return self.files[path]["lines"]
+
+    def occurrences(self, term):
+        """Every (path, line) where term matches, in path and line order."""
+        return [(path, line) for path, lines in sorted(self.postings[term].items())
+                for line in lines]
+
+    def files_with(self, term):
+        """Sorted paths of the files where term matches at least once."""
+        return sorted(self.postings[term])
+
+    def count(self, term):
+        """Total number of matches of term across the tree."""
+        return sum(len(lines) for lines in self.postings[term].values())
+
+    def definitions(self, name):
+        """Every (path, line) where a symbol called name is defined."""
+        return [tuple(location) for location in self.symbols.get(name, ())]
+
+    def references(self, name, context=None, role=None):
+        """Every (path, line) where an indexed identifier occurs, optionally in one context or role.
+
+        context is "code", "string" or "comment"; role, for code, is
+        "import", "definition", "call" or "reference".
+        """
+        return [(path, line) for path, line, ref_context, ref_role in self.identifiers[name]
+                if context in (None, ref_context) and role in (None, ref_role)]
+
+    def to_json(self):
+        return {"files": self.files, "postings": self.postings, "symbols": self.symbols,
+                "identifiers": self.identifiers}
+
+    @classmethod
+    def from_json(cls, data):
+        return cls(data["files"], data["postings"], data["symbols"], data["identifiers"])
+
+
+def find_starter(grader, name="starter"):
+    """The tree the participant being graded is marked against, or None.
+
+    Only grader-side trees are used, never the submission's own copy, which
+    the participant can edit: the variant assigned to the participant (see
+    grading.variants), else the one shipped beside the grader.
+    """
+    variant = variants.assigned(grader)
+    if variant is None:
+        tree = Path(grader).resolve().parent / name
+    else:
+        tree = variants.variants_dir(grader) / variant / name
+    return tree if tree.is_dir() else None
+
+
+def _source_files(root, extensions):
+    """Sorted tree-relative posix paths of the files to index."""
+    # os.path rather than pathlib: starters run to tens of thousands of files
+    found = []
+    skip = len(str(root)) + 1
+    for directory, dirs, names in os.walk(root):
+        dirs[:] = sorted(d for d in dirs if d not in SKIP_DIRS)
+        relative = directory[skip:].replace(os.sep, "/")
+        for name in names:
+            if extensions is None or name.endswith(extensions):
+                found.append(f"{relative}/{name}" if relative else name)
+    return sorted(found)
+
+
+@contextlib.contextmanager
+def _mapped(path):
+    """A file's bytes, memory-mapped (empty files cannot be mapped)."""
+    with open(path, "rb") as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            yield b""
+            return
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as data:
+            yield data
+
+
+class _Lines:
+    """Maps offsets in a file's bytes to 1-based line numbers."""
+
+    def __init__(self, data):
+        self.data = data
+        self.newlines = None
+
+    def __call__(self, offset):
+        if self.newlines is None:
+            self.newlines = [m.start() for m in NEWLINE.finditer(self.data)]
+        return bisect.bisect_left(self.newlines, offset) + 1
+
+
+@functools.lru_cache(maxsize=16)
+def _compiled(terms, symbols):
+    """(term patterns, symbol pattern) compiled for byte scanning."""
+    patterns = {term: re.compile(pattern.encode()) for term, pattern in terms}
+    return patterns, symbols and re.compile(symbols.encode())
+
+
+def _scan(data, patterns):
+    """Lines (one entry per match) of every pattern in a file's bytes.
+
+    Each term gets its own finditer: re finds literal-prefixed patterns
+    faster alone than as alternatives of one combined pattern.
+    """
+    line_of = _Lines(data)
+    hits = {}
+    for term, pattern in patterns.items():
+        lines = [line_of(match.start()) for match in pattern.finditer(data)]
+        if lines:
+            hits[term] = lines
+    return hits, line_of
+
+
+def _line_count(data):
+    if not data:
+        return 0
+    lines = len(NEWLINE.findall(data))
+    return lines if data[-1:] == b"\n" else lines + 1
+
+
+def _scan_files(root, paths, terms, symbols, names=()):
+    """[(path, line count, term hits, definitions, identifier references)] for some files of a tree."""
+    patterns, symbols = _compiled(terms, symbols)
+    entries = []
+    for path in paths:
+        with _mapped(os.path.join(root, path)) as data:
+            hits, line_of = _scan(data, patterns)
+            definitions = [(match.group(1).decode("utf-8", "replace"), line_of(match.start(1)))
+                           for match in symbols.finditer(data)] if symbols else []
+            references = _identifiers.scan(data, names) if names else {}
+            entries.append((path, _line_count(data), hits, definitions, references))
+    return entries
+
+
+def _pool_context():
+    # Not fork: graders build indexes from threads (see grading.checks.run_checks)
+    method = "forkserver" if "forkserver" in multiprocessing.get_all_start_methods() else "spawn"
+    return multiprocessing.get_context(method)
+
+
+def _build(root, paths, terms, symbols, names):
+    if len(paths) >= PARALLEL_MIN_FILES and INDEX_WORKERS > 1:
+        size = -(-len(paths) // (INDEX_WORKERS * 4))
+        chunks = [paths[i:i + size] for i in range(0, len(paths), size)]
+        with ProcessPoolExecutor(INDEX_WORKERS, mp_context=_pool_context()) as pool:
+            scanned = pool.map(_scan_files, [str(root)] * len(chunks), chunks,
+                               [terms] * len(chunks), [symbols] * len(chunks),
+                               [names] * len(chunks))
+            entries = [entry for chunk in scanned for entry in chunk]
+    else:
+        entries = _scan_files(root, paths, terms, symbols, names)
+
+    files = {}
+    postings = {term: {} for term, _ in terms}
+    definitions = {}
+    references = {name: [] for name in names}
+    for path, lines, hits, found, referenced in entries:
+        files[path] = {"lines": lines}
+        for term, term_lines in hits.items():
+            postings[term][path] = term_lines
+        for name, line in found:
+            definitions.setdefault(name, []).append([path, line])
+        for name, refs in referenced.items():
+            references[name].extend([path, *ref] for ref in refs)
+    return TreeIndex(files, postings, definitions, references)
+
+
+def _digest(root, paths, terms, extensions, symbols, names):
+    """Content hash of the tree plus everything that shapes the index."""
+    digest = hashlib.sha256(json.dumps([INDEX_VERSION, terms, extensions, symbols, names]).encode())
+    for path in paths:
+        digest.update(path.encode() + b"\0")
+        with _mapped(os.path.join(root, path)) as data:
+            digest.update(hashlib.sha256(data).digest())
+    return digest.hexdigest()
+
+
+def _store(path, index):
+    """Write an index atomically; an unwritable cache only costs a rebuild."""
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+        with os.fdopen(fd, "w") as f:
+            json.dump(index.to_json(), f)
+        os.replace(tmp, path)
+    except OSError:
+        pass
+
+
+@functools.lru_cache(maxsize=64)
+def _load(root, stats, terms, extensions, symbols, names):
+    """Index for one tree state, memoized on the stats of its files."""
+    root = Path(root)
+    paths = [path for path, _, _ in stats]
+    key = _digest(root, paths, terms, extensions, symbols, names)
+    cached = INDEX_DIR / f"{key}.json"
+    try:
+        index = TreeIndex.from_json(json.loads(cached.read_text()))
+        os.utime(cached)  # shares the result cache's LRU eviction
+        return index
+    except (OSError, ValueError, KeyError):
+        pass
+
+    index = _build(root, paths, terms, symbols, names)
+    _store(cached, index)
+    return index
+
+
+def index_tree(root, terms=None, extensions=None, symbols=None, identifiers=()):
+    """Index of the files under root with the given extensions.
+
+    terms maps names to regular expressions (matched against file bytes);
+    extensions is a tuple like (".ts", ".tsx"), or None for every file;
+    symbols is a regular expression whose first group captures the name of
+    a definition; identifiers are JavaScript/TypeScript names whose
+    references are classified token by token.
+    """
+    terms = terms or {}
+    root = Path(root).resolve()
+    extensions = tuple(extensions) if extensions is not None else None
+    stats = []
+    for path in _source_files(root, extensions):
+        st = os.stat(os.path.join(root, path))
+        stats.append((path, st.st_size, st.st_mtime_ns))
+    return _load(str(root), tuple(stats), tuple(sorted(terms.items())), extensions, symbols,
+                 tuple(sorted(identifiers)))
@@ -0,0 +1,71 @@
+"""
+Per-Participant Variants
+Which variant of a challenge's shipped trees (starter/, fixture/) each
+participant was handed, kept on the grading side so that a submission can
+neither edit its variant nor choose another one.
+
+    GRADING_VARIANTS_DIR/<level>/<challenge>/assignments.json  {"alice": "17", ...}
+    GRADING_VARIANTS_DIR/<level>/<challenge>/17/starter/...
+
+The participant being graded is set by whoever knows it (the batch runner
+from the cohort layout, the daemon from its request, `python tests.py
+--participant`) with grading_as(); find_starter() then asks assigned() for
+the variant. Participants without an assignment are graded against the
+trees shipped beside the grader.
+"""
+
+import contextlib
+import contextvars
+import functools
+import json
+import os
+from pathlib import Path
+
+VARIANTS_DIR = Path(os.environ.get("GRADING_VARIANTS_DIR", Path(__file__).resolve().parent.parent / "variants"))
+ASSIGNMENTS = "assignments.json"
+
+_participant = contextvars.ContextVar("grading_participant", default=None)
+
+
+def variants_dir(grader_path):
+    """Directory holding the variants of a grader's shipped trees and their assignments."""
+    challenge = Path(grader_path).resolve().parent
+    return VARIANTS_DIR / challenge.parent.name / challenge.name
+
+
+@functools.lru_cache(maxsize=64)
+def _load(path, size, mtime_ns):
+    with open(path) as f:
+        return json.load(f)
+
+
+def assignments(grader_path):
+    """{participant: variant id} for a grader ({} when none are assigned).
+
+    Memoized on the file's size and mtime.
+    """
+    path = variants_dir(grader_path) / ASSIGNMENTS
+    try:
+        st = os.stat(path)
+    except OSError:
+        return {}
+    return _load(str(path), st.st_size, st.st_mtime_ns)
+
+
+def assigned(grader_path, participant=None):
+    """Variant id assigned to participant (default: the one being graded), or None."""
+    participant = _participant.get() if participant is None else participant
+    if participant is None:
+        return None
+    variant = assignments(grader_path).get(participant)
+    return None if variant is None else str(variant)
+
+
+@contextlib.contextmanager
+def grading_as(participant):
+    """Grade the code run in this context as participant (None: unknown)."""
+    token = _participant.set(participant)
+    try:
+        yield
+    finally:
+        _participant.reset(token)
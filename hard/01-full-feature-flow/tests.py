@@ -4,12 +4,102 @@ Full Feature Flow Challenge - Test Suite
 Verifies the complete TDD workflow.
 """
 
-import re
-import subprocess
+import functools
 import sys
 from pathlib import Path
 
-def test_planning_done():
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+
+from grading import cli
+from grading.checks import check, run_checks
+from grading.gitrepo import GitRepo, subject
+from grading.rubric import Rubric, count, keywords
+
+TEST_PATH = "src/rateLimiter/rateLimiter.test.ts"
+IMPL_PATH = "src/rateLimiter/index.ts"
+TYPES_PATH = "src/rateLimiter/types.ts"
+PLANNING_KEYWORDS = ("plan", "todo")
+PR_FILES = ("PR_DESCRIPTION.md", "PULL_REQUEST.md", ".github/PULL_REQUEST_TEMPLATE.md")
+TEST_CASE = r"it\(['\"]"
+
+INPUTS = [
+    "git:.",
+    "PLAN.md",
+    "TODO.md",
+    "planning.md",
+    "notes.md",
+    "src/rateLimiter",
+    "PR_DESCRIPTION.md",
+    "PULL_REQUEST.md",
+    ".github/PULL_REQUEST_TEMPLATE.md",
+]
+
+RUBRIC = Rubric({
+    TEST_PATH: [
+        keywords("describe(", "it("),
+        keywords("check", "limit", "reset", "configure", "option", "window", "remaining", ignore_case=True),
+        count(TEST_CASE),
+    ],
+    IMPL_PATH: [
+        keywords("interface RateLimiter", "class RateLimiter", "check", "reset", "configure",
+                 "Map", "map", "Date.now()", "new Date()", "remaining", "RateLimitResult",
+                 "RateLimitOptions", "console.log", "/**", "*/"),
+    ],
+    **{path: [keywords("## Summary", "## Test")] for path in PR_FILES},
+})
+
+def analyze_history(root="."):
+    """Walk the submission's git history once for every git-based check.
+
+    Returns None outside a repository, otherwise a dict with the current
+    branch, the five most recent commit subjects, planning keywords found in
+    them, the number of commits since main, and the walk position of the
+    oldest commit touching the test and implementation files (higher = older).
+    """
+    repo = GitRepo.discover(root)
+    if repo is None:
+        return None
+
+    paths = (
+        ("test", repo.relative(Path(root) / TEST_PATH)),
+        ("impl", repo.relative(Path(root) / IMPL_PATH)),
+    )
+    history = _walk_history(str(repo.git_dir), str(repo.work_tree),
+                            repo.head(), repo.rev_parse("main"), paths)
+    return dict(history, branch=repo.current_branch())
+
+@functools.lru_cache(maxsize=128)
+def _walk_history(git_dir, work_tree, head, base, paths):
+    """Single traversal behind analyze_history(), memoized on the commit shas involved."""
+    history = {"recent": [], "planning_hits": [], "commits_since_base": 0, "first_touch": {}}
+    if head is None:
+        return history
+
+    repo = GitRepo(git_dir, work_tree)
+    watched = dict(paths)
+
+    for position, (commit, merged) in enumerate(repo.walk_marked(head, exclude=base)):
+        if position < 5:
+            history["recent"].append(subject(commit.message))
+        if base is not None and not merged:
+            history["commits_since_base"] += 1
+
+        parent_tree = repo.commit(commit.parents[0]).tree if commit.parents else None
+        for name, path in watched.items():
+            here = repo.tree_entry(commit.tree, path)
+            before = repo.tree_entry(parent_tree, path) if parent_tree else None
+            if here is not None and here != before:
+                history["first_touch"][name] = position
+                if before is None and parent_tree:
+                    # Follow exact renames, like git log --follow
+                    watched[name] = repo.find_blob(parent_tree, here) or path
+
+    recent = "\n".join(history["recent"]).lower()
+    history["planning_hits"] = [kw for kw in PLANNING_KEYWORDS if kw in recent]
+    return history
+
+@check(30)
+def test_planning_done(root="."):
     """Test if planning was documented."""
     # Check for todo evidence or planning notes
     possible_files = [
@@ -20,19 +110,14 @@ def test_planning_done():
     ]
 
     for filename in possible_files:
-        if Path(filename).exists():
+        if (Path(root) / filename).exists():
             print(f"PASS: Planning documented in {filename}")
             return 30
 
     # Check for commit history with planning
     try:
-        result = subprocess.run(
-            ["git", "log", "--oneline", "-5"],
-            capture_output=True,
-            text=True,
-            cwd="."
-        )
-        if "plan" in result.stdout.lower() or "todo" in result.stdout.lower():
+        history = analyze_history(root)
+        if history and history["planning_hits"]:
             print("PASS: Planning evidence found in commits")
             return 25
     except:
@@ -41,66 +126,69 @@ def test_planning_done():
     print("PARTIAL: No explicit planning document found")
     return 15
 
-def test_tests_written_first():
+# The git checks share analyze_history(): chained, the first one walks the
+# history and the others reuse it instead of walking it concurrently
+@check(40, after=("test_planning_done",))
+def test_tests_written_first(root="."):
     """Test if tests were written before implementation."""
-    test_file = Path("src/rateLimiter/rateLimiter.test.ts")
-    impl_file = Path("src/rateLimiter/index.ts")
+    tests = RUBRIC.file(root, TEST_PATH)
 
-    if not test_file.exists():
+    if not tests.exists:
         print("FAIL: Test file not found at expected location")
         return 0
 
-    if not impl_file.exists():
+    if not (Path(root) / IMPL_PATH).exists():
         print("FAIL: Implementation file not found")
         return 0
 
     # Check git history to see which was committed first
     try:
-        test_log = subprocess.run(
-            ["git", "log", "--oneline", "--follow", str(test_file)],
-            capture_output=True, text=True
-        )
-        impl_log = subprocess.run(
-            ["git", "log", "--oneline", "--follow", str(impl_file)],
-            capture_output=True, text=True
-        )
-
-        # If test file has commits, give credit
-        if test_log.stdout:
-            print("PASS: Test file exists with git history")
-            return 40
+        history = analyze_history(root)
+        first_touch = history["first_touch"] if history else {}
+        test_first, impl_first = first_touch.get("test"), first_touch.get("impl")
+
+        if test_first is not None:
+            if impl_first is None:
+                print("PASS: Test file exists with git history")
+                return 40
+            if test_first > impl_first:
+                print("PASS: Tests committed before implementation")
+                return 40
+            if test_first == impl_first:
+                print("PARTIAL: Tests and implementation committed together")
+                return 30
+            print("PARTIAL: Implementation committed before tests")
+            return 20
     except:
         pass
 
     # Fallback: just check that test file exists and has tests
-    content = test_file.read_text()
-    if "describe(" in content and "it(" in content:
+    if tests.contains("describe(") and tests.contains("it("):
         print("PASS: Test file contains tests")
         return 35
     else:
         print("PARTIAL: Test file exists but may be incomplete")
         return 20
 
-def test_coverage():
+@check(30)
+def test_coverage(root="."):
     """Test for adequate test coverage."""
-    test_file = Path("src/rateLimiter/rateLimiter.test.ts")
+    tests = RUBRIC.file(root, TEST_PATH)
 
-    if not test_file.exists():
+    if not tests.exists:
         print("FAIL: Test file not found")
         return 0
 
-    content = test_file.read_text()
-
     # Count test cases
-    test_count = len(re.findall(r"it\(['\"]", content))
+    test_count = tests.count(TEST_CASE)
 
     # Check for key test scenarios
     scenarios = [
-        ("check" in content.lower() and "limit" in content.lower(), "basic limiting"),
-        ("reset" in content.lower(), "reset functionality"),
-        ("configure" in content.lower() or "option" in content.lower(), "configuration"),
-        ("window" in content.lower(), "time window"),
-        ("remaining" in content.lower(), "remaining count"),
+        (tests.contains("check", True) and tests.contains("limit", True), "basic limiting"),
+        (tests.contains("reset", True), "reset functionality"),
+        (tests.contains("configure", True) or tests.contains("option", True), "configuration"),
+        (tests.contains("window", True), "time window"),
+        (tests.contains("remaining", True), "remaining count"),
     ]
 
     covered = sum(1 for s, _ in scenarios if s)
@@ -115,25 +203,24 @@ def test_coverage():
         print(f"FAIL: Insufficient coverage ({test_count} tests, {covered}/5 scenarios)")
         return 10
 
-def test_implementation():
+@check(50)
+def test_implementation(root="."):
     """Test if implementation is correct."""
-    impl_file = Path("src/rateLimiter/index.ts")
+    impl = RUBRIC.file(root, IMPL_PATH)
 
-    if not impl_file.exists():
+    if not impl.exists:
         print("FAIL: Implementation file not found")
         return 0
 
-    content = impl_file.read_text()
-
     # Check for key implementation elements
     elements = [
-        ("interface RateLimiter" in content or "class RateLimiter" in content, 10, "RateLimiter interface/class"),
-        ("check" in content, 10, "check method"),
-        ("reset" in content, 5, "reset method"),
-        ("configure" in content, 5, "configure method"),
-        ("Map" in content or "map" in content, 10, "storage structure"),
-        ("Date.now()" in content or "new Date()" in content, 5, "timestamp tracking"),
-        ("remaining" in content, 5, "remaining tracking"),
+        (impl.contains("interface RateLimiter") or impl.contains("class RateLimiter"), 10, "RateLimiter interface/class"),
+        (impl.contains("check"), 10, "check method"),
+        (impl.contains("reset"), 5, "reset method"),
+        (impl.contains("configure"), 5, "configure method"),
+        (impl.contains("Map") or impl.contains("map"), 10, "storage structure"),
+        (impl.contains("Date.now()") or impl.contains("new Date()"), 5, "timestamp tracking"),
+        (impl.contains("remaining"), 5, "remaining tracking"),
     ]
 
     score = 0
@@ -150,24 +237,22 @@ def test_implementation():
 
     return score
 
-def test_type_safety():
+@check(20)
+def test_type_safety(root="."):
     """Test for TypeScript type safety."""
-    types_file = Path("src/rateLimiter/types.ts")
-    impl_file = Path("src/rateLimiter/index.ts")
+    impl = RUBRIC.file(root, IMPL_PATH)
 
     score = 0
 
-    if types_file.exists():
+    if (Path(root) / TYPES_PATH).exists():
         print("PASS: Separate types file exists")
         score += 10
 
-    if impl_file.exists():
-        content = impl_file.read_text()
-
-        # Check for type annotations
-        if ": RateLimitResult" in content or "RateLimitResult" in content:
+    if impl.exists:
+        # Check for type annotations (": RateLimitResult" implies the bare name)
+        if impl.contains("RateLimitResult"):
             score += 5
-        if ": RateLimitOptions" in content or "RateLimitOptions" in content:
+        if impl.contains("RateLimitOptions"):
             score += 5
 
     if score >= 15:
@@ -179,26 +264,25 @@ def test_type_safety():
 
     return score
 
-def test_clean_code():
+@check(20)
+def test_clean_code(root="."):
     """Test for clean code practices."""
-    impl_file = Path("src/rateLimiter/index.ts")
+    impl = RUBRIC.file(root, IMPL_PATH)
 
-    if not impl_file.exists():
+    if not impl.exists:
         return 0
 
-    content = impl_file.read_text()
-
     score = 0
 
     # No console.log
-    if "console.log" not in content:
+    if not impl.contains("console.log"):
         print("PASS: No console.log statements")
         score += 10
     else:
         print("FAIL: Contains console.log")
 
     # Has JSDoc comments
-    if "/**" in content and "*/" in content:
+    if impl.contains("/**") and impl.contains("*/"):
         print("PASS: Has JSDoc comments")
         score += 10
     else:
@@ -206,15 +290,14 @@ def test_clean_code():
 
     return score
 
-def test_git_workflow():
+@check(30, after=("test_tests_written_first",))
+def test_git_workflow(root="."):
     """Test for proper git workflow."""
     try:
+        history = analyze_history(root)
+
         # Check for feature branch
-        result = subprocess.run(
-            ["git", "branch", "--show-current"],
-            capture_output=True, text=True
-        )
-        branch = result.stdout.strip()
+        branch = history["branch"] if history else ""
 
         if branch.startswith("feat/"):
             print(f"PASS: On feature branch ({branch})")
@@ -224,11 +307,7 @@ def test_git_workflow():
             score = 5
 
         # Check commit count
-        result = subprocess.run(
-            ["git", "log", "--oneline", "main..HEAD"],
-            capture_output=True, text=True
-        )
-        commits = len(result.stdout.strip().split('\n')) if result.stdout.strip() else 0
+        commits = history["commits_since_base"] if history else 0
 
         if commits >= 2:
             print(f"PASS: Multiple atomic commits ({commits})")
@@ -243,14 +322,13 @@ def test_git_workflow():
         print(f"INFO: Git check skipped ({e})")
         return 15
 
-def test_pr_ready():
+@check(30)
+def test_pr_ready(root="."):
     """Test if PR description exists."""
-    pr_files = ["PR_DESCRIPTION.md", "PULL_REQUEST.md", ".github/PULL_REQUEST_TEMPLATE.md"]
-
-    for filename in pr_files:
-        if Path(filename).exists():
-            content = Path(filename).read_text()
-            if "## Summary" in content and "## Test" in content:
+    for filename in PR_FILES:
+        pr = RUBRIC.file(root, filename)
+        if pr.exists:
+            if pr.contains("## Summary") and pr.contains("## Test"):
                 print(f"PASS: PR description complete in {filename}")
                 return 30
             else:
@@ -260,21 +338,22 @@ def test_pr_ready():
     print("INFO: No PR description file found")
     return 10
 
-def main():
+def main(root="."):
     print("=" * 50)
     print("Full Feature Flow Challenge - Test Results")
     print("=" * 50)
     print()
 
-    total_score = 0
-    total_score += test_planning_done()
-    total_score += test_tests_written_first()
-    total_score += test_coverage()
-    total_score += test_implementation()
-    total_score += test_type_safety()
-    total_score += test_clean_code()
-    total_score += test_git_workflow()
-    total_score += test_pr_ready()
+    total_score = sum(run_checks([
+        test_planning_done,
+        test_tests_written_first,
+        test_coverage,
+        test_implementation,
+        test_type_safety,
+        test_clean_code,
+        test_git_workflow,
+        test_pr_ready,
+    ], root))
 
     print()
     print("=" * 50)
@@ -291,4 +370,4 @@ def main():
     return 0 if total_score >= 187 else 1
 
 if __name__ == "__main__":
-    sys.exit(main())
+    sys.exit(cli.run(sys.modules[__name__]))
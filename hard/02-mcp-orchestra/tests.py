@@ -0,0 +1,327 @@
+#!/usr/bin/env python3
+"""
+MCP Orchestra Challenge - Test Suite
+Verifies the orchestrated workflow from the MCP stand-ins' call log.
+"""
+
+import json
+import re
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+
+from grading import cli, markdown, mcpstub
+from grading.checks import check
+from grading.rubric import DEFAULT_MAX_INPUT_BYTES
+from grading.treeindex import find_starter
+
+REPORT = "orchestration_report.md"
+GENERATED = ("docs/repo-analysis.md", "docs/contributors.md")
+# The repository the GitHub stand-in served: the participant's variant, else the one shipped here
+FIXTURE = "fixture"
+
+INPUTS = [REPORT, mcpstub.LOG, *GENERATED]
+
+REQUIRED_SECTIONS = ("Servers Used", "Workflow Execution", "Data Flow", "Error Handling", "Generated Files")
+
+# Template text left in place of content
+PLACEHOLDER = re.compile(r"^\s*\[[^\]]*\]\s*$")
+RECOVERY = re.compile(r"rate.?limit|retr(?:y|ied)|fail|error|unavailable|fallback", re.I)
+
+def expected_results(root="."):
+    """The fixture repository the stand-in served: its full name and contributors (name, login), or None."""
+    fixture = find_starter(__file__, FIXTURE)
+    if fixture is None:
+        print(f"FAIL: No {FIXTURE}/ for the participant's variant to grade against")
+        return None
+    with open(fixture / "repo.json") as f:
+        repo = json.load(f)
+    contributors = sorted({(c["author"]["name"], c["author"]["login"]) for c in repo["commits"]})
+    return {"full_name": repo["full_name"], "name": repo["full_name"].split("/")[-1],
+            "contributors": contributors}
+
+def load_report(root="."):
+    """Parse the orchestration report (an empty document if there is none)."""
+    doc = markdown.load(root, REPORT)
+    if doc is None:
+        print(f"FAIL: {REPORT} not found")
+        return markdown.parse("")
+    if doc.truncated:
+        print(f"INFO: {REPORT} is {doc.size} bytes; only the first {DEFAULT_MAX_INPUT_BYTES} were graded")
+    return doc
+
+def load_calls(root="."):
+    """(tool calls, servers initialized) from the stand-ins' log, or ([], set()) without one."""
+    log = mcpstub.load_log(root)
+    if log is None:
+        print(f"FAIL: No {mcpstub.LOG}; run the workflow against the stand-ins (python -m grading.mcpstub init)")
+        return [], set()
+    return log
+
+def succeeded(calls, server, *tools):
+    """Successful calls to any of a server's tools, in start order."""
+    return [call for call in calls if call.ok and call.server == server and call.tool in tools]
+
+def content(section):
+    """A section's text without template placeholders, or "" for a missing section."""
+    if section is None:
+        return ""
+    return "\n".join(line for line in section.text.splitlines() if not PLACEHOLDER.match(line)).strip()
+
+def read_text(root, path):
+    try:
+        with open(Path(root) / path, encoding="utf-8", errors="replace") as f:
+            return f.read(DEFAULT_MAX_INPUT_BYTES)
+    except OSError:
+        return None
+
+def squash(text):
+    return re.sub(r"[\W_]+", "", text.lower())
+
+@check(30)
+def test_inventory(doc, initialized):
+    """Test if every server is listed with the tools it offers."""
+    rows = doc.section("Servers Used").rows if doc.section("Servers Used") else []
+    score = 0
+    for server in mcpstub.SERVERS:
+        row = next((row for row in rows if row and squash(server) in squash(row[0])), None)
+        if server not in initialized:
+            print(f"INFO: The {server} stand-in was never started")
+        if row is None:
+            print(f"FAIL: {server} missing from Servers Used")
+        elif any(tool in " ".join(row) for tool in mcpstub.TOOLS[server]):
+            score += 30 / len(mcpstub.SERVERS)
+        else:
+            print(f"PARTIAL: {server} listed without any of its tools ({', '.join(mcpstub.TOOLS[server])})")
+            score += 15 / len(mcpstub.SERVERS)
+    if score == 30:
+        print(f"PASS: All {len(mcpstub.SERVERS)} servers listed with their tools")
+    return int(score)
+
+@check(40)
+def test_github_operations(calls):
+    """Test if repository metadata, commits and files were fetched from GitHub."""
+    score = 0
+    for tool, points, what in (("search_repositories", 13, "Repository metadata"),
+                               ("list_commits", 14, "Recent commits"),
+                               ("get_file_contents", 13, "Repository files")):
+        done = succeeded(calls, "github", tool)
+        if done:
+            print(f"PASS: {what} fetched ({tool} x{len(done)})")
+            score += points
+        else:
+            print(f"FAIL: No successful {tool} call")
+    return score
+
+@check(40)
+def test_memory_storage(calls, repo):
+    """Test if repository data was stored in Memory and queried back."""
+    score = 0
+    created = succeeded(calls, "memory", "create_entities")
+    known = [squash(value) for value in (repo["name"], *(v for c in repo["contributors"] for v in c))]
+    entities = [squash(str(entity.get("name", ""))) for call in created
+                for entity in call.arguments.get("entities") or () if isinstance(entity, dict)]
+    if any(name in entity for entity in entities for name in known):
+        print("PASS: Entities created for the repository's data")
+        score += 15
+    elif created:
+        print("PARTIAL: Entities created, but none for the repository or its contributors")
+        score += 8
+    else:
+        print("FAIL: No successful create_entities call")
+
+    if succeeded(calls, "memory", "create_relations"):
+        print("PASS: Relations stored between entities")
+        score += 10
+    else:
+        print("FAIL: No successful create_relations call")
+
+    first = min((call.end for call in created), default=None)
+    queried = [call for call in succeeded(calls, "memory", "search_nodes", "open_nodes", "read_graph")
+               if first is not None and call.start >= first and '"name"' in call.result]
+    if queried:
+        print(f"PASS: Stored data queried back ({queried[0].tool})")
+        score += 15
+    else:
+        print("FAIL: Stored entities were never queried back (search_nodes, open_nodes or read_graph)")
+    return score
+
+@check(40)
+def test_files_generated(root, calls, repo):
+    """Test if the documentation files were written through Filesystem with the right content."""
+    score = 0
+    analysis, contributors = (read_text(root, path) for path in GENERATED)
+    if analysis and repo["name"].lower() in analysis.lower():
+        print(f"PASS: {GENERATED[0]} describes {repo['full_name']}")
+        score += 10
+    else:
+        print(f"FAIL: {GENERATED[0]} missing or does not name {repo['full_name']}")
+
+    listed = [name for name, login in repo["contributors"]
+              if contributors and (name.lower() in contributors.lower() or login.lower() in contributors.lower())]
+    if contributors is None:
+        print(f"FAIL: {GENERATED[1]} not found")
+    elif len(listed) == len(repo["contributors"]):
+        print(f"PASS: All {len(listed)} contributors listed")
+        score += 15
+    else:
+        missing = [name for name, _ in repo["contributors"] if name not in listed]
+        print(f"PARTIAL: {len(listed)}/{len(repo['contributors'])} contributors listed (missing: {', '.join(missing)})")
+        score += int(15 * len(listed) / len(repo["contributors"]))
+
+    written = {path for path in GENERATED for call in succeeded(calls, "filesystem", "write_file")
+               if str(call.arguments.get("path", "")).endswith(path)}
+    if len(written) == len(GENERATED):
+        print("PASS: Both files written through the Filesystem server")
+        score += 15
+    elif written:
+        print(f"PARTIAL: Only {', '.join(written)} written through the Filesystem server")
+        score += 7
+    else:
+        print("FAIL: No documentation written with Filesystem write_file")
+    return score
+
+@check(30)
+def test_sequential_thinking(calls):
+    """Test if Sequential Thinking planned the workflow before it ran."""
+    thoughts = succeeded(calls, mcpstub.THINKING, "sequentialthinking")
+    if not thoughts:
+        print("FAIL: Sequential Thinking was not used")
+        return 0
+
+    score = 10 if len(thoughts) >= 3 else 5
+    print(f"{'PASS' if len(thoughts) >= 3 else 'PARTIAL'}: {len(thoughts)} thoughts recorded")
+    numbers = [call.arguments.get("thoughtNumber") for call in thoughts]
+    if numbers[0] == 1 and thoughts[-1].arguments.get("nextThoughtNeeded") is False:
+        print("PASS: Thoughts run from 1 to a concluding thought")
+        score += 10
+    else:
+        print("FAIL: Thoughts should start at 1 and end with nextThoughtNeeded false")
+
+    work = [call for call in calls if call.server != mcpstub.THINKING]
+    if work and thoughts[0].start <= work[0].start:
+        print("PASS: Workflow planned before the first server call")
+        score += 10
+    else:
+        print("FAIL: Plan with Sequential Thinking before calling the other servers")
+    return score
+
+@check(30)
+def test_error_handling(doc, calls):
+    """Test if a server failure was recovered from and documented."""
+    score = 0
+    failures = [call for call in calls if not call.ok]
+    recovered = [f for f in failures
+                 if any(c.ok and c.server == f.server and c.tool == f.tool and c.start >= f.end for c in calls)]
+    if recovered:
+        print(f"PASS: Recovered from a failed {recovered[0].server} {recovered[0].tool} call")
+        score += 15
+    elif failures:
+        print(f"FAIL: The failed {failures[0].server} {failures[0].tool} call was never retried")
+    else:
+        print("FAIL: No failed call in the log to recover from")
+
+    section = content(doc.section("Error Handling"))
+    names_failure = not failures or re.search(r"rate.?limit", section, re.I) or any(f.tool in section for f in failures)
+    if section and RECOVERY.search(section) and names_failure:
+        print("PASS: The failure and its handling are documented")
+        score += 15
+    elif section:
+        print("PARTIAL: Error Handling does not describe the failure that occurred")
+        score += 5
+    else:
+        print("FAIL: No Error Handling section")
+    return score
+
+@check(20)
+def test_parallel_calls(timeline):
+    """Test if calls that did not depend on each other were overlapped."""
+    if not timeline.calls:
+        print("FAIL: No calls to time")
+        return 0
+
+    path = " -> ".join(call.tool for call in timeline.critical_path[:6])
+    if len(timeline.critical_path) > 6:
+        path += " -> ..."
+    share = timeline.critical / timeline.wall if timeline.wall else 1.0
+    print(f"INFO: Workflow latency {timeline.wall:.2f}s over {len(timeline.calls)} calls, "
+          f"{timeline.in_flight:.2f}s with a call in flight")
+    print(f"INFO: Critical path {timeline.critical:.2f}s ({share:.0%} of the latency): {path}")
+
+    if not timeline.opportunities:
+        print("PASS: Every call needed the one before it")
+        return 20
+    ratio = timeline.overlapped / timeline.opportunities
+    message = f"{timeline.overlapped}/{timeline.opportunities} independent calls overlapped"
+    if ratio >= 0.5:
+        print(f"PASS: {message}")
+        return 20
+    print(f"PARTIAL: {message}; issue independent calls together instead of one after another")
+    return int(20 * 2 * ratio)
+
+@check(20)
+def test_report_comprehensive(doc):
+    """Test if the report covers every part of the orchestration."""
+    present = [title for title in REQUIRED_SECTIONS if content(doc.section(title))]
+    score = int(10 * len(present) / len(REQUIRED_SECTIONS))
+    if len(present) == len(REQUIRED_SECTIONS):
+        print("PASS: All report sections filled in")
+    else:
+        print(f"FAIL: Missing or empty sections: {', '.join(t for t in REQUIRED_SECTIONS if t not in present)}")
+
+    steps = doc.section("Workflow Execution")
+    steps = [item for item in (steps.items if steps else ()) if not PLACEHOLDER.match(item)]
+    if len(steps) >= 3:
+        print(f"PASS: {len(steps)} workflow steps described")
+        score += 5
+    else:
+        print("FAIL: Describe each workflow step and its result")
+
+    files = content(doc.section("Generated Files"))
+    if all(path in files for path in GENERATED):
+        print("PASS: Generated files listed")
+        score += 5
+    else:
+        print(f"FAIL: Generated Files should list {' and '.join(GENERATED)}")
+    return score
+
+def main(root="."):
+    print("=" * 50)
+    print("MCP Orchestra Challenge - Test Results")
+    print("=" * 50)
+    print()
+
+    doc = load_report(root)
+    calls, initialized = load_calls(root)
+    repo = expected_results(root)
+    if repo is None:
+        return 1
+    timeline = mcpstub.Timeline(calls)
+
+    total_score = 0
+    total_score += test_inventory(doc, initialized)
+    total_score += test_github_operations(calls)
+    total_score += test_memory_storage(calls, repo)
+    total_score += test_files_generated(root, calls, repo)
+    total_score += test_sequential_thinking(calls)
+    total_score += test_error_handling(doc, calls)
+    total_score += test_parallel_calls(timeline)
+    total_score += test_report_comprehensive(doc)
+
+    print()
+    print("=" * 50)
+    print(f"TOTAL SCORE: {total_score}/250")
+    print("=" * 50)
+
+    if total_score >= 225:
+        print("Excellent! You've mastered MCP orchestration!")
+    elif total_score >= 187:
+        print("Good job! Solid multi-server workflow.")
+    else:
+        print("Review MCP server coordination and error handling.")
+
+    return 0 if total_score >= 187 else 1
+
+if __name__ == "__main__":
+    sys.exit(cli.run(sys.modules[__name__]))
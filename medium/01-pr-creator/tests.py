@@ -4,36 +4,58 @@ PR Creator Challenge - Test Suite
 Verifies the complete PR workflow.
 """
 
+import asyncio
 import re
-import subprocess
 import sys
 from pathlib import Path
 
-def run_git(args, cwd="starter"):
-    """Run a git command and return output."""
-    try:
-        result = subprocess.run(
-            ["git"] + args,
-            capture_output=True,
-            text=True,
-            cwd=cwd
-        )
-        return result.stdout.strip(), result.returncode
-    except Exception as e:
-        return str(e), 1
-
-def test_branch_name():
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+
+from grading import cli, remote
+from grading.checks import check, run_checks
+from grading.gitrepo import GitRepo, subject
+
+# Local stand-in for origin, if the participant worked offline (see grading.remote)
+STANDIN = f"starter/.git/{remote.STANDIN}"
+
+INPUTS = [
+    "git:starter",
+    "starter/src/utils/validation.ts",
+    "starter/PR_DESCRIPTION.md",
+    f"{STANDIN}/refs",
+    f"{STANDIN}/packed-refs",
+    f"{STANDIN}/{remote.PR_STORE}",
+]
+
+# Branch and subject conventions
+BRANCH_NAME = re.compile(r'^(feat|fix|refactor|docs|test|chore)/.+')
+CONVENTIONAL = re.compile(r'^(feat|fix|refactor|docs|test|chore)(\([^)]+\))?:\s+.+')
+
+def open_repo(root="."):
+    """Open the git repository containing the submission's starter/ directory."""
+    starter = Path(root) / "starter"
+    if not starter.is_dir():
+        return None
+    return GitRepo.discover(starter)
+
+def recorded_pr(repo, branch):
+    """The latest pull request recorded for branch on a stand-in origin, or None."""
+    pulls = [p for p in remote.pull_requests(repo) if p.get("headRefName") == branch]
+    return pulls[-1] if pulls else None
+
+@check(20)
+def test_branch_name(root="."):
     """Test if branch follows naming convention."""
-    output, code = run_git(["branch", "--show-current"])
+    repo = open_repo(root)
 
-    if code != 0:
+    if repo is None:
         print("FAIL: Could not get current branch")
         return 0
 
-    branch = output.strip()
+    branch = repo.current_branch()
 
     # Check naming convention
-    if re.match(r'^(feat|fix|refactor|docs|test|chore)/.+', branch):
+    if BRANCH_NAME.match(branch):
         print(f"PASS: Branch name follows convention ({branch})")
         return 20
     elif branch != "main" and branch != "master":
@@ -43,17 +65,20 @@ def test_branch_name():
         print(f"FAIL: Still on main/master branch")
         return 0
 
-def test_commit_format():
+@check(25)
+def test_commit_format(root="."):
     """Test if commit follows conventional format."""
-    output, code = run_git(["log", "-1", "--pretty=format:%s"])
+    repo = open_repo(root)
+    head = repo.head() if repo else None
 
-    if code != 0 or not output:
+    if head is None:
         print("FAIL: No commits found")
         return 0
 
+    output = subject(repo.commit(head).message)
+
     # Check conventional commit pattern
-    pattern = r'^(feat|fix|refactor|docs|test|chore)(\([^)]+\))?:\s+.+'
-    if re.match(pattern, output):
+    if CONVENTIONAL.match(output):
         print(f"PASS: Commit follows conventional format")
         return 25
     else:
@@ -61,9 +86,10 @@ def test_commit_format():
         print(f"  Got: {output}")
         return 0
 
-def test_function_implemented():
+@check(30)
+def test_function_implemented(root="."):
     """Test if validateEmail function was implemented."""
-    file_path = Path("starter/src/utils/validation.ts")
+    file_path = Path(root) / "starter/src/utils/validation.ts"
 
     if not file_path.exists():
         print("FAIL: validation.ts not found")
@@ -84,16 +110,21 @@ def test_function_implemented():
     print("FAIL: validateEmail function not found")
     return 0
 
-def test_pr_created():
+@check(25)
+def test_pr_created(root="."):
     """Test if PR was created (simulated check)."""
-    # In real scenario, would use gh pr list
-    # For testing, check if remote tracking is set up
-    output, code = run_git(["remote", "-v"])
+    # Offline, the gh stand-in records PRs; otherwise a pushed branch is the proxy
+    repo = open_repo(root)
+
+    if repo and "origin" in repo.remotes():
+        branch = repo.current_branch()
+        pr = recorded_pr(repo, branch)
+        if pr:
+            print(f"PASS: PR #{pr['number']} created for {branch}")
+            return 25
 
-    if "origin" in output:
-        # Check if branch was pushed
-        branch, _ = run_git(["branch", "--show-current"])
-        remote_check, _ = run_git(["ls-remote", "--heads", "origin", branch])
+        # Check if branch was pushed (read locally for a stand-in, cached otherwise)
+        remote_check, _ = remote.ls_remote_heads(repo, "origin", branch)
 
         if branch in str(remote_check):
             print("PASS: Branch pushed to remote (PR likely created)")
@@ -105,25 +136,29 @@ def test_pr_created():
         print("INFO: No remote configured (skipping PR check)")
         return 15  # Give partial credit in test environment
 
-def test_push_with_tracking():
+@check(25)
+def test_push_with_tracking(root="."):
     """Test if push used -u flag (tracking set up)."""
-    output, code = run_git(["branch", "-vv"])
+    repo = open_repo(root)
+    upstream = repo.upstream() if repo else None
 
-    if "[origin/" in output:
+    if upstream and upstream.startswith("origin/"):
         print("PASS: Branch has upstream tracking")
         return 25
     else:
         print("FAIL: No upstream tracking (did you use -u flag?)")
         return 0
 
-def test_pr_description():
+@check(25)
+def test_pr_description(root="."):
     """Test PR description format (simulated)."""
-    # Would use gh pr view in real scenario
-    # Check for a PR description file as proxy
-    pr_file = Path("starter/PR_DESCRIPTION.md")
+    # Prefer the body recorded by the gh stand-in; a PR description file is the proxy
+    repo = open_repo(root)
+    pr = recorded_pr(repo, repo.current_branch()) if repo else None
+    pr_file = Path(root) / "starter/PR_DESCRIPTION.md"
 
-    if pr_file.exists():
-        content = pr_file.read_text()
+    if pr or pr_file.exists():
+        content = pr["body"] if pr else pr_file.read_text()
         score = 0
 
         if "## Summary" in content:
@@ -140,19 +175,20 @@ def test_pr_description():
         print("INFO: No PR_DESCRIPTION.md found (checking via gh in real scenario)")
         return 15  # Partial credit
 
-def main():
+def main(root="."):
     print("=" * 50)
     print("PR Creator Challenge - Test Results")
     print("=" * 50)
     print()
 
-    total_score = 0
-    total_score += test_branch_name()
-    total_score += test_commit_format()
-    total_score += test_function_implemented()
-    total_score += test_pr_created()
-    total_score += test_push_with_tracking()
-    total_score += test_pr_description()
+    total_score = sum(run_checks([
+        test_branch_name,
+        test_commit_format,
+        test_function_implemented,
+        test_pr_created,
+        test_push_with_tracking,
+        test_pr_description,
+    ], root))
 
     print()
     print("=" * 50)
@@ -168,5 +204,12 @@ def main():
 
     return 0 if total_score >= 112 else 1
 
+async def amain(root="."):
+    """main() for event loops: a network ls-remote runs as a non-blocking subprocess."""
+    repo = open_repo(root)
+    if repo and "origin" in repo.remotes():
+        await remote.prefetch_heads(repo, "origin", repo.current_branch())
+    return await asyncio.to_thread(main, root)
+
 if __name__ == "__main__":
-    sys.exit(main())
+    sys.exit(cli.run(sys.modules[__name__]))
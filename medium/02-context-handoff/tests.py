@@ -0,0 +1,298 @@
+#!/usr/bin/env python3
+"""
+Context Handoff Challenge - Test Suite
+Verifies the handoff document and that the session was compacted.
+"""
+
+import re
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+
+from grading import cli, markdown
+from grading.checks import check
+from grading.gitrepo import GitError, GitRepo
+from grading.rubric import DEFAULT_MAX_INPUT_BYTES
+
+HANDOFF = "handoff.md"
+# The session transcript, copied from ~/.claude/projects/<project>/<session-id>.jsonl
+TRANSCRIPT = "transcript.jsonl"
+
+INPUTS = [HANDOFF, TRANSCRIPT, "git:."]
+
+REQUIRED_SECTIONS = (
+    "Date", "Session Summary", "Files Modified", "Decisions Made",
+    "Outstanding Tasks", "Key Context", "Commands Used", "Notes for Next Session",
+)
+
+# What the scenario's session did, for submissions without a repository of their own
+SCENARIO_FILES = ("src/auth/login.ts", "src/auth/middleware.ts")
+
+# Template text left in place of content
+PLACEHOLDER = re.compile(r"^\s*(?:[-*]\s*(?:\[ \]\s*)?|\d+\.\s*)?\[[^\]]*\]\s*$")
+DATE = re.compile(r"\b\d{4}-\d{2}-\d{2}\b|\b\d{1,2}/\d{1,2}/\d{2,4}\b|\b(?:jan|feb|mar|apr|may|jun|jul|aug|sep|oct|nov|dec)[a-z]*\.?\s+\d{1,2}\b", re.I)
+SENTENCE = re.compile(r"[^.!?]+[.!?]")
+FILE_PATH = re.compile(r"`([^`]+)`|([\w./-]+\.\w+)")
+DESCRIPTION = re.compile(r"\s[-:–—]\s*[^\s\[]")
+RATIONALE = re.compile(r"\b(?:because|since|so that|due to|rationale|reason|over|instead of|better|safer|simpler)\b", re.I)
+PASSWORD_RESET = re.compile(r"password\s+reset|reset\s+(?:the\s+)?password", re.I)
+
+# Transcript traces of /compact: the command itself and the summary it leaves
+COMPACT_EVIDENCE = (b"<command-name>/compact</command-name>", b'"compact_boundary"',
+                    b'"isCompactSummary":true', b'"isCompactSummary": true')
+
+def load_handoff(root="."):
+    """Parse the handoff document."""
+    doc = markdown.load(root, HANDOFF)
+    if doc is None:
+        print(f"FAIL: {HANDOFF} not found")
+        return None
+    if doc.truncated:
+        print(f"INFO: {HANDOFF} is {doc.size} bytes; only the first {DEFAULT_MAX_INPUT_BYTES} were graded")
+    return doc
+
+def content(section):
+    """A section's text without template placeholders, or "" for a missing section."""
+    if section is None:
+        return ""
+    return "\n".join(line for line in section.text.splitlines() if not PLACEHOLDER.match(line)).strip()
+
+def changed_files(root="."):
+    """Files the session committed according to the submission's git repository, or None without one.
+
+    One diff-tree pass from the session's base (the upstream branch, else
+    main, else HEAD's parent) to HEAD, however large the repository. Only
+    commits are compared, never the work tree, since "git:." in INPUTS
+    covers the repository's history but not its files.
+    """
+    git_dir = Path(root) / ".git"
+    if not git_dir.exists():
+        return None
+    repo = GitRepo.discover(root)
+    head = repo.head() if repo else None
+    if head is None:
+        return None
+
+    try:
+        base = None
+        for candidate in (repo.upstream(), "main", "master"):
+            sha = repo.rev_parse(candidate) if candidate else None
+            if sha and sha != head:
+                base = sha
+                break
+        commit = repo.commit(head)
+        if base is None and commit.parents:
+            base = commit.parents[0]
+        base_tree = repo.commit(base).tree if base else None
+        changed = {path for path, _, _ in repo.diff_tree(base_tree, commit.tree)}
+    except GitError as e:
+        print(f"INFO: Could not read the git history ({e})")
+        return None
+    return changed - {HANDOFF, TRANSCRIPT}
+
+def listed_files(section):
+    """(path, has description) for each list item of Files Modified."""
+    listed = []
+    for item in section.items if section else ():
+        match = FILE_PATH.search(item)
+        if match:
+            path = re.sub(r"^(?:\./)+", "", (match.group(1) or match.group(2)).strip())
+            listed.append((path, bool(DESCRIPTION.search(item[match.end():]))))
+    return listed
+
+def load_compact_evidence(root="."):
+    """Whether the transcript shows /compact was run, or None without a transcript."""
+    transcript = Path(root) / TRANSCRIPT
+    if not transcript.is_file():
+        return None
+    read = 0
+    with open(transcript, "rb") as f:
+        for line in f:
+            read += len(line)
+            if read > DEFAULT_MAX_INPUT_BYTES:
+                break
+            if any(evidence in line for evidence in COMPACT_EVIDENCE):
+                return True
+    return False
+
+@check(25)
+def test_sections_present(doc):
+    """Test if every section of the handoff format is present and filled in."""
+    missing = [title for title in REQUIRED_SECTIONS if doc.section(title) is None]
+    empty = [title for title in REQUIRED_SECTIONS
+             if title not in missing and not content(doc.section(title))]
+    present = len(REQUIRED_SECTIONS) - len(missing) - len(empty)
+
+    date = doc.section("Date")
+    if date is not None and content(date) and not DATE.search(date.text):
+        print("INFO: Date section has no recognizable date")
+
+    if present == len(REQUIRED_SECTIONS):
+        print(f"PASS: All {present} sections present")
+        return 25
+    if missing:
+        print(f"FAIL: Missing sections: {', '.join(missing)}")
+    if empty:
+        print(f"FAIL: Sections left empty or as placeholders: {', '.join(empty)}")
+    return int(25 * present / len(REQUIRED_SECTIONS))
+
+@check(25)
+def test_session_summary(doc):
+    """Test if the session summary describes what was accomplished."""
+    summary = content(doc.section("Session Summary"))
+    if not summary:
+        print("FAIL: No session summary")
+        return 0
+
+    score = 0
+    if re.search(r"\bauth(?:entication)?\b", summary, re.I):
+        print("PASS: Summary covers the authentication feature")
+        score += 10
+    else:
+        print("FAIL: Summary does not mention the authentication work")
+    if re.search(r"\bJWT\b", summary, re.I):
+        print("PASS: Summary mentions the JWT approach")
+        score += 10
+    else:
+        print("FAIL: Summary does not mention JWT")
+
+    sentences = len(SENTENCE.findall(summary))
+    if 2 <= sentences <= 4:
+        print(f"PASS: Summary is concise ({sentences} sentences)")
+        score += 5
+    else:
+        print(f"PARTIAL: Summary should be 2-3 sentences (found {sentences})")
+    return score
+
+@check(25)
+def test_files_listed(doc, changed):
+    """Test if the modified files are listed with what changed."""
+    listed = listed_files(doc.section("Files Modified"))
+    if not listed:
+        print("FAIL: No files listed under Files Modified")
+        return 0
+
+    expected = sorted(changed) if changed else list(SCENARIO_FILES)
+    names = {path for path, _ in listed} | {Path(path).name for path, _ in listed}
+    found = [path for path in expected if path in names or Path(path).name in names]
+    score = 0
+    if len(found) == len(expected):
+        print(f"PASS: All {len(expected)} modified files listed")
+        score += 15
+    else:
+        missing = [path for path in expected if path not in found]
+        print(f"PARTIAL: {len(found)}/{len(expected)} modified files listed (missing: {', '.join(missing[:5])})")
+        score += int(15 * len(found) / len(expected))
+
+    if changed:
+        unchanged = [path for path, _ in listed
+                     if path not in changed and not any(Path(c).name == path for c in changed)]
+        if unchanged:
+            print(f"INFO: Listed but not committed: {', '.join(unchanged[:5])}")
+
+    if all(described for _, described in listed):
+        print("PASS: Every file has a description of the change")
+        score += 10
+    else:
+        print("FAIL: Some files lack a description (- `path` - what changed)")
+    return score
+
+@check(25)
+def test_decisions_documented(doc):
+    """Test if the decisions and their rationale are recorded."""
+    section = doc.section("Decisions Made")
+    decisions = content(section)
+    if not decisions:
+        print("FAIL: No decisions documented")
+        return 0
+
+    score = 0
+    if re.search(r"\bJWT\b", decisions, re.I):
+        print("PASS: JWT decision documented")
+        score += 10
+    else:
+        print("FAIL: JWT vs OAuth decision missing")
+    if re.search(r"\bbcrypt\b", decisions, re.I):
+        print("PASS: bcrypt decision documented")
+        score += 10
+    else:
+        print("FAIL: bcrypt password hashing decision missing")
+
+    items = section.items or [decisions]
+    if all(RATIONALE.search(item) for item in items):
+        print("PASS: Decisions include their rationale")
+        score += 5
+    else:
+        print("PARTIAL: Explain WHY each decision was made")
+    return score
+
+@check(25)
+def test_outstanding_tasks(doc):
+    """Test if outstanding tasks are an actionable checklist."""
+    tasks = doc.section("Outstanding Tasks")
+    checklist = [(done, text) for done, text in (tasks.tasks if tasks else ()) if not text.startswith("[")]
+    if not checklist:
+        print("FAIL: No checklist items (- [ ] task) under Outstanding Tasks")
+        return 0
+
+    score = 10
+    print(f"PASS: {len(checklist)} outstanding tasks listed as a checklist")
+    if any(not done and PASSWORD_RESET.search(text) for done, text in checklist):
+        print("PASS: Password reset listed as pending")
+        score += 15
+    else:
+        print("FAIL: The pending password reset is not listed")
+    return score
+
+@check(25)
+def test_compact_used(doc, compacted):
+    """Test for evidence that /compact was run."""
+    if compacted:
+        print("PASS: Transcript shows /compact was run")
+        return 25
+    commands = content(doc.section("Commands Used"))
+    if "/compact" in commands:
+        print(f"PARTIAL: /compact listed in Commands Used, but {TRANSCRIPT} does not show it")
+        return 15
+    print("FAIL: No evidence of /compact")
+    return 0
+
+def main(root="."):
+    print("=" * 50)
+    print("Context Handoff Challenge - Test Results")
+    print("=" * 50)
+    print()
+
+    doc = load_handoff(root)
+    if doc is None:
+        print(f"\nCreate {HANDOFF} with your session handoff.")
+        return 1
+
+    changed = changed_files(root)
+    compacted = load_compact_evidence(root)
+
+    total_score = 0
+    total_score += test_sections_present(doc)
+    total_score += test_session_summary(doc)
+    total_score += test_files_listed(doc, changed)
+    total_score += test_decisions_documented(doc)
+    total_score += test_outstanding_tasks(doc)
+    total_score += test_compact_used(doc, compacted)
+
+    print()
+    print("=" * 50)
+    print(f"TOTAL SCORE: {total_score}/150")
+    print("=" * 50)
+
+    if total_score >= 135:
+        print("Excellent! You've mastered session handoffs!")
+    elif total_score >= 112:
+        print("Good job! Minor improvements possible.")
+    else:
+        print("Review handoff documents and the /compact command.")
+
+    return 0 if total_score >= 112 else 1
+
+if __name__ == "__main__":
+    sys.exit(cli.run(sys.modules[__name__]))
@@ -0,0 +1,314 @@
+#!/usr/bin/env python3
+"""
+Parallel Search Challenge - Test Suite
+Verifies the aggregated search report and how the search agents were launched.
+"""
+
+import json
+import sys
+from collections import Counter
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+
+from grading import cli
+from grading.checks import check
+from grading.rubric import DEFAULT_MAX_INPUT_BYTES
+from grading.treeindex import find_starter, index_tree
+
+STARTER = "starter"
+REPORT = "parallel_search_report.json"
+# The session transcript, copied from ~/.claude/projects/<project>/<session-id>.jsonl
+TRANSCRIPT = "transcript.jsonl"
+
+INPUTS = [REPORT, TRANSCRIPT]
+
+# What each search agent looks for, by report category
+SEARCH_TERMS = {
+    "security_issues": {
+        "eval": r"\beval\s*\(",
+        "inner_html": r"\binnerHTML\b",
+        "dangerously_set_inner_html": r"\bdangerouslySetInnerHTML\b",
+        "hardcoded_secret": (
+            r"""(?i:(?:api[_-]?key|secret|password|passwd|token|access[_-]?key|private[_-]?key)\w*)"""
+            r"""['"]?\s*[:=]\s*['"][^'"\s]{8,}['"]"""
+            r"""|\b(?:sk|pk)_(?:live|test)_[0-9A-Za-z]{16,}|\bAKIA[0-9A-Z]{16}\b|\bgh[pousr]_[0-9A-Za-z]{36}\b"""
+        ),
+    },
+    "performance_issues": {
+        "console_log": r"console\.log\s*\(",
+    },
+    "quality_issues": {
+        "todo": r"\b(?:TODO|FIXME|HACK)\b",
+        "any_type": r""":\s*any\b|\bas\s+any\b|<any>|\bany\[\]""",
+    },
+}
+CATEGORIES = tuple(SEARCH_TERMS)
+SOURCE_EXTENSIONS = (".ts", ".tsx", ".js", ".jsx")
+
+SEVERITIES = ("high", "medium", "low")
+
+def expected_results(root="."):
+    """Every (file, line) each category's searches match in the starter, or None without one.
+
+    The index is cached by the starter's content, so grading a report is
+    only set operations.
+    """
+    starter = find_starter(__file__, STARTER)
+    if starter is None:
+        return None
+
+    terms = {term: pattern for category in SEARCH_TERMS.values() for term, pattern in category.items()}
+    index = index_tree(starter, terms, SOURCE_EXTENSIONS)
+    return {
+        category: {(f"{STARTER}/{path}", line)
+                   for term in SEARCH_TERMS[category] for path, line in index.occurrences(term)}
+        for category in CATEGORIES
+    }
+
+def load_report(root="."):
+    """Load the participant's aggregated report."""
+    report_path = Path(root) / REPORT
+    if not report_path.exists():
+        print(f"FAIL: {REPORT} not found")
+        return None
+
+    try:
+        with open(report_path) as f:
+            report = json.load(f)
+    except json.JSONDecodeError as e:
+        print(f"FAIL: Invalid JSON: {e}")
+        return None
+    if not isinstance(report, dict):
+        print("FAIL: Report must be a JSON object")
+        return None
+    return report
+
+def load_task_calls(root="."):
+    """(message id, input) of every Task tool call in the transcript, or None without one.
+
+    Calls made in one assistant message share its id, even when the
+    transcript spreads the message over several lines.
+    """
+    transcript = Path(root) / TRANSCRIPT
+    if not transcript.is_file():
+        return None
+
+    calls = []
+    read = 0
+    with open(transcript, "rb") as f:
+        for number, line in enumerate(f):
+            read += len(line)
+            if read > DEFAULT_MAX_INPUT_BYTES:
+                break
+            if b'"tool_use"' not in line or b'"Task"' not in line:
+                continue
+            try:
+                entry = json.loads(line)
+                message = entry["message"]
+                content = message["content"]
+            except (ValueError, KeyError, TypeError):
+                continue
+            for block in content if isinstance(content, list) else ():
+                if isinstance(block, dict) and block.get("type") == "tool_use" and block.get("name") == "Task":
+                    inputs = block.get("input") if isinstance(block.get("input"), dict) else {}
+                    calls.append((message.get("id") or f"line {number}", inputs))
+    return calls
+
+def findings(report):
+    """The report's issue entries, by category (malformed categories are empty)."""
+    found = {}
+    for category in CATEGORIES:
+        entries = report.get(category)
+        found[category] = [e for e in entries if isinstance(e, dict)] if isinstance(entries, list) else []
+    return found
+
+def normalize_location(entry):
+    """(starter-relative file, line) of an issue entry, or None if it has no usable location."""
+    path, line = entry.get("file"), entry.get("line")
+    if not isinstance(path, str) or isinstance(line, bool):
+        return None
+    try:
+        line = int(line)
+    except (TypeError, ValueError):
+        return None
+
+    path = path.replace("\\", "/")
+    while path.startswith("./"):
+        path = path[2:]
+    marker = f"/{STARTER}/"
+    if marker in path:
+        path = path[path.index(marker) + 1:]
+    if not path.startswith(f"{STARTER}/"):
+        path = f"{STARTER}/{path.lstrip('/')}"
+    return path, line
+
+@check(25)
+def test_task_tool(calls):
+    """Test if search agents were launched with the Task tool."""
+    if calls is None:
+        print(f"FAIL: {TRANSCRIPT} not found (copy your session transcript here)")
+        return 0
+    if not calls:
+        print("FAIL: No Task tool calls in the transcript")
+        return 0
+
+    explore = [inputs for _, inputs in calls if inputs.get("subagent_type") == "Explore"]
+    if explore:
+        print(f"PASS: Task tool used with subagent_type \"Explore\" ({len(explore)} agents)")
+        return 25
+    types = sorted({str(inputs.get("subagent_type")) for _, inputs in calls})
+    print(f"PARTIAL: Task tool used, but not with subagent_type \"Explore\" (got {', '.join(types)})")
+    return 15
+
+@check(30)
+def test_parallel_launch(calls):
+    """Test if at least two agents were launched in a single message."""
+    if not calls:
+        print("FAIL: No agent launches to check")
+        return 0
+
+    per_message = Counter(message for message, _ in calls)
+    most = max(per_message.values())
+    if most >= 2:
+        print(f"PASS: {most} agents launched in parallel (one message)")
+        return 30
+    print(f"FAIL: {len(calls)} agents launched one at a time")
+    print("  Put several Task tool calls in ONE message to run them in parallel")
+    return 0
+
+@check(25)
+def test_categories_covered(report, expected):
+    """Test if every search category made it into the report."""
+    found = findings(report)
+    covered = []
+    for category in CATEGORIES:
+        present = isinstance(report.get(category), list)
+        needed = expected is None or bool(expected[category])
+        if present and (found[category] or not needed):
+            covered.append(category)
+        elif present:
+            print(f"FAIL: {category} is empty, but the starter has such issues")
+        else:
+            print(f"FAIL: {category} missing from the report")
+
+    if len(covered) == len(CATEGORIES):
+        print("PASS: All search categories covered")
+        return 25
+    print(f"PARTIAL: {len(covered)}/{len(CATEGORIES)} search categories covered")
+    return int(25 * len(covered) / len(CATEGORIES))
+
+@check(35)
+def test_results_aggregated(report, expected):
+    """Test if the aggregated findings are well-formed and match the starter."""
+    entries = [entry for category in findings(report).values() for entry in category]
+    if not entries:
+        print("FAIL: No findings reported")
+        return 0
+
+    score = 0
+    located = {normalize_location(entry) for entry in entries}
+    if None not in located and all(isinstance(entry.get("issue"), str) for entry in entries):
+        print("PASS: Every finding has a file, line and issue")
+        score += 10
+    else:
+        print("FAIL: Some findings lack a file, line number or issue description")
+    located.discard(None)
+
+    if expected is None:
+        print(f"FAIL: No {STARTER}/ for the participant's variant to verify the findings against")
+        return score
+
+    truth = set().union(*expected.values())
+    if not truth:
+        print("PASS: The starter has no matching issues")
+        return score + 25
+
+    matches = located & truth
+    if matches == truth:
+        print(f"PASS: All {len(truth)} issues in the starter were found")
+        return score + 25
+
+    missing = sorted(truth - located)
+    extra = located - truth
+    print(f"PARTIAL: Found {len(matches)}/{len(truth)} issues in the starter")
+    print(f"  Missing: {', '.join(f'{path}:{line}' for path, line in missing[:5])}"
+          + (f" and {len(missing) - 5} more" if len(missing) > 5 else ""))
+    if extra:
+        print(f"  Extra (may be valid): {len(extra)}")
+    return score + int(25 * len(matches) / len(truth))
+
+@check(35)
+def test_summary_statistics(report):
+    """Test if the summary statistics agree with the findings."""
+    summary = report.get("summary")
+    if not isinstance(summary, dict):
+        print("FAIL: summary missing from the report")
+        return 0
+
+    entries = [entry for category in findings(report).values() for entry in category]
+    counts = {level: summary.get(f"{level}_severity") for level in SEVERITIES}
+    total = summary.get("total_issues")
+    score = 0
+
+    if total == len(entries):
+        print(f"PASS: total_issues matches the findings ({total})")
+        score += 15
+    else:
+        print(f"FAIL: total_issues is {total}, but the report lists {len(entries)} findings")
+
+    if all(isinstance(n, int) and not isinstance(n, bool) for n in counts.values()) \
+            and sum(counts.values()) == total:
+        print("PASS: Severity counts add up to total_issues")
+        score += 10
+    else:
+        print("FAIL: high/medium/low severity counts do not add up to total_issues")
+        return score
+
+    # Findings without a severity may fall in any level
+    labelled = Counter(str(entry.get("severity", "")).lower() for entry in entries)
+    short = [level for level in SEVERITIES if counts[level] < labelled[level]]
+    if short:
+        print(f"FAIL: Fewer {'/'.join(short)} severity issues counted than the findings label")
+    else:
+        print("PASS: Severity counts agree with the findings")
+        score += 10
+    return score
+
+def main(root="."):
+    print("=" * 50)
+    print("Parallel Search Challenge - Test Results")
+    print("=" * 50)
+    print()
+
+    report = load_report(root)
+    if report is None:
+        print(f"\nCreate {REPORT} with the aggregated findings.")
+        return 1
+
+    expected = expected_results(root)
+    calls = load_task_calls(root)
+
+    total_score = 0
+    total_score += test_task_tool(calls)
+    total_score += test_parallel_launch(calls)
+    total_score += test_categories_covered(report, expected)
+    total_score += test_results_aggregated(report, expected)
+    total_score += test_summary_statistics(report)
+
+    print()
+    print("=" * 50)
+    print(f"TOTAL SCORE: {total_score}/150")
+    print("=" * 50)
+
+    if total_score >= 135:
+        print("Excellent! You've mastered parallel agents!")
+    elif total_score >= 112:
+        print("Good job! Minor improvements possible.")
+    else:
+        print("Review the Task tool and parallel agent launches.")
+
+    return 0 if total_score >= 112 else 1
+
+if __name__ == "__main__":
+    sys.exit(cli.run(sys.modules[__name__]))
@@ -0,0 +1,2 @@
+#!/bin/sh
+npx prettier --write "$CLAUDE_FILE_PATHS"
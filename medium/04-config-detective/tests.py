@@ -0,0 +1,247 @@
+#!/usr/bin/env python3
+"""
+Config Detective Challenge - Test Suite
+Verifies config_report.md against the effective configuration of the fixture.
+"""
+
+import re
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+
+from grading import cli, markdown, settings
+from grading.checks import check
+from grading.rubric import DEFAULT_MAX_INPUT_BYTES
+from grading.treeindex import find_starter
+
+REPORT = "config_report.md"
+# The settings hierarchy investigated: the participant's variant, else the one shipped here
+FIXTURE = "fixture"
+
+INPUTS = [REPORT]
+
+ENABLED = re.compile(r"\b(?:enabled|on|true|yes)\b", re.I)
+DISABLED = re.compile(r"\b(?:disabled|off|false|no)\b", re.I)
+RUNNING = re.compile(r"\b(?:running|connected|ok|active|enabled|working)\b", re.I)
+NONE = re.compile(r"^\W*(?:none|n/?a|nothing|empty|-+)?\W*$", re.I)
+
+# Words that show the cause was found, per problem settings.resolve() reports
+CAUSES = {
+    "missing_token": r"token|GITHUB_PERSONAL_ACCESS_TOKEN|credential|api key|\benv",
+    "disabled": r"disabledMcpjsonServers|\bdisabled\b",
+    "not_approved": r"enabledMcpjsonServers|enableAllProjectMcpServers|approv|allowlist|not enabled",
+    "invalid_json": r"json|syntax|pars|trailing comma",
+    "missing_server": r"not configured|no github|missing|add",
+    "wrong_location": r"\.claude/commands|location|director|folder",
+    "wrong_extension": r"\.md\b|extension|\.txt",
+    "missing": r"no commands|missing|\.claude/commands",
+    "wrong_event": r"PostToolUse|PreToolUse|event",
+    "wrong_matcher": r"matcher|Edit|Write",
+    "missing_script": r"format\.sh|script|not found|missing|does not exist|path",
+    "hooks_disabled": r"disableAllHooks|hooks? (?:are |were )?disabled|all hooks",
+    "missing_hook": r"no (?:format|PostToolUse)|not configured|add a",
+}
+
+DIAGNOSES = (
+    # (problem, points, section titles)
+    ("github_mcp", 17, ("GitHub",)),
+    ("slash_commands", 17, ("Custom Slash", "Slash Command")),
+    ("auto_format", 16, ("Auto-format", "Auto format", "Autoformat", "Formatting")),
+)
+
+def load_report(root="."):
+    """Parse the configuration report."""
+    doc = markdown.load(root, REPORT)
+    if doc is None:
+        print(f"FAIL: {REPORT} not found")
+        return None
+    if doc.truncated:
+        print(f"INFO: {REPORT} is {doc.size} bytes; only the first {DEFAULT_MAX_INPUT_BYTES} were graded")
+    return doc
+
+def expected_results(root="."):
+    """Effective configuration of the fixture the submission investigated, or None.
+
+    Resolved once per fixture content (see grading.settings), so hundreds of
+    per-participant variants are graded against their own configuration.
+    """
+    fixture = find_starter(__file__, FIXTURE)
+    if fixture is None:
+        print(f"FAIL: No {FIXTURE}/ for the participant's variant to grade against")
+        return None
+    return settings.resolve(fixture)
+
+def field(section, name):
+    """Value of a "- Name: value" line in section, or None."""
+    if section is None:
+        return None
+    for item in section.items:
+        key, sep, value = item.partition(":")
+        if sep and re.search(name, key, re.I):
+            return value.strip()
+    return None
+
+def table_rows(section):
+    """{first cell (lowercase): row cells} of the section's table."""
+    return {row[0].lower(): row for row in (section.rows if section else ()) if len(row) >= 2}
+
+@check(20)
+def test_config_used(doc, config):
+    """Test if the global settings match the effective /config values."""
+    section = doc.section("Global Settings")
+    effective = config["settings"]
+    score = 0
+
+    compact = field(section, r"auto[- ]?compact")
+    expected = effective.get("autoCompactEnabled", True)
+    if compact and (ENABLED if expected else DISABLED).search(compact):
+        print(f"PASS: Auto-compact is {'enabled' if expected else 'disabled'}")
+        score += 7
+    else:
+        print(f"FAIL: Auto-compact should be {'enabled' if expected else 'disabled'} (found {compact!r})")
+
+    model = field(section, r"model")
+    expected = effective.get("model", "default")
+    if model and expected.lower() in model.lower():
+        print(f"PASS: Model is {expected}")
+        score += 7
+    else:
+        print(f"FAIL: Effective model is {expected} (found {model!r}); check every settings layer")
+
+    theme = field(section, r"theme")
+    expected = effective.get("theme", "dark")
+    if theme and theme.strip("`").lower() == expected.lower():
+        print(f"PASS: Theme is {expected}")
+        score += 6
+    else:
+        print(f"FAIL: Theme is {expected} (found {theme!r})")
+    return score
+
+@check(20)
+def test_mcp_used(doc, config):
+    """Test if every configured MCP server is listed, as /mcp shows them."""
+    rows = table_rows(doc.section("MCP Servers"))
+    expected = sorted(config["mcp_servers"])
+    if not expected:
+        print("PASS: No MCP servers configured" if not rows else "FAIL: Listed servers that are not configured")
+        return 20 if not rows else 0
+    listed = [name for name in expected if name.lower() in rows]
+    if len(listed) == len(expected):
+        print(f"PASS: All {len(expected)} MCP servers listed")
+        return 20
+    missing = [name for name in expected if name not in listed]
+    print(f"PARTIAL: {len(listed)}/{len(expected)} MCP servers listed (missing: {', '.join(missing)})")
+    return int(20 * len(listed) / len(expected))
+
+@check(30)
+def test_settings_documented(doc, config):
+    """Test if CLAUDE.md presence and the hooks per event are documented."""
+    score = 0
+    has_local = config["claude_md"]["project"] or config["claude_md"]["local"]
+    answer = field(doc.section("Project Settings"), r"CLAUDE\.md")
+    if answer and re.match(r"\W*yes\b" if has_local else r"\W*no\b", answer, re.I):
+        print(f"PASS: Local CLAUDE.md {'present' if has_local else 'absent'}")
+        score += 10
+    else:
+        print(f"FAIL: The project {'has' if has_local else 'has no'} CLAUDE.md (found {answer!r})")
+
+    hooks = doc.section("Hooks Configured")
+    correct = []
+    for event in settings.HOOK_EVENTS:
+        listed = field(hooks, rf"^{event}$")
+        configured = config["hooks"].get(event, [])
+        if not configured:
+            ok = listed is None or bool(NONE.match(listed))
+        else:
+            ok = listed is not None and any(
+                Path(hook["command"].split()[0]).name in listed or (hook["matcher"] and hook["matcher"] in listed)
+                for hook in configured)
+        if ok:
+            correct.append(event)
+        else:
+            expected = ", ".join(Path(hook["command"].split()[0]).name for hook in configured) or "none"
+            print(f"FAIL: {event} hooks should be: {expected} (found {listed!r})")
+    if len(correct) == len(settings.HOOK_EVENTS):
+        print("PASS: Hooks documented for every event")
+    return score + int(20 * len(correct) / len(settings.HOOK_EVENTS))
+
+@check(30)
+def test_mcp_status(doc, config):
+    """Test if each MCP server's status is correct."""
+    rows = table_rows(doc.section("MCP Servers"))
+    servers = config["mcp_servers"]
+    if not servers:
+        return 30
+    correct = 0
+    for name, server in sorted(servers.items()):
+        row = rows.get(name.lower())
+        status = row[1] if row else ""
+        running = bool(RUNNING.search(status)) and not re.search(r"\bnot\b|disabled|fail|stop|error", status, re.I)
+        if row and running == (server["status"] == "running"):
+            correct += 1
+        else:
+            print(f"FAIL: {name} should be {server['status']} (found {status or 'nothing'!r})")
+    if correct == len(servers):
+        print(f"PASS: Status correct for all {correct} servers")
+    return int(30 * correct / len(servers))
+
+@check(50)
+def test_diagnoses(doc, config):
+    """Test if each reported problem is traced to its actual cause."""
+    diagnosis = doc.section("Diagnosis", prefix=True) or doc
+    score = 0
+    for problem, points, titles in DIAGNOSES:
+        cause = config["problems"][problem]
+        section = diagnosis.section(*titles, prefix=True)
+        text = "\n".join(s.text for s in (section, *section.walk())) if section else ""
+        if not text:
+            print(f"FAIL: No {titles[0]} diagnosis")
+        elif cause is None:
+            print(f"PASS: {titles[0]} diagnosis present (nothing misconfigured)")
+            score += points
+        elif re.search(CAUSES[cause], text, re.I) and field(section, r"solution|fix"):
+            print(f"PASS: {titles[0]} traced to its cause ({cause.replace('_', ' ')})")
+            score += points
+        else:
+            print(f"PARTIAL: {titles[0]} diagnosis does not identify the cause")
+            score += points // 3
+    return score
+
+def main(root="."):
+    print("=" * 50)
+    print("Config Detective Challenge - Test Results")
+    print("=" * 50)
+    print()
+
+    doc = load_report(root)
+    if doc is None:
+        print(f"\nCreate {REPORT} with your findings.")
+        return 1
+    config = expected_results(root)
+    if config is None:
+        return 1
+
+    total_score = 0
+    total_score += test_config_used(doc, config)
+    total_score += test_mcp_used(doc, config)
+    total_score += test_settings_documented(doc, config)
+    total_score += test_mcp_status(doc, config)
+    total_score += test_diagnoses(doc, config)
+
+    print()
+    print("=" * 50)
+    print(f"TOTAL SCORE: {total_score}/150")
+    print("=" * 50)
+
+    if total_score >= 135:
+        print("Excellent! You've mastered Claude Code configuration!")
+    elif total_score >= 112:
+        print("Good job! Minor improvements possible.")
+    else:
+        print("Review the settings hierarchy, /config and /mcp.")
+
+    return 0 if total_score >= 112 else 1
+
+if __name__ == "__main__":
+    sys.exit(cli.run(sys.modules[__name__]))
@@ -0,0 +1,363 @@
+#!/usr/bin/env python3
+"""
+Refactor Safely Challenge - Test Suite
+Verifies the getUserData -> fetchUserProfile rename and how it was committed.
+"""
+
+import hashlib
+import re
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+
+from grading import cli
+from grading.checks import check
+from grading.gitrepo import GitError, GitRepo, subject
+from grading.identifiers import scan
+from grading.rubric import DEFAULT_MAX_INPUT_BYTES
+from grading.treeindex import index_tree
+
+STARTER = "starter"
+REPORT = "refactor_report.md"
+
+INPUTS = [REPORT, f"git:{STARTER}", STARTER]
+
+OLD_NAME = "getUserData"
+NEW_NAME = "fetchUserProfile"
+NAMES = (OLD_NAME, NEW_NAME)
+DEFINITION_FILE = "src/api/users.ts"
+SOURCE_EXTENSIONS = (".ts", ".tsx", ".js", ".jsx")
+
+# First-parent commits searched for the rename before giving up
+MAX_HISTORY = 500
+
+# Report conventions
+REPLACEMENT_COUNT = re.compile(
+    r"\b\d+\s+(?:replacements?|occurrences?|references?|changes?|edits?)\b|\|\s*\d+\s*\|", re.I)
+VERIFICATION = re.compile(r"verif", re.I)
+NO_RESULTS = re.compile(r"\b(?:0|zero|no)\s+(?:results?|matches|remaining|references?|occurrences?)\b", re.I)
+
+class Refactor:
+    """Everything the checks need, gathered in one pass over the tree and its history.
+
+    index is the work tree's identifier index. baseline maps each file that
+    mentioned either name before the rename to its references then;
+    renames are the rename commits, oldest first, each with the state of
+    the renamed files after it.
+    """
+
+    def __init__(self, index, baseline, renames, uncommitted, has_history):
+        self.index = index
+        self.baseline = baseline
+        self.renames = renames
+        self.uncommitted = uncommitted
+        self.has_history = has_history
+
+    def current(self, path, name, context=None, role=None):
+        return [line for ref_path, line in self.index.references(name, context, role) if ref_path == path]
+
+    def before(self, path, name, context=None, role=None):
+        return [ref.line for ref in self.baseline.get(path, {}).get(name, ())
+                if context in (None, ref.context) and role in (None, ref.role)]
+
+def blob_sha(data):
+    return hashlib.sha1(b"blob %d\0" % len(data) + data).hexdigest()
+
+def code_references(repo, blob):
+    """Identifier references in a blob, or {} for a missing one."""
+    return scan(repo.read_object(blob)[1], NAMES) if blob else {}
+
+def renames_in(changes):
+    """Whether a commit's changes (path, old refs, new refs) rename rather than introduce the old name."""
+    def count(refs, name):
+        return sum(ref.context == "code" for ref in refs.get(name, ()))
+
+    introduces = any(count(new, OLD_NAME) > count(old, OLD_NAME) for _, old, new in changes)
+    renamed = any(count(old, OLD_NAME) > count(new, OLD_NAME) or count(new, NEW_NAME) > count(old, NEW_NAME)
+                  for _, old, new in changes)
+    return renamed and not introduces, introduces
+
+def rename_history(repo, prefix, candidates):
+    """(rename commits newest first as (commit, changes), commit before the oldest one).
+
+    Each commit's changed paths come from one diff-tree pass, and only the
+    blobs of candidates (files that mention either name now) are read, so
+    importing a 10,000-file starter costs one tree walk. The walk stops at
+    the commit that introduced the old name (the starter's import).
+    """
+    renames = []
+    baseline = None
+    sha = repo.head()
+    for _ in range(MAX_HISTORY):
+        if sha is None:
+            break
+        commit = repo.commit(sha)
+        changes = []
+        for path, old, new in repo.changed_paths(sha):
+            path = path[len(prefix):] if path.startswith(prefix) else None
+            if path in candidates:
+                before, after = code_references(repo, old), code_references(repo, new)
+                if before or after:
+                    changes.append((path, before, after))
+        renamed, introduces = renames_in(changes)
+        if introduces:
+            break
+        if renamed:
+            renames.append((commit, changes))
+            baseline = commit.parents[0] if commit.parents else None
+        sha = commit.parents[0] if commit.parents else None
+    if not renames:
+        return [], repo.head()
+    return renames, baseline
+
+def analyze(root="."):
+    """Gather the Refactor for a submission, or None without a starter/ directory."""
+    starter = Path(root) / STARTER
+    if not starter.is_dir():
+        return None
+
+    index = index_tree(starter, extensions=SOURCE_EXTENSIONS, identifiers=NAMES)
+    mentioned = {path for name in NAMES for path, _ in index.references(name)}
+
+    repo = GitRepo.discover(starter)
+    if repo is None or repo.head() is None:
+        return Refactor(index, {}, [], [], False)
+
+    prefix = repo.relative(starter)
+    prefix = "" if prefix == "." else prefix + "/"
+    try:
+        renames, baseline_commit = rename_history(repo, prefix, mentioned)
+        baseline_tree = repo.commit(baseline_commit).tree if baseline_commit else None
+        head_tree = repo.commit(repo.head()).tree
+
+        touched = {path for _, changes in renames for path, _, _ in changes}
+        baseline = {}
+        for path in sorted(mentioned | touched):
+            blob = repo.tree_entry(baseline_tree, prefix + path) if baseline_tree else None
+            refs = code_references(repo, blob)
+            if refs:
+                baseline[path] = refs
+
+        # Rename work left in the work tree, by content against HEAD
+        uncommitted = []
+        for path in sorted(mentioned | touched | set(baseline)):
+            on_disk = starter / path
+            committed = repo.tree_entry(head_tree, prefix + path)
+            current = blob_sha(on_disk.read_bytes()) if on_disk.is_file() else None
+            if current != committed:
+                uncommitted.append(path)
+    except GitError as e:
+        print(f"INFO: Could not read the git history ({e})")
+        return Refactor(index, {}, [], [], False)
+
+    # State of the renamed files after each rename commit, oldest first
+    state = {path: baseline.get(path, {}) for path in touched}
+    history = []
+    for commit, changes in reversed(renames):
+        for path, _, after in changes:
+            state[path] = after
+        history.append((commit, {path: dict(refs) for path, refs in state.items()}))
+    return Refactor(index, baseline, history, uncommitted, True)
+
+def display(paths, limit=5):
+    shown = ", ".join(f"{STARTER}/{path}" for path in paths[:limit])
+    return shown + (f" and {len(paths) - limit} more" if len(paths) > limit else "")
+
+@check(20)
+def test_definition_renamed(refactor):
+    """Test if the function definition was renamed."""
+    if refactor is None:
+        print(f"FAIL: {STARTER}/ not found")
+        return 0
+
+    new = refactor.index.references(NEW_NAME, "code", "definition")
+    old = refactor.index.references(OLD_NAME, "code", "definition")
+    if old:
+        print(f"FAIL: {OLD_NAME} is still defined in {display(sorted({path for path, _ in old}))}")
+        return 0
+    if any(path == DEFINITION_FILE for path, _ in new):
+        print(f"PASS: {NEW_NAME} is defined in {STARTER}/{DEFINITION_FILE}")
+        return 20
+    if new:
+        print(f"PARTIAL: {NEW_NAME} is defined, but in {display(sorted({path for path, _ in new}))}")
+        return 10
+    print(f"FAIL: No definition of {NEW_NAME} found")
+    return 0
+
+@check(25)
+def test_imports_updated(refactor):
+    """Test if every file importing the function imports it by its new name."""
+    if refactor is None:
+        return 0
+
+    if refactor.has_history:
+        importers = sorted(path for path in refactor.baseline if refactor.before(path, OLD_NAME, "code", "import"))
+    else:
+        importers = sorted({path for name in NAMES for path, _ in refactor.index.references(name, "code", "import")})
+    if not importers:
+        print(f"FAIL: No imports of {OLD_NAME} to update were found")
+        return 0
+
+    stale = [path for path in importers
+             if refactor.current(path, OLD_NAME, "code", "import")
+             or not refactor.current(path, NEW_NAME, "code", "import")]
+    updated = len(importers) - len(stale)
+    if not stale:
+        print(f"PASS: All {len(importers)} importing files updated")
+        return 25
+    print(f"PARTIAL: {updated}/{len(importers)} importing files updated")
+    print(f"  Not updated: {display(stale)}")
+    return int(25 * updated / len(importers))
+
+@check(25)
+def test_call_sites_updated(refactor):
+    """Test if every call site uses the new name."""
+    if refactor is None:
+        return 0
+
+    if refactor.has_history:
+        callers = {path: len(refactor.before(path, OLD_NAME, "code", "call")) for path in refactor.baseline}
+    else:
+        called = {path for name in NAMES for path, _ in refactor.index.references(name, "code", "call")}
+        callers = {path: sum(len(refactor.current(path, name, "code", "call")) for name in NAMES)
+                   for path in called}
+    callers = {path: calls for path, calls in callers.items() if calls}
+    if not callers:
+        print(f"FAIL: No calls of {OLD_NAME} to update were found")
+        return 0
+
+    stale = sorted(path for path, calls in callers.items()
+                   if refactor.current(path, OLD_NAME, "code", "call")
+                   or len(refactor.current(path, NEW_NAME, "code", "call")) != calls)
+    total = sum(callers.values())
+    if not stale:
+        print(f"PASS: All {total} call sites in {len(callers)} files updated")
+        return 25
+    updated = len(callers) - len(stale)
+    print(f"PARTIAL: Call sites updated in {updated}/{len(callers)} files")
+    print(f"  Not updated (or calls lost): {display(stale)}")
+    return int(25 * updated / len(callers))
+
+@check(30)
+def test_no_broken_references(refactor):
+    """Test that no reference to the old name remains."""
+    if refactor is None:
+        return 0
+
+    code = refactor.index.references(OLD_NAME, "code")
+    if code:
+        print(f"FAIL: {len(code)} code references to {OLD_NAME} remain")
+        print("  " + ", ".join(f"{STARTER}/{path}:{line}" for path, line in code[:5])
+              + (f" and {len(code) - 5} more" if len(code) > 5 else ""))
+        return 0
+
+    text = refactor.index.references(OLD_NAME, "string") + refactor.index.references(OLD_NAME, "comment")
+    if text:
+        print(f"PARTIAL: No code references remain, but {OLD_NAME} is still mentioned "
+              f"in {len(text)} strings or comments")
+        print("  " + ", ".join(f"{STARTER}/{path}:{line}" for path, line in sorted(text)[:5]))
+        return 20
+    print(f"PASS: No references to {OLD_NAME} remain")
+    return 30
+
+@check(25)
+def test_atomic_commit(refactor):
+    """Test if the rename was committed without leaving half-renamed commits behind."""
+    if refactor is None:
+        return 0
+    if not refactor.has_history:
+        print(f"FAIL: {STARTER}/ is not a git repository with commits")
+        return 0
+    if not refactor.renames:
+        print("FAIL: No commit contains the rename")
+        return 0
+
+    def broken(state):
+        def uses(name):
+            return any(ref.context == "code" for refs in state.values() for ref in refs.get(name, ()))
+        return uses(OLD_NAME) and uses(NEW_NAME)
+
+    score = 25
+    # The last commit may leave old references the participant missed; that is test_no_broken_references'
+    half = [commit for commit, state in refactor.renames[:-1] if broken(state)]
+    if half:
+        score -= 10
+        print(f"FAIL: {len(half)} commit(s) leave the codebase half-renamed "
+              f"(e.g. {half[0].sha[:7]} {subject(half[0].message)!r})")
+    else:
+        count = len(refactor.renames)
+        print(f"PASS: Rename committed atomically ({count} commit{'s' if count > 1 else ''})")
+
+    if refactor.uncommitted:
+        score -= 10
+        print(f"FAIL: Uncommitted changes to renamed files: {display(refactor.uncommitted)}")
+    return score
+
+@check(25)
+def test_report_complete(refactor, root="."):
+    """Test if the refactor report documents files, counts and verification."""
+    report_path = Path(root) / REPORT
+    if not report_path.is_file():
+        print(f"FAIL: {REPORT} not found")
+        return 0
+    with open(report_path, encoding="utf-8", errors="replace") as f:
+        content = f.read(DEFAULT_MAX_INPUT_BYTES)
+
+    score = 0
+    changed = sorted({path for path, _ in refactor.index.references(NEW_NAME)}) if refactor else []
+    listed = [path for path in changed if path in content or Path(path).name in content]
+    if changed and len(listed) == len(changed):
+        print(f"PASS: All {len(changed)} changed files listed")
+        score += 10
+    elif listed:
+        print(f"PARTIAL: {len(listed)}/{len(changed)} changed files listed")
+        score += 5
+    else:
+        print("FAIL: Changed files not listed")
+
+    if REPLACEMENT_COUNT.search(content):
+        print("PASS: Replacement counts documented")
+        score += 8
+    else:
+        print("FAIL: No per-file replacement counts")
+
+    if VERIFICATION.search(content) and NO_RESULTS.search(content):
+        print("PASS: Verification results documented")
+        score += 7
+    else:
+        print("FAIL: No verification results (e.g. grep finding 0 results)")
+    return score
+
+def main(root="."):
+    print("=" * 50)
+    print("Refactor Safely Challenge - Test Results")
+    print("=" * 50)
+    print()
+
+    refactor = analyze(root)
+
+    total_score = 0
+    total_score += test_definition_renamed(refactor)
+    total_score += test_imports_updated(refactor)
+    total_score += test_call_sites_updated(refactor)
+    total_score += test_no_broken_references(refactor)
+    total_score += test_atomic_commit(refactor)
+    total_score += test_report_complete(refactor, root)
+
+    print()
+    print("=" * 50)
+    print(f"TOTAL SCORE: {total_score}/150")
+    print("=" * 50)
+
+    if total_score >= 135:
+        print("Excellent! You've mastered safe refactoring!")
+    elif total_score >= 112:
+        print("Good job! Minor improvements possible.")
+    else:
+        print("Review multi-file edits and atomic commits.")
+
+    return 0 if total_score >= 112 else 1
+
+if __name__ == "__main__":
+    sys.exit(cli.run(sys.modules[__name__]))